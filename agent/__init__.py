@@ -4,6 +4,24 @@ CFO Copilot Agent Package
 This package contains the AI agent components for financial analysis:
 - planner.py: Natural language query planning and intent classification
 - tools.py: Financial analysis tools and data processing
+- cube.py: Long-format ledger cube indexed by entity, account, month and scenario
+- storage.py: Binary sidecar caches for the fixture CSVs and the memory-mapped ledger
+- ingest.py: Streaming aggregation of general-ledger exports into the monthly ledger
+- fx.py: Monthly FX rate matrix indexed by month and currency
+- periods.py: Multi-year monthly axis and fiscal calendar
+- pnl.py: Materialized USD P&L per scenario, entity and month
+- memo.py: LRU memoization of analyzer results keyed by data version
+- hierarchy.py: Account and entity trees with precomputed subtree rollups
+- consolidation.py: Entity-tree consolidation with intercompany eliminations
+- simulation.py: Vectorized Monte Carlo cash runway simulation
+- scenarios.py: Batched what-if scenarios from FX, growth and OPEX driver shocks
+- windows.py: Prefix sums for O(1) TTM, rolling and year-to-date totals
+- comparison.py: Actual vs budget, prior month and prior year for every line and month
+- variance.py: FX, volume and mix decomposition of every budget variance
+- forecast.py: Seasonal naive, exponential smoothing and trend forecasts for every series at once
+- anomalies.py: Jumps, missing months and sign flips across every ledger series, rescanned incrementally
+- concurrency.py: Single-flight lazy values, per-version builds and request coalescing for one analyzer shared across threads
+- parallel.py: Entity-sharded P&L and cash aggregation on a process pool over shared ledger memory
 """
 
 __version__ = "1.0.0"
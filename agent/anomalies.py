@@ -0,0 +1,211 @@
+"""Anomaly detection across every ledger series for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .cube import LedgerMatrix, month_label, to_period
+
+
+ANOMALY_TYPES = ('jump', 'missing', 'sign_flip')
+Z_THRESHOLD = 3.0
+LOOKBACK = 12  # prior months each value is compared with
+MIN_HISTORY = 3  # prior values needed before a jump can be called
+# Tables whose row changes touch only their own series; anything else rescans
+SERIES_TABLES = ('actuals', 'cash')
+IGNORED_TABLES = ('budget', 'entities', 'eliminations')
+
+
+def changed_series(changes: Optional[List[Dict]]) -> Optional[Set[Tuple[str, str]]]:
+    """(entity, account) pairs touched by loader deltas, or None when everything must be rescanned.
+
+    changes is FinancialDataLoader.changes_since output. New or removed
+    months, FX changes and full reloads affect every series.
+    """
+    if changes is None:
+        return None
+    pairs = set()
+    for deltas in changes:
+        for name, delta in deltas.items():
+            if name in IGNORED_TABLES:
+                continue
+            if name not in SERIES_TABLES or delta['full'] or delta['added_months'] or delta['removed_months']:
+                return None
+            for key in delta['added_rows'] + delta['changed_rows'] + delta['deleted_rows']:
+                pairs.add((str(key[0]), str(key[1])))
+    return pairs
+
+
+def _series(matrix: LedgerMatrix, usd_values: np.ndarray,
+            pairs: Optional[Iterable[Tuple[str, str]]] = None) -> Tuple[pd.DataFrame, pd.PeriodIndex, np.ndarray]:
+    """USD actuals of (entity, account) series, summed over currencies, on the months with actuals.
+
+    Those are the P&L actuals months: cash balances reported ahead of the
+    books do not open a month of missing values. Limited to the given
+    pairs when there are any.
+    """
+    rows = matrix.rows
+    months = matrix.scenario_months.get('actual', matrix.months[:0]).sort_values()
+    selected = matrix.mask('actual')
+    if pairs is not None:
+        pairs = list(pairs)
+        selected = selected & rows['entity'].isin({e for e, _ in pairs}).to_numpy() \
+            & rows['account'].isin({a for _, a in pairs}).to_numpy()
+    index = pd.MultiIndex.from_arrays([rows['entity'][selected].astype(str), rows['account'][selected].astype(str)])
+    if pairs is not None:
+        keep = index.isin(pairs)
+        index, selected = index[keep], np.flatnonzero(selected)[keep]
+    codes, keys = pd.factorize(index, sort=True)
+
+    block = usd_values[selected][:, matrix.months.get_indexer(months)]
+    totals = np.zeros((len(keys), len(months)))
+    counts = np.zeros((len(keys), len(months)))
+    np.add.at(totals, codes, np.nan_to_num(block))
+    np.add.at(counts, codes, ~np.isnan(block))
+
+    frame = pd.DataFrame({
+        'entity': keys.get_level_values(0).to_numpy(dtype=object),
+        'account': keys.get_level_values(1).to_numpy(dtype=object)
+    })
+    return frame, months, np.where(counts > 0, totals, np.nan)
+
+
+def detect(values: np.ndarray, threshold: float = Z_THRESHOLD) -> Dict[str, np.ndarray]:
+    """Flag anomalies in every cell of a (series, month) array at once.
+
+    * jump: more than threshold standard deviations from the mean of the
+      series' previous LOOKBACK months (at least MIN_HISTORY of them),
+      from prefix sums so every window costs the same;
+    * missing: no value in a month after the series started, either a gap
+      or the latest month;
+    * sign_flip: the opposite sign to the previous value.
+
+    Returns (series, month) arrays: a boolean mask per type, plus the
+    z-score and the expected value each cell is measured against.
+    """
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+    months = values.shape[1]
+    columns = np.arange(months)
+
+    def prefix(a):
+        return np.concatenate([np.zeros((len(a), 1)), np.cumsum(a, axis=1)], axis=1)
+
+    count, total, squares = prefix(observed.astype(float)), prefix(filled), prefix(filled ** 2)
+    lo = np.maximum(columns - LOOKBACK, 0)
+    n = count[:, columns] - count[:, lo]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (total[:, columns] - total[:, lo]) / n
+        variance = (squares[:, columns] - squares[:, lo]) / n - mean ** 2
+    # Floor the spread so flat series are not flagged for rounding noise
+    spread = np.maximum(np.sqrt(np.maximum(variance, 0.0)), np.maximum(0.01 * np.abs(mean), 1.0))
+    z = np.where(observed & (n >= MIN_HISTORY), (filled - mean) / spread, 0.0)
+
+    last_seen = np.maximum.accumulate(np.where(observed, columns, -1), axis=1)
+    started = last_seen >= 0
+    previous = np.full(values.shape, np.nan)
+    latest = values[np.arange(len(values))[:, None], np.maximum(last_seen, 0)]  # last value so far
+    previous[:, 1:] = np.where(started[:, :-1], latest[:, :-1], np.nan)
+    later = observed[:, ::-1].cumsum(axis=1)[:, ::-1] > 0  # a value comes after
+
+    return {
+        'jump': np.abs(z) > threshold,
+        'missing': ~observed & started & (later | (columns == months - 1)),
+        'sign_flip': observed & (filled * np.nan_to_num(previous) < 0),
+        'z': z,
+        'expected': np.where(n > 0, mean, previous)
+    }
+
+
+def _anomaly_rows(keys: pd.DataFrame, codes: np.ndarray, months: pd.PeriodIndex, values: np.ndarray,
+                  flags: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """One row per flagged (series, month, type); codes number the series."""
+    labels = np.array([month_label(p) for p in months], dtype=object)
+    parts = []
+    for kind in ANOMALY_TYPES:
+        rows, cols = np.nonzero(flags[kind])
+        value = values[rows, cols]
+        expected = flags['expected'][rows, cols]
+        parts.append(pd.DataFrame({
+            'series': codes[rows],
+            'entity': keys['entity'].to_numpy()[rows],
+            'account': keys['account'].to_numpy()[rows],
+            'month': labels[cols],
+            'type': kind,
+            'value': value,
+            'expected': expected,
+            'z': flags['z'][rows, cols],
+            'impact': np.abs(np.nan_to_num(value) - np.nan_to_num(expected))
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+class AnomalyScan:
+    """Ranked anomalies of every (entity, account) series of USD actuals.
+
+    ``table`` has one row per flagged series, month and type, largest USD
+    impact (distance from the expected value) first. ``update`` rescans
+    only the series a refresh touched and splices them into the table.
+    """
+
+    def __init__(self, keys: pd.DataFrame, months: pd.PeriodIndex, table: pd.DataFrame,
+                 threshold: float = Z_THRESHOLD, codes: Optional[Dict[Tuple[str, str], int]] = None):
+        self.keys = keys
+        self.months = months
+        self.table = table
+        self.threshold = threshold
+        # (entity, account) -> row of keys, the series number used in table
+        self._codes = codes if codes is not None else {
+            pair: i for i, pair in enumerate(zip(keys['entity'], keys['account']))
+        }
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, usd_values: np.ndarray, threshold: float = Z_THRESHOLD) -> 'AnomalyScan':
+        """Scan every series of the ledger."""
+        keys, months, values = _series(matrix, usd_values)
+        table = _anomaly_rows(keys, np.arange(len(keys)), months, values, detect(values, threshold))
+        return cls(keys, months, cls._rank(table), threshold)
+
+    def update(self, matrix: LedgerMatrix, usd_values: np.ndarray, pairs: Set[Tuple[str, str]]) -> 'AnomalyScan':
+        """A new scan with the given (entity, account) series rescanned and the rest reused.
+
+        Falls back to a full scan if the months with actuals changed.
+        """
+        keys, months, values = _series(matrix, usd_values, pairs)
+        if not months.equals(self.months):
+            return self.from_matrix(matrix, usd_values, self.threshold)
+
+        all_keys, codes = self.keys, self._codes
+        new = [pair for pair in zip(keys['entity'], keys['account']) if pair not in codes]
+        if new:
+            all_keys = pd.concat([all_keys, pd.DataFrame(new, columns=['entity', 'account'])], ignore_index=True)
+            codes = {**codes, **{pair: len(codes) + i for i, pair in enumerate(new)}}
+
+        # Series in pairs without rows any more simply lose their anomalies
+        stale = np.array([codes[p] for p in pairs if p in codes], dtype=np.int64)
+        kept = self.table[~self.table['series'].isin(stale)]
+        rescanned = _anomaly_rows(
+            keys, np.array([codes[p] for p in zip(keys['entity'], keys['account'])], dtype=np.int64),
+            months, values, detect(values, self.threshold)
+        )
+        return type(self)(all_keys, months, self._rank(pd.concat([kept, rescanned], ignore_index=True)),
+                          self.threshold, codes)
+
+    @staticmethod
+    def _rank(table: pd.DataFrame) -> pd.DataFrame:
+        return table.sort_values(['impact', 'series', 'month'], ascending=[False, True, True],
+                                 kind='stable').reset_index(drop=True)
+
+    def select(self, month: Optional[str] = None, entity: Optional[str] = None, types=None,
+               limit: Optional[int] = None) -> pd.DataFrame:
+        """Ranked anomalies for a month, entity and anomaly types, each optional, the top limit of them."""
+        mask = np.ones(len(self.table), dtype=bool)
+        if month is not None:
+            mask &= (self.table['month'] == month_label(to_period(month))).to_numpy()
+        if entity is not None:
+            mask &= (self.table['entity'] == entity).to_numpy()
+        if types is not None:
+            mask &= self.table['type'].isin([types] if isinstance(types, str) else list(types)).to_numpy()
+        table = self.table[mask].drop(columns='series')
+        return (table if limit is None else table.head(limit)).reset_index(drop=True)
@@ -0,0 +1,169 @@
+"""Period-over-period comparisons for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import List, Tuple
+
+from .cube import LedgerMatrix, month_label
+from .pnl import TOTAL_ENTITY, PnLSummary, classify_account
+
+
+BASES = {'budget': None, 'prior_month': 1, 'prior_year': 12}  # comparison -> months back
+
+
+def _axis(months) -> pd.PeriodIndex:
+    """Gap-free monthly axis spanning the given months."""
+    months = pd.PeriodIndex(months, freq='M')
+    if not len(months):
+        return months
+    return pd.period_range(months.min(), months.max(), freq='M')
+
+
+def _shift(values: np.ndarray, months: int) -> np.ndarray:
+    """(key, month) array moved months columns later, NaN where nothing moves in."""
+    shifted = np.full_like(values, np.nan)
+    if months < values.shape[1]:
+        shifted[:, months:] = values[:, :values.shape[1] - months]
+    return shifted
+
+
+def _reported(matrix: LedgerMatrix, scenario: str, entities: pd.Index, months: pd.PeriodIndex,
+              columns: List[str]) -> np.ndarray:
+    """(entity, month, line) mask of the base P&L cells a scenario has ledger values behind."""
+    rows = matrix.rows
+    lines = rows['account'].astype(str).map(classify_account)
+    selected = (rows['scenario'] == scenario).to_numpy() & lines.notna().to_numpy()
+    at = months.get_indexer(matrix.months)
+    inside = np.flatnonzero(at >= 0)
+
+    reported = np.zeros((len(entities), len(months), len(columns)), dtype=bool)
+    r, c = np.nonzero(~np.isnan(matrix.values[selected][:, inside]))
+    entity = entities.get_indexer(rows['entity'][selected].astype(str))
+    line = pd.Index(columns).get_indexer(lines[selected])
+    reported[entity[r], at[inside][c], line[r]] = True
+    return reported
+
+
+def _roll_up(actual: np.ndarray, budget: np.ndarray, parts, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reported masks of a sum of parts along axis.
+
+    Actuals are reported where any part is. Budget is reported where any
+    part is and it covers every part with actuals, so a sum is only
+    compared with budget like for like.
+    """
+    covers = budget | ~actual
+    return (np.take(actual, parts, axis).any(axis),
+            np.take(budget, parts, axis).any(axis) & np.take(covers, parts, axis).all(axis))
+
+
+class PeriodComparison:
+    """Actual vs budget, prior month and prior year for every key and month at once.
+
+    Actuals and budget are (key, month) arrays on one gap-free monthly axis,
+    where a key is an (entity, line) or (entity, account) pair. Prior month
+    and prior year are the actuals shifted one and twelve columns, so each
+    comparison is one array operation over every key and month. ``table``
+    is the tidy result: one row per key and month with actuals.
+    """
+
+    def __init__(self, keys: pd.DataFrame, months: pd.PeriodIndex, actual: np.ndarray, budget: np.ndarray):
+        self.keys = keys
+        self.months = months
+
+        columns = {'actual': actual}
+        for name, back in BASES.items():
+            base = budget if back is None else _shift(actual, back)
+            variance = actual - base
+            percent = np.full_like(variance, np.nan)
+            np.divide(variance * 100, np.abs(base), out=percent, where=np.nan_to_num(base) != 0)
+            columns.update({name: base, f'vs_{name}': variance, f'vs_{name}_pct': percent})
+
+        rows, cols = np.nonzero(~np.isnan(actual))
+        labels = np.array([month_label(p) for p in months], dtype=object)
+        self.table = pd.concat([
+            keys.iloc[rows].reset_index(drop=True),
+            pd.DataFrame({'month': labels[cols], **{name: values[rows, cols] for name, values in columns.items()}})
+        ], axis=1)
+
+    @classmethod
+    def from_pnl(cls, pnl: PnLSummary, matrix: LedgerMatrix) -> 'PeriodComparison':
+        """Compare every P&L line of every entity, and of the total.
+
+        matrix is the ledger the P&L was rolled up from. A line, entity or
+        month without ledger rows in a scenario is NaN there rather than
+        the summary's zero, so a missing budget reads as no budget and not
+        as a 100% variance. Totals and derived lines are only compared with
+        budget where every part with actuals has budget too.
+        """
+        frame = pnl.frame
+        entities = pd.Index(sorted(frame.index.get_level_values('entity').unique()))
+        months = _axis(frame.index.get_level_values('month').unique())
+
+        arrays, reported = {}, {}
+        for scenario in ('actual', 'budget'):
+            values = np.full((len(entities), len(months), len(pnl.columns)), np.nan)
+            if scenario in frame.index.get_level_values('scenario'):
+                part = frame.xs(scenario, level='scenario')
+                values[entities.get_indexer(part.index.get_level_values('entity')),
+                       months.get_indexer(part.index.get_level_values('month'))] = part.to_numpy()
+            arrays[scenario] = values
+            reported[scenario] = _reported(matrix, scenario, entities, months, pnl.columns)
+
+        # Derived lines from their parts, then the total from the entities
+        actual, budget = reported['actual'], reported['budget']
+        position = {column: i for i, column in enumerate(pnl.columns)}
+        opex = [position[c] for c in pnl.columns if c.startswith('opex:')]
+        gross = [position['revenue'], position['cogs']]
+        for line, parts in (('opex', opex), ('gross_profit', gross), ('ebitda', gross + opex)):
+            actual[..., position[line]], budget[..., position[line]] = _roll_up(actual, budget, parts, axis=2)
+        if TOTAL_ENTITY in entities:
+            total = entities.get_loc(TOTAL_ENTITY)
+            others = [i for i in range(len(entities)) if i != total]
+            actual[total], budget[total] = _roll_up(actual, budget, others, axis=0)
+
+        for scenario, values in arrays.items():
+            values[~reported[scenario]] = np.nan
+            # (entity, month, line) -> (entity x line, month)
+            arrays[scenario] = values.transpose(0, 2, 1).reshape(-1, len(months))
+
+        keys = pd.DataFrame({
+            'entity': np.repeat(entities.to_numpy(dtype=object), len(pnl.columns)),
+            'line': np.tile(np.array(pnl.columns, dtype=object), len(entities))
+        })
+        return cls(keys, months, arrays['actual'], arrays['budget'])
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, usd_values: np.ndarray) -> 'PeriodComparison':
+        """Compare every ledger account of every entity in USD, summed over currencies."""
+        rows = matrix.rows
+        pairs = pd.MultiIndex.from_arrays([rows['entity'].astype(str), rows['account'].astype(str)])
+        codes, keys = pd.factorize(pairs, sort=True)
+        months = _axis(matrix.months)
+        columns = months.get_indexer(matrix.months)
+
+        arrays = {}
+        for scenario in ('actual', 'budget'):
+            selected = (rows['scenario'] == scenario).to_numpy()
+            block = usd_values[selected]
+            totals = np.zeros((len(keys), len(months)))
+            counts = np.zeros((len(keys), len(months)))
+            np.add.at(totals, (codes[selected][:, None], columns[None, :]), np.nan_to_num(block))
+            np.add.at(counts, (codes[selected][:, None], columns[None, :]), ~np.isnan(block))
+            arrays[scenario] = np.where(counts > 0, totals, np.nan)
+
+        keys = pd.DataFrame({
+            'entity': keys.get_level_values(0).to_numpy(dtype=object),
+            'account': keys.get_level_values(1).to_numpy(dtype=object)
+        })
+        return cls(keys, months, arrays['actual'], arrays['budget'])
+
+    def select(self, **filters) -> pd.DataFrame:
+        """Rows of the table matching each column=value (or list of values) filter."""
+        mask = np.ones(len(self.table), dtype=bool)
+        for column, value in filters.items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.table[column].isin(values).to_numpy()
+        return self.table[mask].reset_index(drop=True)
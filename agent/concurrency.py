@@ -0,0 +1,159 @@
+"""Thread-safety primitives for sharing one loader and analyzer across sessions."""
+
+import threading
+
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+
+T = TypeVar('T')
+_MISSING = object()
+
+
+class KeyedLocks:
+    """One re-entrant lock per key, created on first use.
+
+    Re-entrant so a builder may ask for other cached values (or, through
+    a listener, its own) while it holds its lock.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, threading.RLock] = {}
+        self._guard = threading.Lock()
+
+    def __call__(self, key: Hashable) -> threading.RLock:
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(key, threading.RLock())
+        return lock
+
+
+def _lookup(owner, name: str, version, key):
+    # Version first: values are published before their version, so a
+    # matching version guarantees the value read next is at least as new
+    if getattr(owner, f'_{name}_version') != version:
+        return _MISSING
+    value = getattr(owner, f'_{name}')
+    if value is None:
+        return _MISSING
+    return value if key is _MISSING else value.get(key, _MISSING)
+
+
+def build_once(owner, name: str, version, build: Callable[[], T], key: Hashable = _MISSING) -> T:
+    """owner._<name> if it was built for version, else build() it in exactly one thread.
+
+    owner keeps the value in ``_<name>`` and what it was built from in
+    ``_<name>_version``, with a KeyedLocks in ``_build_locks``. Hits read
+    the attributes without locking; a miss takes the lock for name,
+    re-checks and builds, so concurrent callers wait for one build instead
+    of repeating it. With a key, ``_<name>`` is a dict of values for one
+    version, replaced rather than mutated so readers never see it change.
+
+    Pass the version read *before* the inputs: a value built while the
+    data moved on is then stamped with the older version and rebuilt on
+    the next call rather than served as current. Versions only go up; a
+    build that finishes after a newer one is returned but not published.
+    """
+    value = _lookup(owner, name, version, key)
+    if value is not _MISSING:
+        return value
+    with owner._build_locks(name if key is _MISSING else (name, key)):
+        value = _lookup(owner, name, version, key)
+        if value is not _MISSING:
+            return value
+        value = build()
+        with owner._build_locks(name):
+            stamp = getattr(owner, f'_{name}_version')
+            if stamp is not None and stamp > version:
+                return value  # a newer version was published while building
+            if key is not _MISSING:
+                current = getattr(owner, f'_{name}') if stamp == version else None
+                value_or_dict = {**(current or {}), key: value}
+            else:
+                value_or_dict = value
+            setattr(owner, f'_{name}', value_or_dict)
+            setattr(owner, f'_{name}_version', version)
+        return value
+
+
+class Lazy:
+    """A value created by factory on first use, once however many threads ask."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value = _MISSING
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        value = self._value
+        if value is _MISSING:
+            with self._lock:
+                value = self._value
+                if value is _MISSING:
+                    value = self._value = self._factory()
+        return value
+
+    def reset(self) -> None:
+        """Forget the value; the next get() creates a new one."""
+        with self._lock:
+            self._value = _MISSING
+
+
+class _Flight:
+    """One in-progress call and, once done is set, its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and share its result, or its exception. Nothing is kept once
+    the call returns, so this complements a cache rather than replacing it.
+    """
+
+    def __init__(self):
+        self.executed = 0  # calls that ran the function
+        self.coalesced = 0  # calls that shared another's result
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """(result, shared): func()'s result, run here or by a concurrent caller with the same key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value, False
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed and coalesced call counts, and calls now in flight."""
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
@@ -0,0 +1,100 @@
+"""Entity consolidation with intercompany eliminations for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, List
+
+from .cube import month_columns, to_period
+from .fx import FxRates
+from .hierarchy import Tree
+from .pnl import DERIVED_LINES, PnLSummary, TOTAL_ENTITY, classify_account, derive_lines
+
+
+GROUP = 'Group'
+
+
+def entity_tree(entities: Iterable[str], structure: pd.DataFrame) -> Tree:
+    """Entity tree from an Entity/Parent table (e.g. legal entity -> country -> region).
+
+    Entities missing from the table, and nodes without a parent, sit
+    directly under GROUP, so GROUP always consolidates everything.
+    """
+    parents = {GROUP: None}
+    if not structure.empty:
+        for entity, parent in zip(structure['Entity'], structure['Parent']):
+            parents[str(entity)] = GROUP if pd.isna(parent) or str(parent) == '' else str(parent)
+    for parent in list(parents.values()):
+        if parent is not None and parent not in parents:
+            parents[parent] = GROUP
+    for entity in entities:
+        parents.setdefault(str(entity), GROUP)
+    return Tree(parents)
+
+
+class Consolidation:
+    """Consolidated USD P&L for every node of an entity tree.
+
+    Entity P&Ls are posted to their own nodes. Each intercompany
+    elimination (an amount Entity booked in Account against Counterparty)
+    is posted as a negative offset at the lowest node holding both
+    parties, so it cancels there and in every node above. One rollup then
+    gives each node's consolidated P&L, and node/month lookups are O(1).
+    """
+
+    def __init__(self, tree: Tree, pnl: PnLSummary, eliminations: pd.DataFrame, rates: FxRates):
+        self.tree = tree
+        self.columns = pnl.columns
+        self.values = {}  # scenario -> (node, month, column)
+        self._months = {}  # scenario -> {period: position}
+
+        base = [c for c in self.columns if c not in DERIVED_LINES]
+        frame = pnl.frame[pnl.frame.index.get_level_values('entity') != TOTAL_ENTITY]
+        for scenario in frame.index.get_level_values('scenario').unique():
+            part = frame.xs(scenario, level='scenario')
+            months = part.index.get_level_values('month').unique().sort_values()
+            self._months[scenario] = {period: i for i, period in enumerate(months)}
+
+            own = np.zeros((len(tree), len(months), len(base)))
+            nodes = tree.positions(part.index.get_level_values('entity'))
+            columns = months.get_indexer(part.index.get_level_values('month'))
+            own[nodes, columns] = part[base].to_numpy()
+            self._post_eliminations(own, eliminations, rates, scenario, base)
+
+            totals = tree.rollup(own)
+            lines = derive_lines(dict(zip(base, np.moveaxis(totals, 2, 0))))
+            self.values[scenario] = np.stack([lines[c] for c in self.columns], axis=2)
+
+    def _post_eliminations(self, own: np.ndarray, eliminations: pd.DataFrame, rates: FxRates,
+                           scenario: str, base: List[str]) -> None:
+        """Add each elimination, negated and in USD, at its parties' common ancestor."""
+        if eliminations.empty:
+            return
+        scenarios = eliminations['Scenario'] if 'Scenario' in eliminations.columns else 'actual'
+        rules = eliminations[np.asarray(scenarios == scenario) & eliminations['Account'].map(
+            lambda a: classify_account(str(a)) in base).to_numpy()]
+        months = [m for m in month_columns(rules) if to_period(m) in self._months[scenario]]
+        if rules.empty or not months:
+            return
+
+        currencies = rules['Currency'] if 'Currency' in rules.columns else ['USD'] * len(rules)
+        usd = rules[months].astype(float).to_numpy() * rates.matrix(currencies, months)
+        nodes = self.tree.positions([
+            self.tree.common_ancestor(str(e), str(c)) for e, c in zip(rules['Entity'], rules['Counterparty'])
+        ])
+        columns = np.array([self._months[scenario][to_period(m)] for m in months], dtype=np.intp)
+        lines = np.array([base.index(classify_account(str(a))) for a in rules['Account']], dtype=np.intp)
+        np.add.at(own, (nodes[:, None], columns[None, :], lines[:, None]), -np.nan_to_num(usd))
+
+    def row(self, node: str, month, scenario: str = 'actual') -> Dict[str, float]:
+        """Consolidated P&L of a node for one month; KeyError for an unknown node or month."""
+        positions = self._months.get(scenario, {})
+        period = to_period(month)
+        if period not in positions:
+            raise KeyError(month)
+        column = positions[period]
+        return dict(zip(self.columns, self.values[scenario][self.tree.node(node), column].tolist()))
+
+    def children(self, node: str) -> List[str]:
+        """Nodes directly under node, for drilling down."""
+        return self.tree.children(node)
@@ -0,0 +1,329 @@
+"""Long-format financial cube for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+ID_COLUMNS = ['Entity', 'Account', 'Currency']
+CUBE_LEVELS = ['scenario', 'month', 'account', 'entity']
+ROW_LEVELS = ['scenario', 'entity', 'account', 'currency']
+
+
+def to_period(label) -> pd.Period:
+    """Parse a month label such as 'Jun 2025' into a monthly period."""
+    if isinstance(label, pd.Period):
+        return label.asfreq('M')
+    return pd.Period(label, freq='M')
+
+
+def month_label(period: pd.Period) -> str:
+    """Format a monthly period the way the source files do ('Jun 2025')."""
+    return period.strftime('%b %Y')
+
+
+def month_columns(df: pd.DataFrame) -> List[str]:
+    """Return the month columns of a wide ledger frame in file order."""
+    columns = []
+    for column in df.columns:
+        if column in ID_COLUMNS:
+            continue
+        try:
+            to_period(column)
+        except (ValueError, TypeError):
+            continue
+        columns.append(column)
+    return columns
+
+
+def _periods(labels) -> pd.PeriodIndex:
+    return pd.PeriodIndex([to_period(label) for label in labels], freq='M')
+
+
+def _melt(df: pd.DataFrame, scenario: str, columns: List[str]) -> pd.DataFrame:
+    """Unpivot the month columns of a wide frame into cube rows."""
+    wide = df if 'Currency' in df.columns else df.assign(Currency='USD')
+    long = wide.melt(
+        id_vars=ID_COLUMNS,
+        value_vars=columns,
+        var_name='month',
+        value_name='value'
+    )
+    # melt stacks one block of len(wide) rows per month column
+    long['month'] = _periods(columns).repeat(len(wide))
+    long['scenario'] = scenario
+    long = long.dropna(subset=['value'])
+    return long.rename(columns={'Entity': 'entity', 'Account': 'account', 'Currency': 'currency'})
+
+
+def _index(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate cube rows and index them by CUBE_LEVELS."""
+    parts = [part for part in parts if not part.empty]
+    if parts:
+        long = pd.concat(parts, ignore_index=True)
+    else:
+        long = pd.DataFrame(columns=CUBE_LEVELS + ['currency', 'value'])
+
+    for column in ['scenario', 'account', 'entity', 'currency']:
+        long[column] = long[column].astype('category')
+    long['month'] = pd.PeriodIndex(long['month'], freq='M')
+    long['value'] = long['value'].astype(float)
+    return long.set_index(CUBE_LEVELS).sort_index()
+
+
+def _categorize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Restore sorted categorical labels after pd.concat widened them to object.
+
+    Labels no row uses any more are dropped, so a deleted account or
+    entity does not linger in the levels and categories. Only the level
+    codes are remapped; the rows themselves are not re-hashed.
+    """
+    index = frame.index.remove_unused_levels()
+    levels, codes = [], []
+    for i, name in enumerate(CUBE_LEVELS):
+        level = index.levels[i] if name == 'month' else pd.Index(np.asarray(index.levels[i], dtype=object))
+        order = level.argsort()
+        level = level.take(order)
+        levels.append(level if name == 'month' else pd.CategoricalIndex(level, categories=level))
+        codes.append(np.argsort(order)[index.codes[i]])
+    frame = frame.set_axis(pd.MultiIndex(levels=levels, codes=codes, names=index.names))
+    currency = pd.Categorical(frame['currency']).remove_unused_categories()
+    # Assign a bare Categorical so pandas does not realign on the index
+    return frame.assign(currency=currency.reorder_categories(sorted(currency.categories)))
+
+
+def diff_tables(old: pd.DataFrame, new: pd.DataFrame) -> Dict:
+    """Describe how a wide source table changed between two reads.
+
+    Rows are keyed by whichever of Entity/Account/Currency/Month the table
+    has. Returns added/removed month labels and added/changed/deleted row
+    keys; ``full`` is set when duplicate keys make a row diff meaningless.
+    """
+    keys = [c for c in ID_COLUMNS + ['Month'] if c in new.columns]
+    old_months, new_months = month_columns(old), month_columns(new)
+    delta = {
+        'added_months': [m for m in new_months if m not in old_months],
+        'removed_months': [m for m in old_months if m not in new_months],
+        'added_rows': [],
+        'changed_rows': [],
+        'deleted_rows': [],
+        'full': False
+    }
+
+    before, after = old.set_index(keys), new.set_index(keys)
+    if not (before.index.is_unique and after.index.is_unique):
+        delta['full'] = True
+        return delta
+
+    common = before.index.intersection(after.index)
+    shared = [c for c in after.columns if c in before.columns]
+    a, b = before.loc[common, shared], after.loc[common, shared]
+    same = ((a == b) | (a.isna() & b.isna())).all(axis=1)
+
+    delta['added_rows'] = _keys(after.index.difference(before.index))
+    delta['deleted_rows'] = _keys(before.index.difference(after.index))
+    delta['changed_rows'] = _keys(common[~same.to_numpy()])
+    return delta
+
+
+def _keys(index: pd.Index) -> List[Tuple]:
+    return [key if isinstance(key, tuple) else (key,) for key in index]
+
+
+def is_empty_delta(delta: Dict) -> bool:
+    """True when a delta records no change at all."""
+    return not delta['full'] and not any(
+        delta[k] for k in ('added_months', 'removed_months', 'added_rows', 'changed_rows', 'deleted_rows')
+    )
+
+
+class FinancialCube:
+    """Ledger values indexed by (entity, account, month, scenario).
+
+    The index is ordered scenario → month → account → entity so the
+    common "one scenario, one month" question is a sorted-prefix lookup
+    rather than a scan of the whole ledger.
+    """
+
+    def __init__(self, frame: pd.DataFrame, sources: Dict[str, Tuple[str, pd.PeriodIndex]],
+                 balances: Iterable[str] = ()):
+        self.frame = frame
+        # Source table name -> (scenario, months it covers)
+        self.sources = sources
+        # Tables of month-end balances: their months are not P&L months of the scenario
+        self.balances = frozenset(balances)
+        months: Dict[str, set] = {}
+        balance_months = set()
+        for name, (scenario, periods) in sources.items():
+            if name in self.balances:
+                balance_months.update(periods)
+            else:
+                months.setdefault(scenario, set()).update(periods)
+        self.months = {s: pd.PeriodIndex(sorted(p), freq='M') for s, p in months.items()}
+        self.balance_months = pd.PeriodIndex(sorted(balance_months), freq='M')
+
+    @classmethod
+    def from_wide(cls, tables: Iterable[Tuple[str, str, pd.DataFrame]],
+                  balances: Iterable[str] = ()) -> 'FinancialCube':
+        """Build a cube from (name, scenario, wide frame) source tables.
+
+        Tables named in balances hold month-end balances; their rows join
+        the scenario but their months do not count as its P&L months.
+        """
+        parts = []
+        sources = {}
+
+        for name, scenario, df in tables:
+            if df is None or df.empty:
+                continue
+            sources[name] = (scenario, _periods(month_columns(df)))
+            parts.append(_melt(df, scenario, month_columns(df)))
+
+        return cls(_index(parts), sources, balances)
+
+    def apply_delta(self, name: str, df: pd.DataFrame, delta: Dict) -> 'FinancialCube':
+        """Return a new cube with one source table's changes spliced in.
+
+        Only the series named in the delta are rewritten across all months;
+        every other series of the table only gains its added months.
+        """
+        scenario, _ = self.sources[name]
+        added = set(_periods(delta['added_months']))
+        removed = set(_periods(delta['removed_months']))
+        rewrite = {key[:2] for key in delta['added_rows'] + delta['changed_rows'] + delta['deleted_rows']}
+
+        # Work on the index codes so the untouched bulk of the cube is never rebuilt
+        index = self.frame.index
+        entity, account = CUBE_LEVELS.index('entity'), CUBE_LEVELS.index('account')
+        n_accounts = len(index.levels[account])
+
+        def pair_keys(pairs) -> np.ndarray:
+            pairs = list(pairs)
+            e = index.levels[entity].get_indexer([p[0] for p in pairs])
+            a = index.levels[account].get_indexer([p[1] for p in pairs])
+            known = (e >= 0) & (a >= 0)
+            return e[known].astype(np.int64) * n_accounts + a[known]
+
+        row_keys = index.codes[entity].astype(np.int64) * n_accounts + index.codes[account]
+        table_pairs = rewrite | set(zip(df['Entity'], df['Account']))
+        in_table = (
+            (index.codes[0] == index.levels[0].get_indexer([scenario])[0])
+            & np.isin(row_keys, pair_keys(table_pairs))
+        )
+        month_codes = index.levels[CUBE_LEVELS.index('month')].get_indexer(list(added | removed))
+        drop = in_table & (
+            np.isin(row_keys, pair_keys(rewrite))
+            | np.isin(index.codes[CUBE_LEVELS.index('month')], month_codes)
+        )
+
+        columns = month_columns(df)
+        rewritten = pd.MultiIndex.from_arrays([df['Entity'], df['Account']]).isin(list(rewrite))
+        spliced = _index([
+            _melt(df[rewritten], scenario, columns),
+            _melt(df[~rewritten], scenario, [c for c in columns if to_period(c) in added])
+        ])
+        kept = [self.frame[~drop]] + ([spliced] if not spliced.empty else [])
+        frame = _categorize(pd.concat(kept)).sort_index()
+
+        sources = dict(self.sources)
+        sources[name] = (scenario, _periods(columns))
+        return FinancialCube(frame, sources, self.balances)
+
+    @property
+    def periods(self) -> pd.PeriodIndex:
+        """All months present in any scenario or balance table, in calendar order."""
+        periods = set(self.balance_months)
+        for index in self.months.values():
+            periods.update(index)
+        return pd.PeriodIndex(sorted(periods), freq='M')
+
+    def accounts(self, prefix: Optional[str] = None) -> List[str]:
+        """Account names in the cube, optionally limited to a prefix."""
+        names = self.frame.index.levels[CUBE_LEVELS.index('account')]
+        return [str(n) for n in names if prefix is None or str(n).startswith(prefix)]
+
+    def slice(self, month, scenario: str = 'actual',
+              accounts: Optional[List[str]] = None) -> pd.DataFrame:
+        """Return the (account, entity) rows for one month and scenario.
+
+        Raises KeyError when the scenario has no such month, mirroring a
+        missing column on the wide frames.
+        """
+        period = to_period(month)
+        if period not in self.months.get(scenario, ()):
+            raise KeyError(month)
+
+        try:
+            rows = self.frame.loc[(scenario, period)]
+        except KeyError:
+            return self.frame.iloc[:0].droplevel(['scenario', 'month'])
+
+        if accounts is not None:
+            rows = rows[rows.index.get_level_values('account').isin(accounts)]
+        return rows
+
+
+class LedgerMatrix:
+    """Dense (series, month) array of ledger values.
+
+    Each row is one (scenario, entity, account, currency) series and each
+    column one month of ``months``; gaps are NaN. ``values`` is either an
+    in-memory array or a read-only memory map shared between processes;
+    ``usd``, when set, is the same array in USD, mapped the same way.
+    """
+
+    def __init__(self, rows: pd.DataFrame, months: pd.PeriodIndex, values: np.ndarray,
+                 scenario_months: Dict[str, pd.PeriodIndex], usd: Optional[np.ndarray] = None):
+        self.rows = rows
+        self.months = months
+        self.values = values
+        self.scenario_months = scenario_months
+        self.usd = usd
+        self._positions = {period: i for i, period in enumerate(months)}
+        self._masks = {}
+
+    @classmethod
+    def from_cube(cls, cube: FinancialCube) -> 'LedgerMatrix':
+        """Pivot a cube into one row per series and one column per month."""
+        periods = cube.periods
+        flat = cube.frame.reset_index()
+        if flat.empty:
+            rows = pd.DataFrame({level: pd.Categorical([]) for level in ROW_LEVELS})
+            return cls(rows, periods, np.empty((0, len(periods))), dict(cube.months))
+
+        series = (
+            flat.groupby(ROW_LEVELS + ['month'], observed=True)['value'].sum()
+            .unstack('month')
+            .reindex(columns=periods)
+        )
+        rows = series.index.to_frame(index=False)
+        return cls(rows, periods, series.to_numpy(dtype=float), dict(cube.months))
+
+    def position(self, month, scenario: str = 'actual') -> int:
+        """Column of a month; KeyError if the scenario has no such month."""
+        period = to_period(month)
+        if period not in self.scenario_months.get(scenario, ()):
+            raise KeyError(month)
+        return self._positions[period]
+
+    def positions(self, months, scenario: str = 'actual') -> np.ndarray:
+        """Columns of several months; -1 where the scenario has no such month."""
+        periods = pd.PeriodIndex([to_period(m) for m in months], freq='M')
+        present = periods.isin(self.scenario_months.get(scenario, periods[:0]))
+        return np.where(present, self.months.get_indexer(periods), -1)
+
+    def accounts(self, prefix: Optional[str] = None) -> List[str]:
+        """Account names in the ledger, optionally limited to a prefix."""
+        names = self.rows['account'].cat.categories
+        return [str(n) for n in names if prefix is None or str(n).startswith(prefix)]
+
+    def mask(self, scenario: str = 'actual', accounts: Optional[List[str]] = None) -> np.ndarray:
+        """Boolean row selector for a scenario and optional account list."""
+        key = (scenario, None if accounts is None else tuple(accounts))
+        if key not in self._masks:
+            mask = (self.rows['scenario'] == scenario).to_numpy()
+            if accounts is not None:
+                mask = mask & self.rows['account'].isin(accounts).to_numpy()
+            self._masks[key] = mask
+        return self._masks[key]
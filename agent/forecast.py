@@ -0,0 +1,282 @@
+"""Batched per-series forecasts for CFO Copilot."""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Tuple
+
+from .cube import LedgerMatrix, month_label, to_period
+from .pnl import DERIVED_LINES, TOTAL_ENTITY, PnLSummary, derive_lines
+
+
+MODELS = ('seasonal_naive', 'exp_smoothing', 'linear_trend')
+SEASON = 12
+ALPHAS = np.linspace(0.1, 0.9, 9)  # smoothing weights tried for every series
+HOLDOUT = 3  # months held back to pick a model per series
+DEFAULT_FORECAST_HORIZON = 12
+DEFAULT_LEVEL = 80  # % prediction interval
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Each row with gaps filled from the last observed month (leading gaps stay NaN)."""
+    observed = ~np.isnan(values)
+    last = np.maximum.accumulate(np.where(observed, np.arange(values.shape[1]), 0), axis=1)
+    return values[np.arange(len(values))[:, None], last]
+
+
+def _mean(errors: np.ndarray) -> np.ndarray:
+    """Mean of each row's non-NaN values, NaN for rows without any."""
+    observed = ~np.isnan(errors)
+    count = observed.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(observed, errors, 0.0).sum(axis=1) / np.where(count > 0, count, np.nan)
+
+
+def _rms(errors: np.ndarray) -> np.ndarray:
+    """Root mean square of each row's non-NaN errors, NaN for rows without any."""
+    return np.sqrt(_mean(errors ** 2))
+
+
+def seasonal_naive(values: np.ndarray, horizon: int, season: int = SEASON) -> Tuple[np.ndarray, np.ndarray]:
+    """Each month repeats the same month a season earlier; plain naive without more than a season of history.
+
+    Returns (series, horizon) forecasts and standard errors.
+    """
+    months = values.shape[1]
+    if months <= season:
+        season = 1  # no seasonal pairs to measure the error on
+    steps = np.arange(horizon)
+    point = _ffill(values)[:, months - season + steps % season]
+    sigma = _rms(values[:, season:] - values[:, :-season])
+    return point, sigma[:, None] * np.sqrt(steps // season + 1)
+
+
+def exponential_smoothing(values: np.ndarray, horizon: int, alphas: np.ndarray = ALPHAS) -> Tuple[np.ndarray, np.ndarray]:
+    """Simple exponential smoothing, with each series' weight picked from alphas by one-step error.
+
+    Every weight runs as one (alpha, series) array, stepping through the
+    months once; gaps carry the level forward. Returns (series, horizon)
+    forecasts and standard errors.
+    """
+    weights = np.asarray(alphas, dtype=float)[:, None]
+    level = np.full((len(weights), len(values)), np.nan)
+    sse = np.zeros_like(level)
+    count = np.zeros(len(values))
+    for month in range(values.shape[1]):
+        actual = values[:, month]
+        observed = ~np.isnan(actual)
+        error = actual - level
+        scored = observed & ~np.isnan(level[0])
+        sse += np.where(scored, error, 0.0) ** 2
+        count += scored
+        level = np.where(np.isnan(level), actual, np.where(observed, level + weights * error, level))
+
+    rows = np.arange(len(values))
+    best = sse.argmin(axis=0)
+    alpha = weights[best, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(sse[best, rows] / np.where(count > 0, count, np.nan))
+    steps = np.arange(horizon)
+    point = np.repeat(level[best, rows][:, None], horizon, axis=1)
+    return point, sigma[:, None] * np.sqrt(1 + steps * alpha[:, None] ** 2)
+
+
+def linear_trend(values: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Least-squares line through each series' observed months, extended forward.
+
+    The fit is closed-form sums over the month axis, so every series is
+    fitted at once. Returns (series, horizon) forecasts and standard errors.
+    """
+    months = values.shape[1]
+    x = np.arange(months, dtype=float)
+    observed = ~np.isnan(values)
+    y = np.where(observed, values, 0.0)
+    n = observed.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = (observed * x).sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+        sxx = (observed * x ** 2).sum(axis=1) - n * x_mean ** 2
+        sxy = (y * x).sum(axis=1) - n * x_mean * y_mean
+        slope = np.where(sxx > 0, sxy / sxx, 0.0)
+        intercept = y_mean - slope * x_mean
+
+        residuals = np.where(observed, values - (intercept[:, None] + slope[:, None] * x), 0.0)
+        variance = (residuals ** 2).sum(axis=1) / np.where(n > 2, n - 2, np.nan)
+        future = months + np.arange(horizon, dtype=float)
+        spread = np.where(sxx > 0, 1.0 / sxx, 0.0)[:, None] * (future - x_mean[:, None]) ** 2
+        sigma = np.sqrt(variance[:, None] * (1 + 1 / n[:, None] + spread))
+    return intercept[:, None] + slope[:, None] * future, sigma
+
+
+FITTERS = {'seasonal_naive': seasonal_naive, 'exp_smoothing': exponential_smoothing, 'linear_trend': linear_trend}
+
+
+def forecast_series(values: np.ndarray, horizon: int = DEFAULT_FORECAST_HORIZON,
+                    model: str = 'auto') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Forecast every row of a (series, month) array on a gap-free monthly axis.
+
+    model is one of MODELS, or 'auto' to pick one per series: each model
+    is fitted without the last HOLDOUT months and the one with the lowest
+    mean absolute error over them wins, then refitted on all months.
+    Histories too short to hold anything back use exponential smoothing.
+    Returns (series, horizon) forecasts and standard errors, and each
+    series' model name; too little history gives NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    if model != 'auto' and model not in FITTERS:
+        raise ValueError(f"Unknown forecast model {model!r}; use {', '.join(MODELS)} or 'auto'")
+    if model != 'auto' or values.shape[1] < 2 * HOLDOUT:
+        name = 'exp_smoothing' if model == 'auto' else model
+        point, sigma = FITTERS[name](values, horizon)
+        return point, sigma, np.full(len(values), name, dtype=object)
+
+    train, test = values[:, :-HOLDOUT], values[:, -HOLDOUT:]
+    scores = np.vstack([_mean(np.abs(FITTERS[name](train, HOLDOUT)[0] - test)) for name in MODELS])
+    best = np.where(np.isnan(scores), np.inf, scores).argmin(axis=0)
+
+    point = np.empty((len(values), horizon))
+    sigma = np.empty((len(values), horizon))
+    for i, name in enumerate(MODELS):
+        chosen = best == i
+        if chosen.any():
+            point[chosen], sigma[chosen] = FITTERS[name](values[chosen], horizon)
+    return point, sigma, np.array(MODELS, dtype=object)[best]
+
+
+class Forecast:
+    """Point forecasts and prediction intervals for many keyed monthly series.
+
+    ``point`` and ``sigma`` are (key, month) arrays over ``months``, the
+    months after the history; ``lower`` and ``upper`` bound the central
+    ``level`` % interval assuming normal errors, and ``model`` names each
+    key's model.
+    """
+
+    def __init__(self, keys: pd.DataFrame, months: pd.PeriodIndex, point: np.ndarray, sigma: np.ndarray,
+                 model: np.ndarray, level: float = DEFAULT_LEVEL):
+        self.keys = keys
+        self.months = months
+        self.point = point
+        self.sigma = sigma
+        self.model = model
+        self.level = level
+        z = NormalDist().inv_cdf(0.5 + level / 200)
+        self.lower = point - z * sigma
+        self.upper = point + z * sigma
+
+    @classmethod
+    def fit(cls, keys: pd.DataFrame, history, values: np.ndarray, horizon: int = DEFAULT_FORECAST_HORIZON,
+            model: str = 'auto', level: float = DEFAULT_LEVEL) -> 'Forecast':
+        """Fit (key, month) values over the history months, which may have gaps."""
+        history = pd.PeriodIndex(history, freq='M')
+        axis = pd.period_range(history.min(), history.max(), freq='M')
+        placed = np.full((len(values), len(axis)), np.nan)
+        placed[:, axis.get_indexer(history)] = values
+        point, sigma, names = forecast_series(placed, horizon, model)
+        return cls(keys, pd.period_range(axis[-1] + 1, periods=horizon, freq='M'), point, sigma, names, level)
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, usd_values: np.ndarray, horizon: int = DEFAULT_FORECAST_HORIZON,
+                    model: str = 'auto', level: float = DEFAULT_LEVEL) -> 'Forecast':
+        """Forecast the USD actuals of every (entity, account), summed over currencies."""
+        rows = matrix.rows
+        selected = (rows['scenario'] == 'actual').to_numpy()
+        months = matrix.scenario_months.get('actual', matrix.months[:0])
+        columns = matrix.months.get_indexer(months)
+        pairs = pd.MultiIndex.from_arrays([rows['entity'][selected].astype(str), rows['account'][selected].astype(str)])
+        codes, keys = pd.factorize(pairs, sort=True)
+
+        block = usd_values[selected][:, columns]
+        totals = np.zeros((len(keys), len(months)))
+        counts = np.zeros((len(keys), len(months)))
+        np.add.at(totals, codes, np.nan_to_num(block))
+        np.add.at(counts, codes, ~np.isnan(block))
+
+        keys = pd.DataFrame({
+            'entity': keys.get_level_values(0).to_numpy(dtype=object),
+            'account': keys.get_level_values(1).to_numpy(dtype=object)
+        })
+        return cls.fit(keys, months, np.where(counts > 0, totals, np.nan), horizon, model, level)
+
+    @classmethod
+    def from_pnl(cls, pnl: PnLSummary, horizon: int = DEFAULT_FORECAST_HORIZON,
+                 model: str = 'auto', level: float = DEFAULT_LEVEL) -> 'Forecast':
+        """Forecast the actual P&L of every entity and the total.
+
+        Base lines (revenue, cogs, opex:*) are fitted; the derived lines
+        follow from their forecasts through derive_lines, with errors
+        added in quadrature, so EBITDA always equals its parts.
+        """
+        actual = pnl.frame.xs('actual', level='scenario')
+        entities = pd.Index(sorted(actual.index.get_level_values('entity').unique()))
+        history = pd.PeriodIndex(actual.index.get_level_values('month').unique(), freq='M').sort_values()
+        base = [c for c in pnl.columns if c not in DERIVED_LINES]
+
+        values = np.full((len(entities), len(history), len(base)), np.nan)
+        values[entities.get_indexer(actual.index.get_level_values('entity')),
+               history.get_indexer(actual.index.get_level_values('month'))] = actual[base].to_numpy()
+        fitted = cls.fit(None, history, values.transpose(0, 2, 1).reshape(-1, len(history)), horizon, model, level)
+
+        shape = (len(entities), len(base), horizon)
+        point = derive_lines(dict(zip(base, fitted.point.reshape(shape).transpose(1, 0, 2))))
+        variance = dict(zip(base, (fitted.sigma ** 2).reshape(shape).transpose(1, 0, 2)))
+        variance['opex'] = sum((variance[c] for c in base if c.startswith('opex:')), np.zeros(shape[::2]))
+        variance['gross_profit'] = variance['revenue'] + variance['cogs']
+        variance['ebitda'] = variance['gross_profit'] + variance['opex']
+        models = dict(zip(base, fitted.model.reshape(shape[:2]).T))
+
+        lines = base + DERIVED_LINES
+        keys = pd.DataFrame({
+            'entity': np.tile(entities.to_numpy(dtype=object), len(lines)),
+            'line': np.repeat(np.array(lines, dtype=object), len(entities))
+        })
+        return cls(
+            keys, fitted.months,
+            np.concatenate([point[line] for line in lines]),
+            np.sqrt(np.concatenate([variance[line] for line in lines])),
+            np.concatenate([models.get(line, np.full(len(entities), 'derived', dtype=object)) for line in lines]),
+            level
+        )
+
+    def select(self, **filters) -> pd.DataFrame:
+        """Tidy rows (key columns, month, model, forecast, lower, upper) for keys and months matching the filters.
+
+        Each filter is a column=value (or list of values); month filters
+        the forecast months.
+        """
+        months = filters.pop('month', None)
+        mask = np.ones(len(self.keys), dtype=bool)
+        for column, value in filters.items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.keys[column].isin(values).to_numpy()
+        columns = np.arange(len(self.months))
+        if months is not None:
+            months = months if isinstance(months, (list, tuple, set)) else [months]
+            columns = self.months.get_indexer(pd.PeriodIndex([to_period(m) for m in months], freq='M'))
+            columns = columns[columns >= 0]
+
+        rows = np.flatnonzero(mask)
+        labels = np.array([month_label(p) for p in self.months], dtype=object)
+        index = (np.repeat(rows, len(columns)), np.tile(columns, len(rows)))
+        return pd.concat([
+            self.keys.iloc[index[0]].reset_index(drop=True),
+            pd.DataFrame({
+                'month': labels[index[1]],
+                'model': self.model[index[0]],
+                'forecast': self.point[index],
+                'lower': self.lower[index],
+                'upper': self.upper[index]
+            })
+        ], axis=1)
+
+    def row(self, month, entity: str = TOTAL_ENTITY) -> Dict[str, Tuple[float, float, float]]:
+        """(forecast, lower, upper) of each P&L line for one month; KeyError outside the horizon."""
+        table = self.select(month=month, entity=entity)
+        if table.empty:
+            raise KeyError(month)
+        return {line: (f, lo, hi) for line, f, lo, hi in
+                zip(table['line'], table['forecast'], table['lower'], table['upper'])}
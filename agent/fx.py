@@ -0,0 +1,85 @@
+"""FX rate matrix for CFO Copilot."""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from typing import Iterable, List
+
+from .cube import to_period
+
+
+RATE_COLUMN = re.compile(r'^([A-Z]{3})_USD$')
+INVERSE_RATE_COLUMN = re.compile(r'^USD_([A-Z]{3})$')
+BUDGET_SUFFIX = '_Budget'  # EUR_USD_Budget: the planning rate the budget was set at
+
+
+class FxRates:
+    """USD value of one unit of each currency, indexed by (month, currency).
+
+    Built once from the fx table: ``XXX_USD`` columns give rates directly
+    and ``USD_XXX`` columns are inverted for currencies without a direct
+    quote. Months missing from the table use the nearest earlier quote
+    (or the first one); currencies without any quote convert at 1.0,
+    i.e. are left as they are.
+    """
+
+    def __init__(self, rates: pd.DataFrame):
+        self.rates = rates
+        self.currencies = list(rates.columns)
+        self._columns = {currency: i for i, currency in enumerate(self.currencies)}
+
+    @classmethod
+    def from_table(cls, fx: pd.DataFrame, suffix: str = '') -> 'FxRates':
+        """Build the matrix from a table with a Month column and rate columns.
+
+        suffix picks another set of rate columns, e.g. '_Budget' reads
+        EUR_USD_Budget and USD_EUR_Budget.
+        """
+        direct = re.compile(RATE_COLUMN.pattern[:-1] + re.escape(suffix) + '$')
+        inverse = re.compile(INVERSE_RATE_COLUMN.pattern[:-1] + re.escape(suffix) + '$')
+        rates = {}
+        for column in fx.columns:
+            match = direct.match(str(column))
+            if match:
+                rates[match.group(1)] = fx[column].astype(float).to_numpy()
+        for column in fx.columns:
+            match = inverse.match(str(column))
+            if match and match.group(1) not in rates:
+                rates[match.group(1)] = 1.0 / fx[column].astype(float).to_numpy()
+
+        months = pd.PeriodIndex([to_period(m) for m in fx['Month']], freq='M')
+        table = pd.DataFrame(rates, index=months)
+        table = table[~table.index.duplicated()].sort_index()
+        table['USD'] = 1.0
+        return cls(table)
+
+    def for_months(self, months: Iterable) -> pd.DataFrame:
+        """Rates for the given months, filling gaps from neighbouring quotes."""
+        periods = pd.PeriodIndex([to_period(m) for m in months], freq='M')
+        known = self.rates.index.union(periods.unique())
+        return self.rates.reindex(known).ffill().bfill().fillna(1.0).reindex(periods)
+
+    def column_positions(self, currencies: Iterable) -> np.ndarray:
+        """Column of each currency, or -1 where there is no quote."""
+        labels = pd.Categorical(currencies)
+        positions = np.array([self._columns.get(str(c), -1) for c in labels.categories], dtype=np.intp)
+        if not len(positions):
+            return np.full(len(labels), -1, dtype=np.intp)
+        return np.where(labels.codes >= 0, positions[labels.codes], -1)
+
+    def matrix(self, currencies: Iterable, months: Iterable) -> np.ndarray:
+        """(row, month) array of rates for rows in the given currencies."""
+        table = self.for_months(months).to_numpy()
+        # Append a column of ones for currencies without a quote
+        table = np.hstack([table, np.ones((len(table), 1))])
+        return table[:, self.column_positions(currencies)].T
+
+    def rate(self, month, currency: str) -> float:
+        """Rate for a single month and currency."""
+        return float(self.matrix([currency], [month])[0, 0])
+
+    def quoted(self, currencies: Iterable) -> List[bool]:
+        """Whether each currency has a quote (and so is converted)."""
+        return [str(c) in self._columns for c in currencies]
@@ -0,0 +1,143 @@
+"""Account and entity hierarchies with subtree rollups for CFO Copilot."""
+
+import numpy as np
+
+from typing import Dict, Iterable, List, Optional
+
+from .cube import LedgerMatrix
+
+
+SEPARATOR = ':'
+
+
+class Tree:
+    """Rooted forest over named nodes, numbered parents first.
+
+    Built from a child -> parent mapping (None for a root). Subtree rollups
+    are summed one depth level at a time from the leaves up.
+    """
+
+    def __init__(self, parents: Dict[str, Optional[str]]):
+        depths = {}
+        for node in parents:
+            path = []
+            while node is not None and node not in depths:
+                if node in path:
+                    raise ValueError(f"Cycle in hierarchy at {node!r}")
+                path.append(node)
+                node = parents.get(node)
+            depth = -1 if node is None else depths[node]
+            for step in reversed(path):
+                depth += 1
+                depths[step] = depth
+
+        self.nodes = sorted(depths, key=lambda n: (depths[n], n))
+        self._index = {node: i for i, node in enumerate(self.nodes)}
+        self.depths = np.array([depths[n] for n in self.nodes], dtype=np.intp)
+        self.parents = np.array([
+            self._index[parents[n]] if parents.get(n) is not None else -1 for n in self.nodes
+        ], dtype=np.intp)
+        self._children = {node: [] for node in self.nodes}
+        for node, parent in zip(self.nodes, self.parents):
+            if parent >= 0:
+                self._children[self.nodes[parent]].append(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._index
+
+    def node(self, name: str) -> int:
+        """Position of a node; KeyError if it is not in the tree."""
+        return self._index[name]
+
+    def positions(self, names: Iterable[str]) -> np.ndarray:
+        """Position of each node."""
+        return np.array([self._index[str(n)] for n in names], dtype=np.intp)
+
+    def children(self, name: str) -> List[str]:
+        """Direct children of a node."""
+        return self._children[name]
+
+    def ancestors(self, name: str) -> List[str]:
+        """The node and every node above it, nearest first."""
+        chain = []
+        position = self._index[name]
+        while position >= 0:
+            chain.append(self.nodes[position])
+            position = self.parents[position]
+        return chain
+
+    def common_ancestor(self, a: str, b: str) -> Optional[str]:
+        """Lowest node containing both a and b, or None in different roots."""
+        above_a = set(self.ancestors(a))
+        return next((n for n in self.ancestors(b) if n in above_a), None)
+
+    def rollup(self, own: np.ndarray) -> np.ndarray:
+        """Subtree totals from per-node values (node, ...) posted to each node itself."""
+        totals = np.array(own, dtype=float, copy=True)
+        for depth in range(int(self.depths.max(initial=0)), 0, -1):
+            level = np.flatnonzero(self.depths == depth)
+            np.add.at(totals, self.parents[level], totals[level])
+        return totals
+
+
+class AccountTree(Tree):
+    """Chart of accounts as a tree over ':'-separated account paths.
+
+    'Opex:Sales:Travel:Air' adds the nodes 'Opex', 'Opex:Sales',
+    'Opex:Sales:Travel' and itself.
+    """
+
+    def __init__(self, accounts: Iterable[str]):
+        parents = {}
+        for account in accounts:
+            parts = str(account).split(SEPARATOR)
+            for i in range(1, len(parts) + 1):
+                parents[SEPARATOR.join(parts[:i])] = SEPARATOR.join(parts[:i - 1]) or None
+        super().__init__(parents)
+
+
+class AccountRollup:
+    """Subtree totals of every account node for every scenario and month.
+
+    Built once from a USD ledger matrix, so any account at any depth, and
+    the breakdown of its children, is an array lookup.
+    """
+
+    def __init__(self, tree: AccountTree, matrix: LedgerMatrix, usd_values: np.ndarray):
+        self.tree = tree
+        self.matrix = matrix
+        self.values = {}
+        self.counts = {}  # rows with data under each node, to leave out empty branches
+
+        account_nodes = tree.positions(matrix.rows['account'].cat.categories)
+        for scenario in matrix.scenario_months:
+            selected = (matrix.rows['scenario'] == scenario).to_numpy()
+            nodes = account_nodes[matrix.rows['account'].cat.codes.to_numpy()[selected]]
+            block = usd_values[selected]
+
+            own = np.zeros((len(tree), len(matrix.months)))
+            counts = np.zeros((len(tree), len(matrix.months)))
+            np.add.at(own, nodes, np.nan_to_num(block))
+            np.add.at(counts, nodes, ~np.isnan(block))
+            self.values[scenario] = tree.rollup(own)
+            self.counts[scenario] = tree.rollup(counts)
+
+    def value(self, account: str, month, scenario: str = 'actual') -> float:
+        """USD total of an account and everything under it."""
+        column = self.matrix.position(month, scenario)
+        return float(self.values[scenario][self.tree.node(account), column])
+
+    def breakdown(self, account: str, month, scenario: str = 'actual') -> Dict[str, float]:
+        """USD total of each direct child with data, keyed by its name under account."""
+        column = self.matrix.position(month, scenario)
+        children = self.tree.children(account)
+        nodes = self.tree.positions(children)
+        totals = self.values[scenario][nodes, column]
+        present = self.counts[scenario][nodes, column] > 0
+        return {
+            child[len(account) + 1:]: float(total)
+            for child, total, has_data in zip(children, totals, present) if has_data
+        }
@@ -0,0 +1,117 @@
+"""Streaming ingestion of general-ledger exports for CFO Copilot."""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+from typing import Dict, Optional, Tuple
+
+from .cube import month_label
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+GL_COLUMNS = ['Entity', 'Account', 'Currency', 'Date', 'Amount']
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB.
+
+    Read from /proc on Linux; elsewhere falls back to the lifetime peak,
+    the closest figure the OS reports.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_mb()
+
+
+def ingest_gl(path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+              date_format: Optional[str] = None) -> Tuple[pd.DataFrame, Dict]:
+    """Aggregate a journal-line CSV into a wide monthly ledger.
+
+    The file is read ``chunksize`` lines at a time and each chunk is summed
+    into running (entity, account, currency, month) totals, so memory is
+    bounded by the size of the ledger rather than the export. Amounts are
+    taken as signed in the file. Returns the ledger in the actuals.csv
+    layout and an ingestion report. RSS is sampled after every chunk: the
+    report has the highest sample and its increase over the RSS at the
+    start, so memory used before the call does not count.
+    """
+    start = time.perf_counter()
+    start_rss = rss_mb()
+    samples = [start_rss]
+    totals = None
+    lines = 0
+
+    reader = pd.read_csv(
+        path,
+        usecols=GL_COLUMNS,
+        dtype={'Entity': str, 'Account': str, 'Currency': str, 'Amount': float},
+        chunksize=chunksize
+    )
+    for chunk in reader:
+        lines += len(chunk)
+        months = pd.to_datetime(chunk['Date'], format=date_format).dt.to_period('M')
+        part = chunk.groupby(['Entity', 'Account', 'Currency', months])['Amount'].sum()
+        totals = part if totals is None else totals.add(part, fill_value=0)
+        samples.append(rss_mb())
+
+    if totals is None:
+        ledger = pd.DataFrame(columns=['Entity', 'Account', 'Currency'])
+    else:
+        wide = totals.unstack('Date').sort_index(axis=1)
+        wide.columns = [month_label(p) for p in wide.columns]
+        ledger = wide.reset_index()
+
+    # Match the fixture layout: identifiers, months, then Currency
+    ledger = ledger[['Entity', 'Account'] + [c for c in ledger.columns if c not in GL_COLUMNS] + ['Currency']]
+
+    elapsed = time.perf_counter() - start
+    samples.append(rss_mb())
+    peak = max(samples) if start_rss is not None else None
+    report = {
+        'rows': lines,
+        'series': len(ledger),
+        'seconds': elapsed,
+        'rows_per_sec': lines / elapsed if elapsed > 0 else float('inf'),
+        'peak_rss_mb': peak,
+        'rss_increase_mb': peak - start_rss if peak is not None else None
+    }
+    return ledger, report
+
+
+def format_report(report: Dict) -> str:
+    """One-line summary of an ingestion report."""
+    rss = "n/a"
+    if report['peak_rss_mb'] is not None:
+        rss = f"{report['peak_rss_mb']:,.0f} MB, +{report['rss_increase_mb']:,.0f} MB during ingestion"
+    return (f"Ingested {report['rows']:,} GL lines into {report['series']:,} series "
+            f"in {report['seconds']:.1f}s ({report['rows_per_sec']:,.0f} rows/sec, peak RSS {rss})")
+
+
+if __name__ == "__main__":
+    # python -m agent.ingest gl_export.csv fixtures/actuals.csv
+    if len(sys.argv) != 3:
+        print("Usage: python -m agent.ingest <gl_export.csv> <actuals.csv>")
+        sys.exit(1)
+    ledger, report = ingest_gl(sys.argv[1])
+    ledger.to_csv(sys.argv[2], index=False)
+    print(format_report(report))
@@ -0,0 +1,139 @@
+"""Memoization of analyzer results for CFO Copilot."""
+
+import copy
+import functools
+import inspect
+import threading
+
+import numpy as np
+import pandas as pd
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+from .concurrency import SingleFlight
+
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def _freeze(value) -> Hashable:
+    """Hashable stand-in for an argument: lists and arrays become tuples, dicts sorted items."""
+    if isinstance(value, np.ndarray):
+        return _freeze(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _detach(value):
+    """Copy of a cached result that a caller may modify freely."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+class AnalysisCache:
+    """Bounded least-recently-used cache with hit and miss counters.
+
+    Safe to share between threads: each operation holds a lock only for
+    the dictionary update, never while a value is computed. ``flights``
+    coalesces concurrent misses on one key into a single computation.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.flights = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """(True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, method: str = None) -> None:
+        """Drop every entry, or only those of one method."""
+        with self._lock:
+            if method is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == method]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, misses coalesced into another's computation, and current size."""
+        with self._lock:
+            hits, misses, evictions, size = self.hits, self.misses, self.evictions, len(self._entries)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'evictions': evictions,
+            'coalesced': self.flights.coalesced,
+            'size': size,
+            'maxsize': self.maxsize
+        }
+
+
+def memoized(method):
+    """Cache an analyzer method on (method, normalized args, data version).
+
+    Arguments are bound to the signature, so positional and keyword calls
+    share an entry, and the loader's data_version is part of the key, so
+    any data change misses. Exceptions are not cached. Callers get a copy
+    of the cached result. Concurrent misses on the same key wait for the
+    first one's computation instead of repeating it.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((name, _freeze(value)) for name, value in list(bound.arguments.items())[1:])
+        key = (method.__name__, arguments, self.loader.data_version)
+
+        def compute():
+            value = method(self, *args, **kwargs)
+            # Data that changed mid-call may have been read in part: don't
+            # file the result under the version the call started on
+            if self.loader.data_version == key[2]:
+                cache.put(key, value)
+            return value
+
+        hit, value = cache.get(key)
+        if not hit:
+            value, _ = cache.flights.do(key, compute)
+        return _detach(value)
+
+    return wrapper
@@ -0,0 +1,153 @@
+"""Entity-sharded aggregation of the ledger across a process pool for CFO Copilot."""
+
+import functools
+import multiprocessing
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from .cube import LedgerMatrix
+from .fx import FxRates
+from .pnl import DERIVED_LINES, TOTAL_ENTITY, PnLSummary, derive_lines
+
+
+def shard_rows(matrix: LedgerMatrix, shards: int) -> List[np.ndarray]:
+    """Row positions of the ledger split into at most ``shards`` groups of whole entities.
+
+    Entities stay in sorted order and each group holds about the same
+    number of rows, so merged results line up with a single-process build.
+    """
+    entities = matrix.rows['entity'].astype(str).to_numpy()
+    _, codes, counts = np.unique(entities, return_inverse=True, return_counts=True)
+    # Each entity goes to the shard its first row falls in when rows are dealt out evenly
+    first_row = np.cumsum(counts) - counts
+    shard = (first_row * shards) // max(counts.sum(), 1)
+    by_row = shard[codes]
+    return [np.flatnonzero(by_row == k) for k in np.unique(shard)]
+
+
+class SharedValues:
+    """The ledger values as a block other processes can open without pickling it.
+
+    A memory-mapped matrix is shared through its file; an in-memory one is
+    copied once into shared memory, released by close().
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.shape = values.shape
+        self.dtype = np.dtype(values.dtype).str
+        self._shm = None
+        if isinstance(values, np.memmap) and values.filename:
+            self.path, self.offset, self.name = values.filename, values.offset, None
+        else:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(self.shape, self.dtype, buffer=self._shm.buf)[:] = values
+            self.path, self.offset, self.name = None, 0, self._shm.name
+
+    def __getstate__(self):
+        return {**self.__dict__, '_shm': None}
+
+    def rows(self, positions: np.ndarray) -> np.ndarray:
+        """A private copy of some rows, read from the shared block."""
+        if self.path is not None:
+            values = np.memmap(self.path, self.dtype, 'r', offset=self.offset, shape=self.shape)
+            return np.array(values[positions])
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return np.array(np.ndarray(self.shape, self.dtype, buffer=shm.buf)[positions])
+        finally:
+            shm.close()
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def shard_partials(values: SharedValues, positions: np.ndarray, rows: pd.DataFrame, months: pd.PeriodIndex,
+                   scenario_months: Dict[str, pd.PeriodIndex], rates: FxRates) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Per-entity USD P&L (with the shard's own total rows) and month-end USD cash of one shard.
+
+    Runs in a worker process; only the shard's labels and positions were
+    sent, the values come from the shared block.
+    """
+    matrix = LedgerMatrix(rows, months, values.rows(positions), scenario_months)
+    usd = matrix.values * rates.matrix(rows['currency'], months)
+    cash = np.nansum(usd[matrix.mask('actual', ['Cash'])], axis=0)
+    return PnLSummary.from_matrix(matrix, usd).frame, cash
+
+
+def merge_pnl(frames: List[pd.DataFrame], scenarios: List[str]) -> PnLSummary:
+    """One PnLSummary from per-shard summaries of disjoint entity groups.
+
+    Entity rows are concatenated in shard order, shard totals summed and
+    the derived lines recomputed from the merged base lines.
+    """
+    base = sorted({c for f in frames for c in f.columns if c not in DERIVED_LINES},
+                  key=lambda c: (c != 'revenue', c != 'cogs', c))
+    frames = [f[[c for c in f.columns if c in base]].reindex(columns=base, fill_value=0.0) for f in frames]
+    parts = []
+    for scenario in scenarios:
+        shards = [f.xs(scenario, level='scenario', drop_level=False) for f in frames]
+        totals = [s[s.index.get_level_values('entity') == TOTAL_ENTITY] for s in shards]
+        parts.extend(s[s.index.get_level_values('entity') != TOTAL_ENTITY] for s in shards)
+        parts.append(functools.reduce(lambda a, b: a + b, totals))
+    frame = pd.concat(parts).astype(float)
+    lines = derive_lines({c: frame[c].to_numpy() for c in base})
+    for column in DERIVED_LINES:
+        frame[column] = lines[column]
+    return PnLSummary(frame)
+
+
+class EntityPool:
+    """Process pool that aggregates the ledger one entity shard per task.
+
+    The ledger values never travel through pickle: workers read their rows
+    from the memory-mapped matrix file or a shared-memory copy. What comes
+    back are the partial aggregates, small next to the ledger.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Not fork: the parent runs session threads that may hold locks
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+                weakref.finalize(self, self._executor.shutdown)
+            return self._executor
+
+    def aggregate(self, matrix: LedgerMatrix, rates: FxRates) -> Optional[Tuple[PnLSummary, np.ndarray]]:
+        """(P&L summary, month-end USD cash per month) over every entity, or None for an empty ledger."""
+        shards = shard_rows(matrix, self.workers)
+        if not shards or not matrix.scenario_months:
+            return None
+        values = SharedValues(matrix.values)
+        try:
+            futures = [
+                self._pool().submit(shard_partials, values, positions, matrix.rows.iloc[positions].reset_index(drop=True),
+                                    matrix.months, matrix.scenario_months, rates)
+                for positions in shards
+            ]
+            frames, cash = zip(*(future.result() for future in futures))
+        finally:
+            values.close()
+        return merge_pnl(list(frames), list(matrix.scenario_months)), np.sum(cash, axis=0)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
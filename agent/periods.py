@@ -0,0 +1,91 @@
+"""Monthly time axis and fiscal calendar for CFO Copilot."""
+
+import pandas as pd
+
+from typing import Iterable, List, Optional
+
+from .cube import month_label, to_period
+
+
+class FiscalCalendar:
+    """Ordered monthly axis with O(1) month lookups and fiscal ranges.
+
+    Covers any number of years. ``fiscal_year_start`` is the calendar month
+    (1-12) the fiscal year begins in; a fiscal year is named after the
+    calendar year it ends in, so with a July start Jul 2024 - Jun 2025 is
+    FY2025. Range helpers return slices of the axis.
+    """
+
+    def __init__(self, periods: Iterable, fiscal_year_start: int = 1):
+        if not 1 <= fiscal_year_start <= 12:
+            raise ValueError(f"fiscal_year_start must be 1-12, got {fiscal_year_start}")
+        self.periods = pd.PeriodIndex(sorted({to_period(p) for p in periods}), freq='M')
+        self.fiscal_year_start = fiscal_year_start
+        self._positions = {period: i for i, period in enumerate(self.periods)}
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def __contains__(self, month) -> bool:
+        return to_period(month) in self._positions
+
+    @property
+    def labels(self) -> List[str]:
+        """Month labels ('Jun 2025') in calendar order."""
+        return [month_label(p) for p in self.periods]
+
+    @property
+    def latest(self) -> Optional[pd.Period]:
+        """Most recent month on the axis."""
+        return self.periods[-1] if len(self.periods) else None
+
+    def position(self, month) -> int:
+        """Index of a month on the axis; KeyError if it is not there."""
+        period = to_period(month)
+        if period not in self._positions:
+            raise KeyError(month)
+        return self._positions[period]
+
+    def fiscal_year(self, month) -> int:
+        """Fiscal year a month belongs to."""
+        period = to_period(month)
+        return period.year + (1 if self.fiscal_year_start > 1 and period.month >= self.fiscal_year_start else 0)
+
+    def fiscal_year_start_period(self, month) -> pd.Period:
+        """First month of the fiscal year containing month."""
+        period = to_period(month)
+        offset = (period.month - self.fiscal_year_start) % 12
+        return period - offset
+
+    def fiscal_quarter_start_period(self, month) -> pd.Period:
+        """First month of the fiscal quarter containing month."""
+        period = to_period(month)
+        offset = (period.month - self.fiscal_year_start) % 3
+        return period - offset
+
+    def range(self, start, end) -> pd.PeriodIndex:
+        """Months on the axis from start to end inclusive."""
+        lo = self.periods.searchsorted(to_period(start), side='left')
+        hi = self.periods.searchsorted(to_period(end), side='right')
+        return self.periods[lo:hi]
+
+    def last_n(self, n: int, end=None) -> pd.PeriodIndex:
+        """The n calendar months ending at end (default: latest), as present."""
+        end = to_period(end) if end is not None else self.latest
+        if end is None or n <= 0:
+            return self.periods[:0]
+        return self.range(end - (n - 1), end)
+
+    def ytd(self, end=None) -> pd.PeriodIndex:
+        """Fiscal year to date up to end (default: latest)."""
+        end = to_period(end) if end is not None else self.latest
+        if end is None:
+            return self.periods[:0]
+        return self.range(self.fiscal_year_start_period(end), end)
+
+    def qtd(self, end=None) -> pd.PeriodIndex:
+        """Fiscal quarter to date up to end (default: latest)."""
+        end = to_period(end) if end is not None else self.latest
+        if end is None:
+            return self.periods[:0]
+        return self.range(self.fiscal_quarter_start_period(end), end)
@@ -4,27 +4,102 @@ import re
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from .anomalies import LOOKBACK, Z_THRESHOLD
+from .concurrency import Lazy
+from .cube import month_label, to_period
+from .periods import FiscalCalendar
+from .scenarios import driver_label
+from .tools import get_analyzer
+from .variance import BRIDGE_LINES
+
 
 class QueryPlanner:
     """Interprets user queries and creates execution plans."""
     
-    def __init__(self):
-        self.month_patterns = {
-            'january': 'Jan 2025', 'jan': 'Jan 2025',
-            'february': 'Feb 2025', 'feb': 'Feb 2025',
-            'march': 'Mar 2025', 'mar': 'Mar 2025',
-            'april': 'Apr 2025', 'apr': 'Apr 2025',
-            'may': 'May 2025',
-            'june': 'Jun 2025', 'jun': 'Jun 2025',
-            'july': 'Jul 2025', 'jul': 'Jul 2025',
-            'august': 'Aug 2025', 'aug': 'Aug 2025',
-            'september': 'Sep 2025', 'sep': 'Sep 2025',
-            'october': 'Oct 2025', 'oct': 'Oct 2025',
-            'november': 'Nov 2025', 'nov': 'Nov 2025',
-            'december': 'Dec 2025', 'dec': 'Dec 2025'
+    # "This month" when there is neither a default_month nor a loader: the sample data's latest
+    SAMPLE_MONTH = 'Jun 2025'
+    
+    def __init__(self, default_month: Optional[str] = None, loader=None):
+        # "This month", "last N months" and bare month names are read against
+        # default_month, or else the latest month with actuals in the loader's
+        # calendar, so the planner moves forward with the data
+        self.loader = loader
+        self._default_month = to_period(default_month) if default_month else None
+        # Month names map to calendar month numbers; the year comes from the
+        # query ("June 2024", "jun '24", "jun/24") or from default_month; a
+        # bare two-digit number is a day or an amount, not a year
+        self.month_names = {
+            'january': 1, 'jan': 1,
+            'february': 2, 'feb': 2,
+            'march': 3, 'mar': 3,
+            'april': 4, 'apr': 4,
+            'may': 5,
+            'june': 6, 'jun': 6,
+            'july': 7, 'jul': 7,
+            'august': 8, 'aug': 8,
+            'september': 9, 'sept': 9, 'sep': 9,
+            'october': 10, 'oct': 10,
+            'november': 11, 'nov': 11,
+            'december': 12, 'dec': 12
         }
+        self.month_regex = re.compile(
+            r"\b(" + "|".join(sorted(self.month_names, key=len, reverse=True)) + r")\b(?:\s*(\d{4})\b|\s*['/](\d{2})\b)?"
+        )
         
         self.intent_patterns = {
+            'anomalies': [
+                r'unusual',
+                r'anomal',
+                r'outlier',
+                r'spikes?\b',
+                r'anything\s+(?:odd|weird|strange|off)',
+                r'sign\s+flip',
+                r'missing\s+(?:months?|data|entries)'
+            ],
+            'sensitivity': [
+                r'sensitivit',
+                r'heat\s*map',
+                r'grid'
+            ],
+            'scenario': [
+                r'what\s+if',
+                r'scenario'
+            ],
+            'window_metrics': [
+                r'\bttm\b',
+                r'\bltm\b',
+                r'trailing\s+(?:twelve|12)',
+                r'rolling',
+                r'\bytd\b',
+                r'year.to.date',
+                r'\bqtd\b',
+                r'quarter.to.date'
+            ],
+            'variance_bridge': [
+                r'variance\s+(?:bridge|decomposition|drivers?|waterfall)',
+                r'\bbridge\b',
+                r'waterfall',
+                r'fx\s+(?:effect|impact)',
+                r'(?:price|volume|mix)\s+(?:effect|variance)',
+                r'why\s+did\s+we\s+(?:miss|beat)',
+                r'miss(?:ed)?\s+(?:the\s+)?budget'
+            ],
+            'comparison': [
+                r'(?:vs\.?|versus|against|compared? (?:to|with))\s+(?:the\s+)?(?:prior|previous|last)\s+(?:month|year)',
+                r'month.over.month',
+                r'year.over.year',
+                r'\bmom\b',
+                r'\byoy\b',
+                r'period.over.period',
+                r'flash\s+report'
+            ],
+            'forecast': [
+                r'^(?!.*(?:runway|cash)).*(?:forecast|projected|projection|outlook)',
+                r'next\s+(?:\d+\s+)?(?:months?|quarters?|year)'
+            ],
             'revenue_vs_budget': [
                 r'revenue.*vs.*budget',
                 r'revenue.*budget',
@@ -55,35 +130,124 @@ class QueryPlanner:
                 r'how.*long.*cash'
             ]
         }
+        self.forecast_lines = ('revenue', 'cogs', 'opex', 'gross_profit', 'ebitda')
+        self.metric_names = {
+            'revenue': 'Revenue', 'cogs': 'COGS', 'opex': 'OPEX', 'gross_profit': 'Gross Profit',
+            'ebitda': 'EBITDA', 'gross_margin_pct': 'Gross Margin', 'ebitda_margin': 'EBITDA Margin'
+        }
+        # What-if shocks: "<currency or P&L line> <verb> <n>%", monthly growth if MoM
+        self.driver_lines = {
+            'revenue': 'revenue', 'sales': 'revenue',
+            'cogs': 'cogs', 'cost of goods sold': 'cogs',
+            'opex': 'opex', 'operating expenses': 'opex'
+        }
+        self.falling_verbs = ('drop', 'fall', 'decline', 'weaken', 'decrease', 'shrink', 'cut', 'is cut')
+        currencies = r'usd|eur|gbp|jpy|chf|cad|aud|nzd|cny|inr|sek|nok|dkk|sgd|hkd|mxn|brl'
+        self.currency_regex = re.compile(r'\b(' + currencies + r')\b')
+        self.driver_regex = re.compile(
+            r"\b(" + "|".join(sorted(self.driver_lines, key=len, reverse=True)) + "|" + currencies + r")\s+"
+            r"(drops?|falls?|declines?|weakens?|decreases?|shrinks?|is cut|cut|rises?|grows?|gains?|"
+            r"increases?|strengthens?)\s+(?:by\s+)?(\d+(?:\.\d+)?)\s*%"
+            r"(\s*(?:mom|m/m|month over month|a month|per month|monthly))?"
+        )
+        # Cash runway questions that ask for a range rather than a point estimate
+        self.simulation_regex = re.compile(
+            r'simulat|monte\s*carlo|probabilit|percentile|\bp(?:10|50|90)\b|confidence|worst.case|best.case'
+        )
+    
+    def extract_drivers(self, query: str) -> Dict[str, float]:
+        """Scenario drivers from phrases like "EUR drops 10%" or "revenue grows 3% MoM"."""
+        drivers = {}
+        for subject, verb, amount, monthly in self.driver_regex.findall(query.lower()):
+            change = float(amount) / 100 * (-1 if verb.startswith(self.falling_verbs) else 1)
+            if subject in self.driver_lines:
+                prefix = 'growth' if monthly else 'change'
+                key = f"{prefix}:{self.driver_lines[subject]}"
+            else:
+                key = f"fx:{subject.upper()}"
+            drivers[key] = drivers.get(key, 0.0) + change
+        return drivers
+    
+    def calendar(self) -> FiscalCalendar:
+        """The months with actuals from the loader, or a stand-in ending at default_month without one."""
+        if self.loader is not None:
+            calendar = self.loader.load_calendar('actual')
+            if calendar.latest is not None:
+                return calendar
+        # Without data every month is on the axis; ten years covers any "last N months"
+        end = self._default_month or to_period(self.SAMPLE_MONTH)
+        return FiscalCalendar(pd.period_range(end=end, periods=120, freq='M'))
+    
+    @property
+    def default_month(self) -> pd.Period:
+        """The month "this month" refers to."""
+        return self._default_month or self.calendar().latest
+    
+    def extract_grid(self, query: str) -> Dict[str, str]:
+        """Axes and metric of a sensitivity grid: margin by growth x COGS ratio, else runway by FX rate x burn."""
+        query_lower = query.lower()
+        if re.search(r'margin|growth|cogs', query_lower) and not re.search(r'runway|burn', query_lower):
+            return {'x': 'growth:revenue', 'y': 'cogs_ratio', 'metric': 'ebitda_margin'}
+        currency = self.currency_regex.search(query_lower)
+        currency = currency.group(1).upper() if currency and currency.group(1) != 'usd' else 'EUR'
+        return {'x': f'rate:{currency}', 'y': 'burn', 'metric': 'runway_months'}
+    
+    def extract_window(self, query: str):
+        """Window of a TTM/rolling/YTD query: 'ttm', 'ytd', 'qtd' or a number of months."""
+        query_lower = query.lower()
+        if re.search(r'\bytd\b|year.to.date', query_lower):
+            return 'ytd'
+        if re.search(r'\bqtd\b|quarter.to.date', query_lower):
+            return 'qtd'
+        rolling = re.search(r'rolling\s+(\d+)', query_lower)
+        if rolling:
+            return int(rolling.group(1))
+        if 'rolling' in query_lower and not re.search(r'\bttm\b|\bltm\b|trailing', query_lower):
+            return 3
+        return 'ttm'
+    
+    def extract_metric(self, query: str) -> str:
+        """P&L metric a query is about, revenue by default."""
+        query_lower = query.lower()
+        if 'ebitda margin' in query_lower:
+            return 'ebitda_margin'
+        if 'margin' in query_lower:
+            return 'gross_margin_pct'
+        for metric in ('ebitda', 'opex', 'cogs', 'gross_profit'):
+            if metric.replace('_', ' ') in query_lower:
+                return metric
+        return 'revenue'
     
     def extract_month(self, query: str) -> Optional[str]:
         """Extract month from query."""
-        query_lower = query.lower()
-        
-        for pattern, month in self.month_patterns.items():
-            if pattern in query_lower:
-                return month
+        match = self.month_regex.search(query.lower())
+        if match:
+            year, short_year = match.group(2), match.group(3)
+            if short_year is not None:
+                year = 2000 + int(short_year)
+            elif year is None:
+                year = self.default_month.year
+            return month_label(pd.Period(year=int(year), month=self.month_names[match.group(1)], freq='M'))
         
         # Default to current month if not specified
-        return 'Jun 2025'  # Using June as default for demo
+        return month_label(self.default_month)
     
     def extract_months_range(self, query: str) -> List[str]:
         """Extract range of months from query."""
         query_lower = query.lower()
+        calendar = self.calendar()
+        end = self.default_month
         
         # Look for "last X months" pattern
         last_months_match = re.search(r'last\s+(\d+)\s+months?', query_lower)
         if last_months_match:
             num_months = int(last_months_match.group(1))
-            # Return last N months ending at June 2025
-            all_months = [
-                'Jan 2025', 'Feb 2025', 'Mar 2025', 'Apr 2025',
-                'May 2025', 'Jun 2025', 'Jul 2025', 'Aug 2025',
-                'Sep 2025', 'Oct 2025', 'Nov 2025', 'Dec 2025'
-            ]
-            june_index = all_months.index('Jun 2025')
-            start_index = max(0, june_index - num_months + 1)
-            return all_months[start_index:june_index + 1]
+            # The last N months ending at the default month, across years
+            return [month_label(p) for p in calendar.last_n(max(num_months, 1), end)]
+        
+        # Fiscal year to date
+        if re.search(r'\bytd\b|year.to.date', query_lower):
+            return [month_label(p) for p in calendar.ytd(end)]
         
         # Look for specific month mentioned
         month = self.extract_month(query)
@@ -91,7 +255,7 @@ class QueryPlanner:
             return [month]
         
         # Default to last 3 months
-        return ['Apr 2025', 'May 2025', 'Jun 2025']
+        return [month_label(p) for p in calendar.last_n(3, end)]
     
     def classify_intent(self, query: str) -> str:
         """Classify the intent of the user query."""
@@ -121,7 +285,91 @@ class QueryPlanner:
         }
         
         # Define function calls based on intent
-        if intent == 'revenue_vs_budget':
+        if intent == 'anomalies':
+            plan['function_calls'] = [
+                {
+                    'function': 'find_anomalies',
+                    'params': {'month': month, 'limit': 10}
+                }
+            ]
+            plan['chart_type'] = 'anomalies'
+            
+        elif intent == 'sensitivity':
+            plan['function_calls'] = [
+                {
+                    'function': 'get_sensitivity_grid',
+                    'params': {**self.extract_grid(query), 'points': 50}
+                }
+            ]
+            plan['chart_type'] = 'heatmap'
+            
+        elif intent == 'scenario':
+            # The baseline and the scenario, evaluated together
+            plan['function_calls'] = [
+                {
+                    'function': 'run_scenarios',
+                    'params': {'drivers': [{}, self.extract_drivers(query)]}
+                }
+            ]
+            plan['chart_type'] = 'scenario'
+            
+        elif intent == 'window_metrics':
+            window = self.extract_window(query)
+            plan['window'] = window
+            plan['metric'] = self.extract_metric(query)
+            if isinstance(window, int):
+                # Rolling windows as a series, over the last 6 months unless asked otherwise
+                months = months_range if len(months_range) > 1 else [
+                    month_label(p) for p in self.calendar().last_n(6, month)
+                ]
+                plan['function_calls'] = [
+                    {
+                        'function': 'get_rolling_metrics',
+                        'params': {'months': months, 'window': window}
+                    }
+                ]
+                plan['chart_type'] = 'line'
+            else:
+                plan['function_calls'] = [
+                    {
+                        'function': 'calculate_window_metrics',
+                        'params': {'month': month, 'window': window}
+                    }
+                ]
+                plan['chart_type'] = 'metric'
+            
+        elif intent == 'variance_bridge':
+            line = self.extract_metric(query).replace('_margin', '')
+            plan['function_calls'] = [
+                {
+                    'function': 'get_variance_bridge',
+                    'params': {'month': month, 'line': line if line in BRIDGE_LINES else 'revenue'}
+                }
+            ]
+            plan['chart_type'] = 'waterfall'
+            
+        elif intent == 'comparison':
+            plan['function_calls'] = [
+                {
+                    'function': 'compare_periods',
+                    'params': {'months': [month], 'lines': ['revenue', 'cogs', 'gross_profit', 'opex', 'ebitda']}
+                }
+            ]
+            plan['chart_type'] = 'bar'
+            
+        elif intent == 'forecast':
+            metric = self.extract_metric(query)
+            plan['metric'] = metric if metric in self.forecast_lines else 'ebitda' if metric == 'ebitda_margin' else 'revenue'
+            horizon = re.search(r'next\s+(\d+)\s+months?', query.lower())
+            plan['function_calls'] = [
+                {
+                    'function': 'forecast_pnl',
+                    'params': {'lines': [plan['metric']], 'horizon': int(horizon.group(1)) if horizon else 12}
+                }
+            ]
+            plan['chart_type'] = 'forecast'
+            
+        elif intent == 'revenue_vs_budget':
             plan['function_calls'] = [
                 {
                     'function': 'get_revenue_vs_budget',
@@ -162,8 +410,18 @@ class QueryPlanner:
                 {
                     'function': 'calculate_cash_runway',
                     'params': {}
+                },
+                # The forecast balance path, for the chart and a trend-based runway
+                {
+                    'function': 'forecast_cash_runway',
+                    'params': {}
                 }
             ]
+            if self.simulation_regex.search(query.lower()):
+                plan['function_calls'].append({
+                    'function': 'simulate_cash_runway',
+                    'params': {'paths': 10000}
+                })
             plan['chart_type'] = 'runway'
         
         return plan
@@ -176,12 +434,14 @@ class QueryPlanner:
             result = results[0]
             response = f"""**Revenue Performance - {result['month']}**
 
-• **Actual Revenue**: ${result['actual']:,.0f}
+• **{'Forecast' if result.get('forecast') else 'Actual'} Revenue**: ${result['actual']:,.0f}
 • **Budgeted Revenue**: ${result['budget']:,.0f}  
 • **Variance**: ${result['variance']:+,.0f} ({result['variance_pct']:+.1f}%)
 
 {'🟢 **Above budget**' if result['variance'] > 0 else '🔴 **Below budget**' if result['variance'] < 0 else '🟡 **On budget**'}
 """
+            if result.get('forecast'):
+                response += f"\n📈 *Forecast - no actuals yet; 80% range ${result['lower']:,.0f} to ${result['upper']:,.0f}*\n"
             
         elif intent == 'gross_margin_trend' and results:
             # Handle both single list and list of results
@@ -234,6 +494,8 @@ class QueryPlanner:
 
 {'🟢 **Strong profitability**' if result['ebitda_margin'] > 20 else '🟡 **Moderate profitability**' if result['ebitda_margin'] > 10 else '🔴 **Low profitability**'}
 """
+            if result.get('forecast'):
+                response += f"\n📈 *Forecast - no actuals yet; 80% range ${result['ebitda_lower']:,.0f} to ${result['ebitda_upper']:,.0f}*\n"
             
         elif intent == 'cash_runway' and results:
             result = results[0]
@@ -247,18 +509,183 @@ class QueryPlanner:
 
 {'🟢 **Healthy cash position**' if result['runway_months'] > 12 else '🟡 **Moderate runway**' if result['runway_months'] > 6 else '🔴 **Low runway - action needed**'}
 """
+            forecast = next((r for r in results[1:] if 'model' in r), None)
+            simulation = next((r for r in results[1:] if 'paths' in r), None)
+            if forecast:
+                def months(value):
+                    return f"{value:.1f}" if value != float('inf') else "∞"
+                
+                band = "" if forecast['runway_low'] == forecast['runway_high'] else \
+                    f" ({forecast['level']}% range {months(forecast['runway_low'])} to {months(forecast['runway_high'])})"
+                response += f"""
+• **Forecast Runway** ({forecast['model'].replace('_', ' ')}): {months(forecast['runway_months'])} months{band}
+"""
+            if simulation:
+                band = " / ".join(
+                    f"{simulation[key]:.1f}" if simulation[key] != float('inf') else "∞"
+                    for key in ('runway_p10', 'runway_p50', 'runway_p90')
+                )
+                response += f"""
+**Simulated Runway** ({simulation['paths']:,} paths)
+
+• **P10 / P50 / P90**: {band} months
+• **Probability of running out within {simulation['horizon_months']} months**: {simulation['prob_out_of_cash'] * 100:.1f}%
+"""
+        elif intent == 'sensitivity' and results:
+            grid = results[0]
+            values = grid.to_numpy()
+            worst = np.unravel_index(np.argmin(values), values.shape)
+            
+            def value(v):
+                return "∞" if v == float('inf') else f"{v:,.0f}" if abs(v) >= 1000 else f"{v:,.3g}"
+            
+            x_label, y_label = driver_label(grid.columns.name), driver_label(grid.index.name)
+            response = f"""**Sensitivity: {driver_label(plan['function_calls'][0]['params']['metric'])}**
+
+• **Grid**: {x_label} × {y_label} ({values.shape[1]} × {values.shape[0]} scenarios)
+• **Range**: {value(values.min())} to {value(values.max())}
+• **Worst case**: {value(values[worst])} at {x_label} {value(grid.columns[worst[1]])}, {y_label} {value(grid.index[worst[0]])}
+"""
+            
+        elif intent == 'anomalies' and results:
+            table = results[0]
+            labels = {'jump': 'jump', 'missing': 'missing month', 'sign_flip': 'sign flip'}
+            rows = "\n".join(
+                f"• **{row['entity']} {row['account']}** ({row['month']}, {labels[row['type']]}): "
+                + (f"${row['value']:,.0f} vs ${row['expected']:,.0f} expected"
+                   + (f", z = {row['z']:+.1f}" if row['type'] == 'jump' else "")
+                   if row['type'] != 'missing' else f"no entry, ${row['expected']:,.0f} last month")
+                for _, row in table.iterrows()
+            )
+            response = f"""**Anomalies - {plan['month']}**
+
+{rows}
+
+🔎 *Ranked by USD impact; jumps are {Z_THRESHOLD:.0f}+ standard deviations from the trailing {LOOKBACK} months*
+""" if len(table) else f"Nothing unusual in {plan['month']}: no jumps, missing months or sign flips."
+            
+        elif intent == 'variance_bridge' and results:
+            result = results[0]
+            
+            def amount(value, signed=True):
+                if np.isnan(value):
+                    return "n/a"
+                return f"${value:+,.0f}" if signed else f"${value:,.0f}"
+            
+            drivers = "\n".join(
+                f"• **{row['entity']} {row['account']}**: {amount(row['variance'])} "
+                f"(FX {amount(row['fx'])}, volume {amount(row['volume'])}, mix {amount(row['mix'])})"
+                for _, row in result['drivers'].head(3).iterrows()
+            )
+            percent = f" ({result['variance_pct']:+.1f}%)" if not np.isnan(result['variance_pct']) else ""
+            response = f"""**{self.metric_names[result['line']]} Variance Bridge - {result['month']}**
+
+• **Budget**: {amount(result['budget'], signed=False)}
+• **FX Effect**: {amount(result['fx'])}
+• **Volume Effect**: {amount(result['volume'])}
+• **Mix Effect**: {amount(result['mix'])}
+• **Actual**: ${result['actual']:,.0f}
+• **Variance**: {amount(result['variance'])}{percent}
+
+**Largest Drivers**
+
+{drivers}
+"""
+            
+        elif intent == 'forecast' and results:
+            table = results[0]
+            rows = "\n".join(
+                f"• **{row['month']}**: ${row['forecast']:,.0f} (${row['lower']:,.0f} to ${row['upper']:,.0f})"
+                for _, row in table.iterrows()
+            )
+            models = ", ".join(sorted({
+                'built from the line forecasts' if m == 'derived' else m.replace('_', ' ') for m in table['model']
+            }))
+            response = f"""**{self.metric_names[plan['metric']]} Forecast - {table['month'].iloc[0]} to {table['month'].iloc[-1]}**
+
+{rows}
+
+📈 *{models}; 80% prediction intervals*
+""" if len(table) else "No history to forecast from."
+            
+        elif intent == 'comparison' and results:
+            table = results[0]
+            
+            def change(row, name):
+                if np.isnan(row[f'vs_{name}']):
+                    return "n/a"
+                percent = f" ({row[f'vs_{name}_pct']:+.1f}%)" if not np.isnan(row[f'vs_{name}_pct']) else ""
+                return f"${row[f'vs_{name}']:+,.0f}{percent}"
+            
+            rows = "\n".join(
+                f"| {self.metric_names.get(row['line'], row['line'])} | ${row['actual']:,.0f} | "
+                f"{change(row, 'budget')} | {change(row, 'prior_month')} | {change(row, 'prior_year')} |"
+                for _, row in table.iterrows()
+            )
+            response = f"""**Flash Report - {plan['month']}**
+
+| Metric | Actual | vs Budget | vs Prior Month | vs Prior Year |
+|---|---:|---:|---:|---:|
+{rows}
+""" if len(table) else f"No actuals to compare for {plan['month']}."
+            
+        elif intent == 'window_metrics' and results:
+            metric = plan['metric']
+            
+            def value(row, line):
+                return f"{row[line]:.1f}%" if line.endswith(('_pct', '_margin')) else f"${row[line]:,.0f}"
+            
+            if isinstance(plan['window'], int):
+                table = results[0]
+                series = "\n".join(
+                    f"• **{month}** ({row['start']} - {month}): {value(row, metric)}"
+                    for month, row in table.iterrows() if row['months_covered'] > 0
+                )
+                response = f"""**Rolling {plan['window']}-Month {self.metric_names[metric]}**
+
+{series}
+"""
+            else:
+                result = results[0]
+                span = f"{result['start']} - {result['month']}"
+                lines = [metric] + [l for l in ('revenue', 'gross_margin_pct', 'ebitda', 'ebitda_margin') if l != metric]
+                breakdown = "\n".join(f"• **{self.metric_names[l]}**: {value(result, l)}" for l in lines)
+                response = f"""**{plan['window'].upper()} {self.metric_names[metric]} ({span})**
+
+{breakdown}
+"""
+                window_months = (to_period(result['month']) - to_period(result['start'])).n + 1
+                if result['months_covered'] < window_months:
+                    response += f"\n🟡 **Partial window** - data for {result['months_covered']} of {window_months} months\n"
+            
+        elif intent == 'scenario' and results:
+            drivers = plan['function_calls'][0]['params']['drivers'][1]
+            if not drivers:
+                return ("I couldn't find any shocks in that scenario. Try phrasing them like "
+                        "\"EUR drops 10%\", \"revenue grows 3% MoM\" or \"opex increases 5%\".")
+            baseline, scenario = results[0].iloc[0], results[0].iloc[1]
+            shocks = ", ".join(f"{name} {value * 100:+.1f}%" for name, value in drivers.items())
+            
+            def runway(value):
+                return f"{value:.1f} months" if value != float('inf') else "∞ (positive cash flow)"
+            
+            response = f"""**Scenario Analysis** ({shocks})
+
+• **EBITDA**: ${scenario['ebitda']:,.0f} vs ${baseline['ebitda']:,.0f} baseline ({scenario['ebitda'] - baseline['ebitda']:+,.0f})
+• **EBITDA Margin**: {scenario['ebitda_margin']:.1f}% vs {baseline['ebitda_margin']:.1f}%
+• **Monthly Burn**: ${scenario['monthly_burn_usd']:,.0f} vs ${baseline['monthly_burn_usd']:,.0f}
+• **Cash Runway**: {runway(scenario['runway_months'])} vs {runway(baseline['runway_months'])}
+"""
+            
         else:
             response = "I couldn't analyze that request. Please try asking about revenue, margins, expenses, or cash runway."
         
         return response
 
 
-# Global planner instance
-_planner = None
+# Global planner instance, created once across threads and reading the shared analyzer's data
+_planner = Lazy(lambda: QueryPlanner(loader=get_analyzer().loader))
 
 def get_planner() -> QueryPlanner:
     """Get the global query planner instance."""
-    global _planner
-    if _planner is None:
-        _planner = QueryPlanner()
-    return _planner
+    return _planner.get()
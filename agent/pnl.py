@@ -0,0 +1,120 @@
+"""Materialized profit and loss summary for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, List, Optional
+
+from .cube import LedgerMatrix, to_period
+
+
+OPEX_PREFIX = 'Opex:'
+PNL_LINES = ['revenue', 'cogs', 'opex', 'gross_profit', 'ebitda']
+DERIVED_LINES = ['opex', 'gross_profit', 'ebitda']
+TOTAL_ENTITY = 'Total'
+
+
+def classify_account(account: str) -> Optional[str]:
+    """P&L column an account rolls up to, or None if it is not a P&L account.
+
+    OPEX accounts roll up to their top-level category, so 'Opex:Sales:Travel'
+    lands in 'opex:Sales'.
+    """
+    if account == 'Revenue':
+        return 'revenue'
+    if account == 'COGS':
+        return 'cogs'
+    if account.startswith(OPEX_PREFIX):
+        return 'opex:' + account[len(OPEX_PREFIX):].split(':')[0]
+    return None
+
+
+def derive_lines(lines: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Add the derived lines to base lines (revenue, cogs, opex:*), in place.
+
+    The one definition of opex, gross profit and EBITDA shared by every
+    P&L view; the arrays may have any (matching) shape.
+    """
+    opex_columns = [c for c in lines if c.startswith('opex:')]
+    lines['opex'] = sum((lines[c] for c in opex_columns), np.zeros(np.shape(lines['revenue'])))
+    lines['gross_profit'] = lines['revenue'] - lines['cogs']
+    lines['ebitda'] = lines['gross_profit'] - lines['opex']
+    return lines
+
+
+class PnLSummary:
+    """USD P&L with one row per (scenario, entity, month).
+
+    Columns are revenue, cogs, one ``opex:<category>`` column per OPEX
+    category, then opex, gross_profit and ebitda. Rows for the
+    ``TOTAL_ENTITY`` entity hold the sum over all entities, so a month's
+    KPIs are a single dictionary lookup. Only months a scenario actually
+    covers have rows.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.columns = list(frame.columns)
+        self.values = frame.to_numpy(dtype=float)
+        self.categories = [c[len('opex:'):] for c in self.columns if c.startswith('opex:')]
+        self._positions = {key: i for i, key in enumerate(frame.index)}
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, usd_values: np.ndarray) -> 'PnLSummary':
+        """Roll a USD ledger matrix up to P&L lines per entity and month."""
+        rows = matrix.rows
+        lines = rows['account'].astype(str).map(classify_account)
+        keep = lines.notna().to_numpy()
+        opex_columns = sorted({c for c in lines.dropna() if c.startswith('opex:')})
+        columns = ['revenue', 'cogs'] + opex_columns
+
+        entities = sorted(str(e) for e in rows['entity'].unique())
+        parts = []
+        for scenario, months in matrix.scenario_months.items():
+            selected = keep & (rows['scenario'] == scenario).to_numpy()
+            full = pd.MultiIndex.from_product([entities, months], names=['entity', 'month'])
+            if selected.any():
+                block = pd.DataFrame(usd_values[selected][:, matrix.months.get_indexer(months)], columns=months)
+                keys = [rows['entity'][selected].astype(str).to_numpy(), lines[selected].to_numpy()]
+                # (entity, line) x month sums, NaN skipped, turned into (entity, month) x line
+                by_entity = block.groupby(keys).sum().T.unstack().unstack(1)
+                by_entity.index.names = ['entity', 'month']
+            else:
+                by_entity = pd.DataFrame(index=full[:0], columns=columns)
+
+            # Every entity gets a row for every month, zero where it has no data
+            by_entity = by_entity.reindex(index=full, columns=columns, fill_value=0.0).fillna(0.0)
+            total = by_entity.groupby(level='month', sort=False).sum()
+            total.index = pd.MultiIndex.from_product([[TOTAL_ENTITY], total.index], names=['entity', 'month'])
+            parts.append(pd.concat({scenario: pd.concat([by_entity, total])}, names=['scenario']))
+
+        if parts:
+            frame = pd.concat(parts)
+        else:
+            frame = pd.DataFrame(columns=columns, index=pd.MultiIndex.from_tuples([], names=['scenario', 'entity', 'month']))
+        frame = frame.astype(float)
+        lines = derive_lines({c: frame[c].to_numpy() for c in columns})
+        for column in DERIVED_LINES:
+            frame[column] = lines[column]
+        return cls(frame)
+
+    def row(self, month, scenario: str = 'actual', entity: Optional[str] = None) -> Dict[str, float]:
+        """P&L for one month; KeyError if the scenario has no such month."""
+        key = (scenario, entity or TOTAL_ENTITY, to_period(month))
+        if key not in self._positions:
+            raise KeyError(month)
+        return dict(zip(self.columns, self.values[self._positions[key]].tolist()))
+
+    def rows(self, months: Iterable, scenario: str = 'actual', entity: Optional[str] = None) -> pd.DataFrame:
+        """P&L for several months indexed by month; NaN rows where a month is missing."""
+        months = list(months)
+        entity = entity or TOTAL_ENTITY
+        positions = np.array([self._positions.get((scenario, entity, to_period(m)), -1) for m in months], dtype=np.intp)
+        values = np.full((len(months), len(self.columns)), np.nan)
+        found = positions >= 0
+        values[found] = self.values[positions[found]]
+        return pd.DataFrame(values, columns=self.columns, index=pd.Index(months, name='month'))
+
+    def entities(self) -> List[str]:
+        """Entities with P&L rows, excluding the total."""
+        return sorted({key[1] for key in self._positions if key[1] != TOTAL_ENTITY})
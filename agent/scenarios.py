@@ -0,0 +1,194 @@
+"""Driver-based what-if scenarios over the P&L for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import List, Optional
+
+from .cube import LedgerMatrix, to_period
+from .fx import FxRates
+from .pnl import classify_account, derive_lines
+from .simulation import DEFAULT_HORIZON, runway_months
+
+
+REPORTED_LINES = ['revenue', 'cogs', 'opex', 'gross_profit', 'ebitda']
+LABELS = {
+    'burn': 'Monthly burn (USD)',
+    'cogs_ratio': 'COGS ratio',
+    'runway_months': 'Cash runway (months)',
+    'ebitda_margin': 'EBITDA margin %',
+    'ebitda': 'EBITDA (USD)'
+}
+
+
+def driver_label(name: str) -> str:
+    """Readable name of a driver or result column, for tables and charts."""
+    if name in LABELS:
+        return LABELS[name]
+    prefix, _, subject = name.partition(':')
+    subject = subject[:1].upper() + subject[1:]
+    if prefix == 'rate':
+        return f'{subject}/USD rate'
+    if prefix == 'growth':
+        return f'{subject} growth (MoM)'
+    if prefix in ('fx', 'change'):
+        return f'{subject} change'
+    return name
+
+
+class ScenarioEngine:
+    """USD P&L and cash runway under many sets of driver shocks at once.
+
+    Scenarios are rows of a drivers table. Shocks are fractions, 0 when
+    missing:
+
+    - ``fx:<CCY>``: change in the USD value of a currency (-0.10 = EUR
+      falls 10%), applied to the P&L and to cash held in it
+    - ``change:<line>``: one-off change in a line's level
+    - ``growth:<line>``: compound monthly growth of a line
+
+    where ``<line>`` is revenue, cogs, opex:<Category>, or opex for every
+    category. Levels replace a base value, which is kept when missing:
+
+    - ``rate:<CCY>``: USD rate of a currency
+    - ``burn``: monthly burn in USD at the base month's EBITDA
+    - ``cogs_ratio``: COGS as a fraction of revenue
+
+    The base is the local-currency P&L of one month, split by currency,
+    and each scenario is projected over a horizon of months after it. Any
+    change in EBITDA against the base month changes the monthly burn one
+    for one, and runway is the month the projected cash runs out,
+    extrapolated at the final month's burn past the horizon.
+    """
+
+    def __init__(self, month: pd.Period, currencies: List[str], columns: List[str],
+                 local_pnl: np.ndarray, pnl_rates: np.ndarray,
+                 local_cash: np.ndarray, cash_rates: np.ndarray, burn: float):
+        self.month = month
+        self.currencies = currencies
+        self.columns = columns  # base lines: revenue, cogs, opex:*
+        self.local_pnl = local_pnl  # (currency, column)
+        self.pnl_rates = pnl_rates
+        self.local_cash = local_cash  # (currency,)
+        self.cash_rates = cash_rates
+        self.burn = burn
+        self.base = derive_lines(dict(zip(columns, pnl_rates @ local_pnl)))
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, rates: FxRates, month: Optional[str], cash: pd.Series,
+                    cash_month, burn: float) -> 'ScenarioEngine':
+        """Base the engine on a month of actuals and the latest local cash per currency.
+
+        month defaults to the latest month with P&L actuals; KeyError if
+        there are none.
+        """
+        rows = matrix.rows
+        lines = rows['account'].astype(str).map(classify_account)
+        selected = (lines.notna() & (rows['scenario'] == 'actual')).to_numpy()
+        if month is None:
+            reported = np.flatnonzero((~np.isnan(matrix.values[selected])).any(axis=0))
+            if not len(reported):
+                raise KeyError('No P&L actuals')
+            month = matrix.months[reported[-1]]
+        month = to_period(month)
+        column = matrix.position(month)
+
+        local = pd.Series(matrix.values[selected, column]).groupby(
+            [rows['currency'][selected].astype(str).to_numpy(), lines[selected].to_numpy()]
+        ).sum().unstack(fill_value=0.0)
+        columns = ['revenue', 'cogs'] + sorted(c for c in local.columns if c.startswith('opex:'))
+        currencies = sorted(set(local.index) | set(cash.index))
+        local = local.reindex(index=currencies, columns=columns, fill_value=0.0).fillna(0.0)
+
+        # Same rate matrix convert_to_usd uses
+        return cls(
+            month, currencies, columns, local.to_numpy(dtype=float),
+            rates.matrix(currencies, [month])[:, 0],
+            cash.reindex(currencies, fill_value=0.0).to_numpy(dtype=float),
+            rates.matrix(currencies, [cash_month])[:, 0], burn
+        )
+
+    @staticmethod
+    def _drivers(drivers: pd.DataFrame, prefix: str, names: List[str], default: float = 0.0) -> np.ndarray:
+        """(scenario, name) array of the prefix+name drivers, default where missing."""
+        columns = []
+        for name in names:
+            if prefix + name in drivers.columns:
+                values = drivers[prefix + name].to_numpy(dtype=float)
+                columns.append(np.where(np.isnan(values), default, values))
+            else:
+                columns.append(np.full(len(drivers), default))
+        return np.column_stack(columns)
+
+    def validate(self, drivers: pd.DataFrame) -> None:
+        """ValueError for a driver column that matches nothing, e.g. a misspelt category or currency.
+
+        fx: and rate: drivers must name a currency of the P&L or cash, in
+        the rate table's upper-case codes.
+        """
+        lines = self.columns + ['opex']
+        known = {f'{prefix}:{line}' for prefix in ('change', 'growth') for line in lines} | {'burn', 'cogs_ratio'}
+        known |= {f'{prefix}:{currency}' for prefix in ('fx', 'rate') for currency in self.currencies}
+        unknown = [c for c in drivers.columns if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown scenario drivers: {', '.join(map(str, unknown))}")
+
+    def axis(self, driver: str, points: int = 50) -> np.ndarray:
+        """Evenly spaced values of a driver around its base, for sensitivity grids."""
+        if driver.startswith('rate:'):
+            currency = driver[len('rate:'):]
+            base = self.pnl_rates[self.currencies.index(currency)] if currency in self.currencies else 1.0
+            return base * np.linspace(0.8, 1.2, points)
+        if driver == 'burn':
+            return max(abs(self.burn), 1.0) * np.linspace(0.5, 1.5, points)
+        if driver == 'cogs_ratio':
+            revenue = self.base['revenue']
+            ratio = self.base['cogs'] / revenue if revenue else 0.0
+            return np.linspace(max(ratio - 0.1, 0.0), ratio + 0.1, points)
+        if driver.startswith('growth:'):
+            return np.linspace(-0.05, 0.05, points)
+        return np.linspace(-0.2, 0.2, points)
+
+    def evaluate(self, drivers: pd.DataFrame, horizon: int = DEFAULT_HORIZON) -> pd.DataFrame:
+        """First projected month's P&L, cash and runway for every scenario, indexed like drivers."""
+        self.validate(drivers)
+        opex = np.array([c.startswith('opex:') for c in self.columns])
+
+        fx = 1 + self._drivers(drivers, 'fx:', self.currencies)
+        rates = self._drivers(drivers, 'rate:', self.currencies, default=np.nan)
+        pnl_rates = np.where(np.isnan(rates), fx * self.pnl_rates, rates)
+        cash_rates = np.where(np.isnan(rates), fx * self.cash_rates, rates)
+        level = 1 + self._drivers(drivers, 'change:', self.columns)
+        level[:, opex] += self._drivers(drivers, 'change:', ['opex'])
+        usd = (pnl_rates @ self.local_pnl) * level
+
+        # OPEX categories without a growth driver of their own all grow at
+        # growth:opex, so they are projected as one pooled line
+        own = np.array([not is_opex or 'growth:' + c in drivers.columns for c, is_opex in zip(self.columns, opex)])
+        columns = [c for c, keep in zip(self.columns, own) if keep] + ['opex:*']
+        usd = np.column_stack([usd[:, own], usd[:, ~own].sum(axis=1)])
+        growth = self._drivers(drivers, 'growth:', columns[:-1] + ['opex'])
+        growth[:, [c.startswith('opex:') for c in columns[:-1]] + [False]] += growth[:, -1:]
+
+        # (scenario, month, line) USD P&L over the horizon
+        months = np.arange(1, horizon + 1)
+        projected = usd[:, None, :] * (1 + growth[:, None, :]) ** months[None, :, None]
+        lines = dict(zip(columns, np.moveaxis(projected, 2, 0)))
+        cogs_ratio = self._drivers(drivers, '', ['cogs_ratio'], default=np.nan)
+        lines['cogs'] = np.where(np.isnan(cogs_ratio), lines['cogs'], cogs_ratio * lines['revenue'])
+        lines = derive_lines(lines)
+
+        burn = self._drivers(drivers, '', ['burn'], default=self.burn)
+        burns = burn - (lines['ebitda'] - self.base['ebitda'])
+        cash = (cash_rates * self.local_cash).sum(axis=1)
+        balances = cash[:, None] - np.cumsum(burns, axis=1)
+        runway = runway_months(balances, cash)
+        # Past the horizon, carry on at the final month's burn
+        beyond = np.isinf(runway) & (burns[:, -1] > 0)
+        runway[beyond] = horizon + balances[beyond, -1] / burns[beyond, -1]
+
+        table = pd.DataFrame({line: lines[line][:, 0] for line in REPORTED_LINES}, index=drivers.index)
+        table['monthly_burn_usd'] = burns[:, 0]
+        table['current_cash_usd'] = cash
+        table['runway_months'] = runway
+        return table
@@ -0,0 +1,174 @@
+"""On-disk binary caches for CFO Copilot's source tables."""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Optional
+
+from .cube import LedgerMatrix, ROW_LEVELS
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+CACHE_FORMAT_VERSION = 3
+
+
+def source_signature(path: str) -> Dict:
+    """Identify a source file by modification time and size."""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _cache_paths(csv_path: str, cache_dir: str, fmt: str):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    data_path = os.path.join(cache_dir, f"{name}.{fmt}")
+    meta_path = os.path.join(cache_dir, f"{name}.meta.json")
+    return data_path, meta_path
+
+
+def _temp_suffix() -> str:
+    """Suffix for a file being written, unique to this process and thread."""
+    return f".tmp-{os.getpid()}-{threading.get_ident()}"
+
+
+def _write_npz(df: pd.DataFrame, path) -> None:
+    """Store each column as a typed array; text columns become unicode arrays."""
+    arrays = {}
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if pd.api.types.is_string_dtype(values.dtype):
+            arrays[f"null_{i}"] = values.isna().to_numpy()
+            arrays[f"col_{i}"] = values.fillna('').astype(str).to_numpy(dtype=str)
+        else:
+            arrays[f"col_{i}"] = values.to_numpy()
+    np.savez(path, **arrays)
+
+
+def _read_npz(path: str, columns, dtypes: Dict) -> pd.DataFrame:
+    data = {}
+    with np.load(path, allow_pickle=False) as arrays:
+        for i, column in enumerate(columns):
+            values = arrays[f"col_{i}"]
+            if f"null_{i}" in arrays.files:
+                values = pd.Series(values, dtype=object).mask(arrays[f"null_{i}"]).astype(dtypes[column])
+            data[column] = values
+    return pd.DataFrame(data, columns=columns)
+
+
+def read_csv_cached(csv_path: str, cache_dir: str, fmt: Optional[str] = None) -> pd.DataFrame:
+    """Read a CSV through a binary sidecar cache.
+
+    The cache is reused while the CSV's mtime and size are unchanged and is
+    rewritten otherwise. Parquet is used when pyarrow is installed, NPZ
+    otherwise. Failing to write the cache (e.g. a read-only checkout) only
+    costs the speed-up. Raises FileNotFoundError if the CSV is missing.
+    """
+    fmt = fmt or ('parquet' if PARQUET_AVAILABLE else 'npz')
+    signature = source_signature(csv_path)
+    data_path, meta_path = _cache_paths(csv_path, cache_dir, fmt)
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if (meta.get('version') == CACHE_FORMAT_VERSION and meta.get('format') == fmt
+                and meta.get('source') == signature):
+            if fmt == 'parquet':
+                return pd.read_parquet(data_path, memory_map=True)
+            return _read_npz(data_path, meta['columns'], meta['dtypes'])
+    except (OSError, ValueError, KeyError):
+        pass  # Missing or unreadable cache: fall through to the CSV
+
+    df = pd.read_csv(csv_path)
+
+    # Written under temporary names and swapped in data first, metadata
+    # last, so a reader whose metadata check passes never reads a
+    # half-written sidecar
+    suffix = _temp_suffix()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(data_path + suffix, 'wb') as f:
+            if fmt == 'parquet':
+                df.to_parquet(f, index=False)
+            else:
+                _write_npz(df, f)
+        with open(meta_path + suffix, 'w') as f:
+            json.dump({
+                'version': CACHE_FORMAT_VERSION,
+                'format': fmt,
+                'source': signature,
+                'columns': list(df.columns),
+                'dtypes': {c: str(t) for c, t in df.dtypes.items()}
+            }, f)
+        os.replace(data_path + suffix, data_path)
+        os.replace(meta_path + suffix, meta_path)
+    except (OSError, ValueError):
+        pass  # Caching is best effort
+
+    return df
+
+
+def save_matrix(directory: str, matrix: LedgerMatrix, sources: Dict,
+                usd_values: Optional[np.ndarray] = None) -> bool:
+    """Persist a ledger matrix as values.npy plus small label files.
+
+    usd_values, the same array converted to USD, is stored as usd.npy so
+    processes map one shared copy of it too. Files are written under
+    temporary names and swapped in with os.replace, metadata last, so
+    concurrent readers never map a half-written array. Returns False if the
+    directory is not writable.
+    """
+    suffix = _temp_suffix()
+    names = ['values.npy'] + (['usd.npy'] if usd_values is not None else []) + ['index.npz', 'meta.json']
+    paths = {name: os.path.join(directory, name) for name in names}
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(paths['values.npy'] + suffix, 'wb') as f:
+            np.save(f, np.ascontiguousarray(matrix.values, dtype=np.float64))
+        if usd_values is not None:
+            with open(paths['usd.npy'] + suffix, 'wb') as f:
+                np.save(f, np.ascontiguousarray(usd_values, dtype=np.float64))
+        with open(paths['index.npz'] + suffix, 'wb') as f:
+            np.savez(f, **{level: matrix.rows[level].astype(str).to_numpy(dtype=str) for level in ROW_LEVELS})
+        with open(paths['meta.json'] + suffix, 'w') as f:
+            json.dump({
+                'version': CACHE_FORMAT_VERSION,
+                'sources': sources,
+                'usd': usd_values is not None,
+                'months': [str(p) for p in matrix.months],
+                'scenario_months': {s: [str(p) for p in idx] for s, idx in matrix.scenario_months.items()}
+            }, f)
+        for name in names:
+            os.replace(paths[name] + suffix, paths[name])
+    except OSError:
+        return False
+    return True
+
+
+def load_matrix(directory: str, sources: Dict) -> Optional[LedgerMatrix]:
+    """Memory-map a saved ledger matrix if it was built from these sources.
+
+    Its USD values are mapped as well when they were saved with it.
+    """
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_FORMAT_VERSION or meta.get('sources') != sources:
+            return None
+        values = np.load(os.path.join(directory, 'values.npy'), mmap_mode='r')
+        usd = np.load(os.path.join(directory, 'usd.npy'), mmap_mode='r') if meta.get('usd') else None
+        with np.load(os.path.join(directory, 'index.npz'), allow_pickle=False) as index:
+            rows = pd.DataFrame({level: pd.Categorical(index[level]) for level in ROW_LEVELS})
+    except (OSError, ValueError, KeyError):
+        return None
+
+    months = pd.PeriodIndex(meta['months'], freq='M')
+    scenario_months = {s: pd.PeriodIndex(p, freq='M') for s, p in meta['scenario_months'].items()}
+    return LedgerMatrix(rows, months, values, scenario_months, usd)
@@ -17,62 +17,405 @@ except ImportError:
         def mean(values):
             return sum(values) / len(values) if values else 0
 
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import os
+import threading
+import weakref
+from collections import deque
+
+from . import ingest
+from .cube import FinancialCube, LedgerMatrix, diff_tables, is_empty_delta, month_columns, month_label, to_period
+from .anomalies import AnomalyScan, changed_series
+from .comparison import PeriodComparison
+from .concurrency import KeyedLocks, Lazy, build_once
+from .consolidation import GROUP, Consolidation, entity_tree
+from .forecast import DEFAULT_FORECAST_HORIZON, Forecast
+from .fx import BUDGET_SUFFIX, FxRates
+from .hierarchy import AccountRollup, AccountTree
+from .memo import DEFAULT_CACHE_SIZE, AnalysisCache, memoized
+from .parallel import EntityPool
+from .periods import FiscalCalendar
+from .pnl import TOTAL_ENTITY, PnLSummary
+from .scenarios import REPORTED_LINES, ScenarioEngine
+from .simulation import DEFAULT_HORIZON, DEFAULT_PATHS, burn_statistics, fx_volatility, runway_months, simulate_runway
+from .variance import EFFECTS, VarianceBridge
+from .storage import load_matrix, read_csv_cached, save_matrix, source_signature
+from .windows import WindowSums, window_start
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """df with every column on a read-only array.
+    
+    load_* hands out shallow views of its cached tables; an in-place write
+    to a view then raises instead of mutating the cache, without switching
+    pandas to copy-on-write for the whole process. Replacing a column on a
+    view is still fine. Extension-typed columns are kept as they are.
+    """
+    columns = {}
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy()
+            values.flags.writeable = False
+            columns[i] = values
+        else:
+            columns[i] = column.array
+    frame = pd.DataFrame(columns, index=df.index, copy=False)
+    frame.columns = df.columns
+    return frame
 
 
 class FinancialDataLoader:
     """Handles loading and preprocessing of financial data."""
     
-    def __init__(self, fixtures_path: str = "fixtures"):
+    TABLES = ('actuals', 'budget', 'fx', 'cash')
+    # Optional structure tables: the entity tree and intercompany eliminations
+    REFERENCE_TABLES = ('entities', 'eliminations')
+    # Tables that feed the cube, and the scenario each one fills
+    CUBE_SCENARIOS = {'actuals': 'actual', 'budget': 'budget', 'cash': 'actual'}
+    # Month-end balances rather than P&L flows: they extend no scenario's P&L months
+    BALANCE_TABLES = ('cash',)
+    BACKENDS = ('pandas', 'mmap')
+    
+    def __init__(self, fixtures_path: str = "fixtures", use_cache: bool = True,
+                 backend: str = 'pandas', fiscal_year_start: int = 1):
         # Use absolute path for Streamlit Cloud compatibility
         if not os.path.isabs(fixtures_path):
             fixtures_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), fixtures_path)
         self.fixtures_path = fixtures_path
+        # Binary sidecar copies of the CSVs, reused while the sources are unchanged
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(fixtures_path, '.cache')
+        # 'mmap' keeps the numeric ledger in a memory-mapped .npy shared by
+        # every process on the machine through the page cache
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}; expected one of {self.BACKENDS}")
+        self.backend = backend
+        # Calendar month (1-12) the fiscal year starts in
+        self.fiscal_year_start = fiscal_year_start
         self._actuals = None
         self._budget = None
         self._fx = None
         self._cash = None
+        self._entities = None
+        self._eliminations = None
+        self._cube = None
+        self._cube_version = None
+        self._matrix = None
+        self._matrix_version = None
+        self._fx_rates = None
+        self._fx_rates_version = None
+        self._budget_fx_rates = None
+        self._budget_fx_rates_version = None
+        self._calendar = None  # scenario (None for every month) -> FiscalCalendar
+        self._calendar_version = None
+        self._usd = None
+        self._usd_version = None
+        self._account_tree = None
+        self._account_tree_version = None
+        self._ingested = set()  # tables not read from their fixture CSV
+        self._signatures = {}  # source signature of each table when it was read
+        self._change_log = deque(maxlen=100)  # (version, deltas or None for a full reload)
+        self._listeners = []  # weak references to callbacks run when new data arrives
+        # Loads and builds take a lock per table or structure, and only on a
+        # miss; refresh, reload and ingest_gl are serialized by _write_lock
+        self._build_locks = KeyedLocks()
+        self._write_lock = threading.RLock()
+        # Bumped on every change; downstream caches key on these
+        self.data_version = 0
+        self.table_versions = {name: 0 for name in self.TABLES + self.REFERENCE_TABLES}
         
-    def load_actuals(self) -> pd.DataFrame:
-        """Load actuals data."""
-        if self._actuals is None:
-            try:
-                self._actuals = pd.read_csv(f"{self.fixtures_path}/actuals.csv")
-            except FileNotFoundError:
-                # Fallback to sample data if file not found
-                self._actuals = self._get_sample_actuals()
-        return self._actuals.copy()
+    def load_actuals(self, copy: bool = False) -> pd.DataFrame:
+        """Load actuals data.
+        
+        Returns a read-only view of the cached table; pass copy=True for an
+        independent mutable copy.
+        """
+        return self._table('actuals', self._get_sample_actuals).copy(deep=copy)
     
-    def load_budget(self) -> pd.DataFrame:
-        """Load budget data."""
-        if self._budget is None:
-            try:
-                self._budget = pd.read_csv(f"{self.fixtures_path}/budget.csv")
-            except FileNotFoundError:
-                # Fallback to sample data if file not found
-                self._budget = self._get_sample_budget()
-        return self._budget.copy()
+    def load_budget(self, copy: bool = False) -> pd.DataFrame:
+        """Load budget data (a read-only view unless copy=True)."""
+        return self._table('budget', self._get_sample_budget).copy(deep=copy)
+    
+    def load_fx(self, copy: bool = False) -> pd.DataFrame:
+        """Load FX rates data (a read-only view unless copy=True)."""
+        return self._table('fx', self._get_sample_fx).copy(deep=copy)
+    
+    def load_cash(self, copy: bool = False) -> pd.DataFrame:
+        """Load cash data (a read-only view unless copy=True)."""
+        return self._table('cash', self._get_sample_cash).copy(deep=copy)
+    
+    def load_entities(self, copy: bool = False) -> pd.DataFrame:
+        """Load the Entity/Parent hierarchy (empty when there is no entities.csv)."""
+        return self._table('entities', lambda: pd.DataFrame(columns=['Entity', 'Parent'])).copy(deep=copy)
+    
+    def load_eliminations(self, copy: bool = False) -> pd.DataFrame:
+        """Load intercompany elimination rules (empty when there is no eliminations.csv)."""
+        return self._table(
+            'eliminations', lambda: pd.DataFrame(columns=['Entity', 'Counterparty', 'Account', 'Currency'])
+        ).copy(deep=copy)
+    
+    def _table(self, name: str, fallback) -> pd.DataFrame:
+        """The cached table, read by one thread however many ask for it first."""
+        table = getattr(self, f'_{name}')
+        if table is None:
+            with self._build_locks(name):
+                table = getattr(self, f'_{name}')
+                if table is None:
+                    table = self._read_table(name, fallback)
+                    setattr(self, f'_{name}', table)
+        return table
+    
+    def _read_table(self, name: str, fallback) -> pd.DataFrame:
+        """Read fixtures/<name>.csv, via the binary cache when enabled."""
+        path = f"{self.fixtures_path}/{name}.csv"
+        try:
+            self._signatures[name] = source_signature(path)
+            if self.use_cache:
+                return _read_only(read_csv_cached(path, self.cache_dir))
+            return _read_only(pd.read_csv(path))
+        except FileNotFoundError:
+            self._signatures.pop(name, None)
+            # Fallback to sample data if file not found
+            return _read_only(fallback())
+    
+    def load_cube(self) -> FinancialCube:
+        """Load the long-format ledger cube, built once per data version."""
+        return build_once(self, 'cube', self.data_version, lambda: FinancialCube.from_wide([
+            (name, scenario, self._cube_table(name, getattr(self, f'load_{name}')()))
+            for name, scenario in self.CUBE_SCENARIOS.items()
+        ], balances=self.BALANCE_TABLES))
+    
+    def _cube_table(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Shape a source table for the cube; cash balances become a 'Cash' account."""
+        if name == 'cash' and 'Account' not in df.columns:
+            return df.assign(Account='Cash')
+        return df
+    
+    def load_matrix(self) -> LedgerMatrix:
+        """Load the dense (series, month) ledger, built once per data version."""
+        if self.backend == 'mmap':
+            return build_once(self, 'matrix', self.data_version, self._load_mapped_matrix)
+        return build_once(self, 'matrix', self.data_version, lambda: LedgerMatrix.from_cube(self.load_cube()))
+    
+    def load_fx_rates(self) -> FxRates:
+        """Load the (month, currency) rate matrix, built once per FX version."""
+        return build_once(self, 'fx_rates', self.table_versions['fx'], lambda: FxRates.from_table(self.load_fx()))
+    
+    def load_budget_fx_rates(self) -> FxRates:
+        """Load the rates the budget was planned at, built once per data version.
+        
+        Uses the fx table's XXX_USD_Budget columns when there are any, and
+        otherwise each month's rate at the start of its fiscal year.
+        """
+        return build_once(self, 'budget_fx_rates', self.data_version, self._build_budget_fx_rates)
+    
+    def _build_budget_fx_rates(self) -> FxRates:
+        rates = FxRates.from_table(self.load_fx(), suffix=BUDGET_SUFFIX)
+        if rates.currencies == ['USD']:
+            calendar = self.load_calendar()
+            actual = self.load_fx_rates()
+            months = calendar.periods.union(actual.rates.index)
+            opening = actual.for_months([calendar.fiscal_year_start_period(m) for m in months])
+            rates = FxRates(opening.set_axis(months))
+        return rates
+    
+    def load_calendar(self, scenario: Optional[str] = None) -> FiscalCalendar:
+        """Load the monthly axis spanning every month in the data, built once per data version.
+        
+        With a scenario, only that scenario's P&L months, e.g. 'actual' for
+        the months with actuals. Read off the ledger matrix, so a mapped
+        ledger needs no source tables parsed.
+        """
+        def build():
+            matrix = self.load_matrix()
+            periods = matrix.months if scenario is None else matrix.scenario_months.get(scenario, [])
+            return FiscalCalendar(periods, self.fiscal_year_start)
+        return build_once(self, 'calendar', self.data_version, build, key=scenario)
+    
+    def load_account_tree(self) -> AccountTree:
+        """Load the chart-of-accounts tree, built once per data version."""
+        return build_once(self, 'account_tree', self.data_version, lambda: AccountTree(self.load_matrix().accounts()))
+    
+    def _load_mapped_matrix(self) -> LedgerMatrix:
+        """Map the ledger from cache_dir/ledger, writing it on first use."""
+        if self._ingested:
+            # Ingested tables have no fixture CSV to key a shared map on
+            return LedgerMatrix.from_cube(self.load_cube())
+        try:
+            sources = {name: source_signature(f"{self.fixtures_path}/{name}.csv") for name in self.TABLES}
+        except FileNotFoundError:
+            # Sample data has no source files to key a shared map on
+            return LedgerMatrix.from_cube(self.load_cube())
+        
+        directory = os.path.join(self.cache_dir, 'ledger')
+        matrix = load_matrix(directory, sources)
+        if matrix is None:
+            matrix = LedgerMatrix.from_cube(self.load_cube())
+            if save_matrix(directory, matrix, sources, self._to_usd(matrix)):
+                matrix = load_matrix(directory, sources) or matrix
+        return matrix
+    
+    def _to_usd(self, matrix: LedgerMatrix) -> np.ndarray:
+        return matrix.values * self.load_fx_rates().matrix(matrix.rows['currency'], matrix.months)
+    
+    def load_usd_values(self) -> np.ndarray:
+        """Load the ledger matrix converted to USD, built once per data version.
+        
+        With the mmap backend this is the USD array mapped from the shared
+        ledger store, so processes share its pages instead of each
+        converting a private copy.
+        """
+        def build():
+            matrix = self.load_matrix()
+            return matrix.usd if matrix.usd is not None else self._to_usd(matrix)
+        return build_once(self, 'usd', self.data_version, build)
+    
+    def ingest_gl(self, path: str, **kwargs) -> Dict:
+        """Replace actuals with a streamed general-ledger export.
+        
+        See ingest.ingest_gl for the file layout and keyword arguments.
+        Returns the ingestion report (rows/sec, peak RSS).
+        """
+        ledger, report = ingest.ingest_gl(path, **kwargs)
+        with self._write_lock:
+            self._actuals = _read_only(ledger)
+            self._ingested.add('actuals')
+            self._cube = None
+            self._matrix = None
+            self._bump_version(['actuals'], None)
+        self._notify()
+        return report
     
-    def load_fx(self) -> pd.DataFrame:
-        """Load FX rates data."""
-        if self._fx is None:
+    def reload(self) -> None:
+        """Drop cached tables so the next access re-reads the sources."""
+        with self._write_lock:
+            self._actuals = None
+            self._budget = None
+            self._fx = None
+            self._cash = None
+            self._entities = None
+            self._eliminations = None
+            self._cube = None
+            self._matrix = None
+            self._ingested.clear()
+            self._signatures.clear()
+            self._bump_version(self.TABLES + self.REFERENCE_TABLES, None)
+    
+    def refresh(self) -> Dict[str, Dict]:
+        """Pick up edits to the fixture CSVs as deltas instead of a full reload.
+        
+        Each loaded table whose CSV changed on disk (mtime or size) is re-read
+        and diffed against the cached copy: new or removed months, and added,
+        changed or deleted rows. The cube is patched with only the affected
+        series and months and data_version is bumped once. Changed entity
+        or elimination tables are re-read whole. Returns the deltas by
+        table name, empty when nothing changed.
+        
+        Queries running meanwhile keep the version they started on; on_change
+        listeners run once the new version is in place.
+        """
+        version = self.data_version
+        with self._write_lock:
+            deltas = self._apply_refresh()
+        if self.data_version != version:
+            self._notify()
+        return deltas
+    
+    def _apply_refresh(self) -> Dict[str, Dict]:
+        # Taken before any table is swapped, so a cube built meanwhile from
+        # the new tables is never patched a second time
+        cube = self._cube if self._cube_version == self.data_version else None
+        deltas = {}
+        tables = {}
+        for name in self.TABLES:
+            old = getattr(self, f'_{name}')
+            if old is None or name in self._ingested or name not in self._signatures:
+                continue  # not loaded yet, or not read from a CSV
             try:
-                self._fx = pd.read_csv(f"{self.fixtures_path}/fx.csv")
+                if source_signature(f"{self.fixtures_path}/{name}.csv") == self._signatures[name]:
+                    continue
             except FileNotFoundError:
-                # Fallback to sample data if file not found
-                self._fx = self._get_sample_fx()
-        return self._fx.copy()
-    
-    def load_cash(self) -> pd.DataFrame:
-        """Load cash data."""
-        if self._cash is None:
+                continue  # keep serving the last good copy
+            
+            new = self._read_table(name, lambda: old)
+            delta = diff_tables(self._cube_table(name, old), self._cube_table(name, new))
+            setattr(self, f'_{name}', new)
+            if not is_empty_delta(delta):
+                deltas[name] = delta
+                tables[name] = self._cube_table(name, new)
+        
+        # Structure tables are small: re-read them whole on the next access
+        references = []
+        for name in self.REFERENCE_TABLES:
+            if getattr(self, f'_{name}') is None or name not in self._signatures:
+                continue
             try:
-                self._cash = pd.read_csv(f"{self.fixtures_path}/cash.csv")
+                if source_signature(f"{self.fixtures_path}/{name}.csv") == self._signatures[name]:
+                    continue
             except FileNotFoundError:
-                # Fallback to sample data if file not found
-                self._cash = self._get_sample_cash()
-        return self._cash.copy()
+                continue
+            setattr(self, f'_{name}', None)
+            references.append(name)
+        
+        if not deltas:
+            if references:
+                self._bump_version(references, None)
+            return deltas
+        
+        for name, delta in deltas.items():
+            if cube is None or name not in self.CUBE_SCENARIOS:
+                continue
+            if delta['full'] or name not in cube.sources:
+                cube = None  # rebuild from the tables on next access
+            else:
+                cube = cube.apply_delta(name, tables[name], delta)
+        
+        self._matrix = None
+        # The patched cube goes in first, ready for the version that needs it
+        with self._build_locks('cube'):
+            self._cube = cube
+            self._cube_version = self.data_version + 1 if cube is not None else None
+        self._bump_version(list(deltas) + references, None if references else deltas)
+        return deltas
+    
+    def on_change(self, callback: Callable[[], None]) -> None:
+        """Run callback after every ingest or refresh that brings in new data.
+        
+        Bound methods are held weakly, so subscribing does not keep their
+        object alive.
+        """
+        if hasattr(callback, '__self__'):
+            self._listeners.append(weakref.WeakMethod(callback))
+        else:
+            self._listeners.append(lambda: callback)
+    
+    def _notify(self) -> None:
+        """Run the live on_change callbacks, forgetting dead ones."""
+        callbacks = [ref() for ref in self._listeners]
+        self._listeners = [ref for ref, callback in zip(self._listeners, callbacks) if callback is not None]
+        for callback in callbacks:
+            if callback is not None:
+                callback()
+    
+    def changes_since(self, version: int) -> Optional[List[Dict]]:
+        """Deltas applied after a data version, oldest first.
+        
+        Returns None when they cannot be described incrementally: a full
+        reload or ingestion happened since, or the log no longer reaches back.
+        """
+        entries = [(v, deltas) for v, deltas in self._change_log if v > version]
+        if len(entries) != self.data_version - version or any(d is None for _, d in entries):
+            return None
+        return [deltas for _, deltas in entries]
+    
+    def _bump_version(self, tables, deltas: Optional[Dict]) -> None:
+        # data_version goes last: bumping it is what publishes the new data
+        version = self.data_version + 1
+        for name in tables:
+            self.table_versions[name] = version
+        self._change_log.append((version, deltas))
+        self.data_version = version
     
     def _get_sample_actuals(self) -> pd.DataFrame:
         """Generate sample actuals data when CSV file is not found."""
@@ -115,91 +458,359 @@ class FinancialDataLoader:
 class FinancialAnalyzer:
     """Core financial analysis functions."""
     
-    def __init__(self, data_loader: FinancialDataLoader):
+    def __init__(self, data_loader: FinancialDataLoader, cache_size: int = DEFAULT_CACHE_SIZE, workers: int = 0):
         self.loader = data_loader
+        # Results of the public queries, keyed by method, arguments and data
+        # version; cache_size=0 turns memoization off
+        self.cache = AnalysisCache(cache_size) if cache_size else None
+        # workers > 1 aggregates the P&L and cash by entity shard across a
+        # process pool; otherwise everything runs in this process
+        self.pool = EntityPool(workers) if workers > 1 else None
+        self._partials = None
+        self._partials_version = None
+        # Derived structures are built once per data version, by whichever
+        # thread asks first; the rest wait for it and share the result
+        self._build_locks = KeyedLocks()
+        self._pnl = None
+        self._pnl_version = None
+        self._rollup = None
+        self._rollup_version = None
+        self._consolidation = None
+        self._consolidation_version = None
+        self._comparisons = {}  # level -> PeriodComparison
+        self._comparisons_version = None
+        self._windows = None
+        self._windows_version = None
+        self._variance = None
+        self._variance_version = None
+        self._forecasts = {}  # (level, horizon) -> Forecast
+        self._forecasts_version = None
+        self._anomalies = None
+        self._anomalies_version = None
+        # Scan for anomalies as soon as new data is ingested or refreshed
+        self.loader.on_change(self.get_anomaly_scan)
+        self._scenarios = {}  # base month -> ScenarioEngine
+        self._scenarios_version = None
     
     def get_monthly_columns(self) -> List[str]:
-        """Get list of month columns."""
-        return [
-            'Jan 2025', 'Feb 2025', 'Mar 2025', 'Apr 2025', 
-            'May 2025', 'Jun 2025', 'Jul 2025', 'Aug 2025',
-            'Sep 2025', 'Oct 2025', 'Nov 2025', 'Dec 2025'
-        ]
+        """Get list of month columns, oldest first, across all years in the data."""
+        return self.loader.load_calendar().labels
     
-    def convert_to_usd(self, df: pd.DataFrame, month: str) -> pd.DataFrame:
-        """Convert financial data to USD using FX rates."""
-        fx_rates = self.loader.load_fx()
-        df_usd = df.copy()
+    def convert_to_usd(self, df: pd.DataFrame, month: Optional[str] = None) -> pd.DataFrame:
+        """Convert financial data to USD using FX rates.
         
-        # Get the FX rate for the month
-        month_short = month.split()[0]  # Extract 'Jun' from 'Jun 2025'
-        fx_row = fx_rates[fx_rates['Month'].str.contains(month_short)]
+        Converts one month column, or every month column when month is None,
+        for all quoted currencies in a single broadcast multiply.
+        """
+        # Shallow copy: only the converted columns are replaced with new arrays
+        df_usd = df.copy(deep=False)
+        if df_usd.empty:
+            return df_usd
         
-        if not fx_row.empty and not df_usd.empty:
-            eur_to_usd = fx_row['EUR_USD'].iloc[0]
-            
-            # Convert EUR values to USD
-            eur_mask = df_usd['Currency'] == 'EUR'
-            if eur_mask.any():
-                # Convert to float to avoid dtype warning
-                df_usd.loc[eur_mask, month] = (df_usd.loc[eur_mask, month].astype(float) * eur_to_usd)
-                df_usd.loc[eur_mask, 'Currency'] = 'USD'
+        rates = self.loader.load_fx_rates()
+        columns = month_columns(df_usd) if month is None else [month]
+        df_usd[columns] = df_usd[columns].astype(float) * rates.matrix(df_usd['Currency'], columns)
+        df_usd['Currency'] = np.where(rates.quoted(df_usd['Currency']), 'USD', df_usd['Currency'])
         
         return df_usd
     
-    def get_revenue_vs_budget(self, month: str) -> Dict:
-        """Get revenue actual vs budget for a specific month."""
-        actuals = self.loader.load_actuals()
-        budget = self.loader.load_budget()
+    def _usd_values(self) -> np.ndarray:
+        """The ledger matrix converted to USD, shared with the loader."""
+        return self.loader.load_usd_values()
+    
+    def _entity_partials(self) -> Optional[Tuple[PnLSummary, np.ndarray]]:
+        """P&L and month-end USD cash merged from the pool's entity shards, once per data version.
         
-        # Filter for revenue only
-        revenue_actual = actuals[actuals['Account'] == 'Revenue']
-        revenue_budget = budget[budget['Account'] == 'Revenue']
+        None without a pool, and empty for an empty ledger (so the empty
+        result is cached too); callers then compute in this process.
+        """
+        if self.pool is None:
+            return None
+        return build_once(self, 'partials', self.loader.data_version, lambda: self.pool.aggregate(
+            self.loader.load_matrix(), self.loader.load_fx_rates()
+        ) or ())
+    
+    def get_pnl(self) -> PnLSummary:
+        """USD P&L per (scenario, entity, month), materialized once per data version."""
+        partials = self._entity_partials()
+        if partials:
+            return partials[0]
+        return build_once(self, 'pnl', self.loader.data_version,
+                          lambda: PnLSummary.from_matrix(self.loader.load_matrix(), self._usd_values()))
+    
+    def _cash_usd(self) -> np.ndarray:
+        """Month-end cash in USD over all entities for every ledger month."""
+        partials = self._entity_partials()
+        if partials:
+            return partials[1]
+        return np.nansum(self._usd_values()[self.loader.load_matrix().mask('actual', ['Cash'])], axis=0)
+    
+    def get_account_rollup(self) -> AccountRollup:
+        """USD subtree totals for every account node, computed once per data version."""
+        return build_once(self, 'rollup', self.loader.data_version, lambda: AccountRollup(
+            self.loader.load_account_tree(), self.loader.load_matrix(), self._usd_values()
+        ))
+    
+    def get_consolidation(self) -> Consolidation:
+        """Consolidated P&L for every entity-tree node, computed once per data version."""
+        def build():
+            pnl = self.get_pnl()
+            eliminations = self.loader.load_eliminations()
+            parties = list(eliminations['Entity']) + list(eliminations['Counterparty'])
+            tree = entity_tree(pnl.entities() + [str(p) for p in parties], self.loader.load_entities())
+            return Consolidation(tree, pnl, eliminations, self.loader.load_fx_rates())
+        return build_once(self, 'consolidation', self.loader.data_version, build)
+    
+    def get_comparison(self, level: str = 'pnl') -> PeriodComparison:
+        """Period comparisons of P&L lines ('pnl') or ledger accounts ('account'), built once per data version."""
+        if level == 'pnl':
+            build = lambda: PeriodComparison.from_pnl(self.get_pnl(), self.loader.load_matrix())
+        elif level == 'account':
+            build = lambda: PeriodComparison.from_matrix(self.loader.load_matrix(), self._usd_values())
+        else:
+            raise ValueError(f"Unknown comparison level {level!r}; use 'pnl' or 'account'")
+        return build_once(self, 'comparisons', self.loader.data_version, build, key=level)
+    
+    def get_window_sums(self) -> WindowSums:
+        """Prefix sums of the USD P&L along the month axis, built once per data version."""
+        return build_once(self, 'windows', self.loader.data_version, lambda: WindowSums(self.get_pnl()))
+    
+    def get_variance_decomposition(self) -> VarianceBridge:
+        """FX / volume / mix split of every ledger key's budget variance, built once per data version."""
+        return build_once(self, 'variance', self.loader.data_version, lambda: VarianceBridge.from_matrix(
+            self.loader.load_matrix(), self.loader.load_fx_rates(), self.loader.load_budget_fx_rates()
+        ))
+    
+    def get_forecast(self, level: str = 'pnl', horizon: int = DEFAULT_FORECAST_HORIZON) -> Forecast:
+        """Forecasts of every P&L line ('pnl') or ledger account ('account'), fitted once per data version."""
+        if level == 'pnl':
+            build = lambda: Forecast.from_pnl(self.get_pnl(), horizon)
+        elif level == 'account':
+            build = lambda: Forecast.from_matrix(self.loader.load_matrix(), self._usd_values(), horizon)
+        else:
+            raise ValueError(f"Unknown forecast level {level!r}; use 'pnl' or 'account'")
+        return build_once(self, 'forecasts', self.loader.data_version, build, key=(level, horizon))
+    
+    def get_anomaly_scan(self) -> AnomalyScan:
+        """Ranked anomalies of every ledger series, rescanning only changed series on a new data version."""
+        def build():
+            matrix = self.loader.load_matrix()
+            # Runs under the build lock, so the previous scan cannot change meanwhile
+            previous, pairs = self._anomalies, None
+            if previous is not None:
+                pairs = changed_series(self.loader.changes_since(self._anomalies_version))
+            if pairs is None:
+                return AnomalyScan.from_matrix(matrix, self._usd_values())
+            return previous.update(matrix, self._usd_values(), pairs) if pairs else previous
+        return build_once(self, 'anomalies', self.loader.data_version, build)
+    
+    def get_scenario_engine(self, month: Optional[str] = None) -> ScenarioEngine:
+        """What-if engine based on a month of actuals (the latest by default), built once per data version."""
+        key = to_period(month) if month else None
         
-        # Convert to USD
-        revenue_actual_usd = self.convert_to_usd(revenue_actual, month)
-        revenue_budget_usd = self.convert_to_usd(revenue_budget, month)
+        def build():
+            currencies, local, last = self._cash_by_currency()
+            return ScenarioEngine.from_matrix(
+                self.loader.load_matrix(), self.loader.load_fx_rates(), key,
+                pd.Series(local[:, -1], index=currencies), last,
+                self.calculate_cash_runway()['avg_monthly_burn_usd']
+            )
+        return build_once(self, 'scenarios', self.loader.data_version, build, key=key)
+    
+    @staticmethod
+    def _pct(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Percentage, 0 where the denominator is 0."""
+        return np.divide(numerator * 100, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+    
+    @memoized
+    def get_revenue_vs_budget_by_month(self, months: List[str]) -> pd.DataFrame:
+        """Revenue actual vs budget for many months in one pass, indexed by month."""
+        pnl = self.get_pnl()
+        actual = pnl.rows(months, 'actual')['revenue'].to_numpy()
+        budget = pnl.rows(months, 'budget')['revenue'].to_numpy()
+        variance = actual - budget
+        return pd.DataFrame({
+            'actual': actual,
+            'budget': budget,
+            'variance': variance,
+            'variance_pct': self._pct(variance, budget)
+        }, index=pd.Index(months, name='month'))
+    
+    @memoized
+    def get_gross_margin_by_month(self, months: List[str]) -> pd.DataFrame:
+        """Revenue, COGS and gross margin for many months in one pass, indexed by month."""
+        table = self.get_pnl().rows(months)[['revenue', 'cogs', 'gross_profit']]
+        return table.assign(gross_margin_pct=self._pct(table['gross_profit'].to_numpy(), table['revenue'].to_numpy()))
+    
+    @memoized
+    def get_opex_breakdown_by_month(self, months: List[str]) -> pd.DataFrame:
+        """OPEX by category for many months in one pass: one row per month, one column per category."""
+        pnl = self.get_pnl()
+        table = pnl.rows(months)[[f'opex:{c}' for c in pnl.categories]]
+        table.columns = pnl.categories
+        return table
+    
+    @memoized
+    def calculate_ebitda_by_month(self, months: List[str]) -> pd.DataFrame:
+        """EBITDA and its components for many months in one pass, indexed by month."""
+        table = self.get_pnl().rows(months)[['revenue', 'cogs', 'opex', 'ebitda']]
+        return table.assign(ebitda_margin=self._pct(table['ebitda'].to_numpy(), table['revenue'].to_numpy()))
+    
+    def _window_table(self, months: List[str], window, entity: Optional[str]) -> pd.DataFrame:
+        """P&L totals and margins of the window ending at each month, from the prefix sums."""
+        calendar = self.loader.load_calendar()
+        sums = self.get_window_sums()
+        starts = [window_start(window, m, calendar) for m in months]
+        values, covered = sums.sums(starts, months, 'actual', entity)
+        table = pd.DataFrame(values, columns=sums.columns, index=pd.Index(months, name='month'))
+        table = table[REPORTED_LINES]
+        revenue = table['revenue'].to_numpy()
+        return table.assign(
+            gross_margin_pct=self._pct(table['gross_profit'].to_numpy(), revenue),
+            ebitda_margin=self._pct(table['ebitda'].to_numpy(), revenue),
+            start=[month_label(p) for p in starts],
+            months_covered=covered
+        )
+    
+    @memoized
+    def calculate_window_metrics(self, month: str, window='ttm', entity: Optional[str] = None) -> Dict:
+        """P&L over a window ending at month: 'ttm', 'ytd', 'qtd' or a number of months.
+        
+        Served from prefix sums, so any window costs the same. KeyError if
+        no month in the window has actuals.
+        """
+        row = self._window_table([month], window, entity).iloc[0]
+        if row['months_covered'] == 0:
+            raise KeyError(month)
+        
+        return {
+            'month': month,
+            'window': window,
+            'start': row['start'],
+            'months_covered': int(row['months_covered']),
+            **{line: float(row[line]) for line in REPORTED_LINES + ['gross_margin_pct', 'ebitda_margin']}
+        }
+    
+    @memoized
+    def get_rolling_metrics(self, months: List[str], window=3, entity: Optional[str] = None) -> pd.DataFrame:
+        """Rolling P&L and margins for the window ending at each of many months, indexed by month."""
+        return self._window_table(months, window, entity)
+    
+    @memoized
+    def compare_periods(self, months: Optional[List[str]] = None, level: str = 'pnl',
+                        entity: Optional[str] = None, lines: Optional[List[str]] = None) -> pd.DataFrame:
+        """Actual vs budget, prior month and prior year as a tidy table.
+        
+        One row per (entity, line, month) with actuals, or per (entity,
+        account, month) at level='account'. lines filters P&L lines or
+        accounts; at the P&L level entity defaults to the total.
+        """
+        if level == 'pnl' and entity is None:
+            entity = TOTAL_ENTITY
+        key = 'line' if level == 'pnl' else 'account'
+        return self.get_comparison(level).select(month=months, entity=entity, **{key: lines})
+    
+    @memoized
+    def forecast_pnl(self, months: Optional[List[str]] = None, entity: Optional[str] = None,
+                     lines: Optional[List[str]] = None, horizon: int = DEFAULT_FORECAST_HORIZON) -> pd.DataFrame:
+        """Forecast P&L after the latest actuals as a tidy table.
+        
+        One row per (entity, line, month) with the model, the forecast and
+        its prediction interval; entity defaults to the total.
+        """
+        return self.get_forecast('pnl', horizon).select(month=months, entity=entity or TOTAL_ENTITY, line=lines)
+    
+    def _forecast_row(self, month: str) -> Dict:
+        """Total P&L forecast for a month after the actuals; KeyError beyond the forecast horizon."""
+        return self.get_forecast('pnl').row(month)
+    
+    @memoized
+    def find_anomalies(self, month: Optional[str] = None, entity: Optional[str] = None,
+                       types: Optional[List[str]] = None, limit: Optional[int] = 20) -> pd.DataFrame:
+        """Ranked anomalies (jumps, missing months, sign flips), largest USD impact first.
+        
+        month defaults to the latest month with actuals; pass month='all'
+        for every month.
+        """
+        scan = self.get_anomaly_scan()
+        if month is None:
+            month = month_label(scan.months[-1]) if len(scan.months) else None
+        return scan.select(None if month == 'all' else month, entity, types, limit)
+    
+    @memoized
+    def get_variance_bridge(self, month: str, line: str = 'revenue', entity: Optional[str] = None) -> Dict:
+        """Bridge from budget to actual for a P&L line: FX, volume and mix effects.
+        
+        Budget and actuals are valued at actual rates, as in
+        get_revenue_vs_budget, and budget + fx + volume + mix = actual,
+        where fx is the variance due to rates differing from the budget
+        rates. For EBITDA the cost lines are negated. As in compare_periods,
+        the budget and effects are NaN unless every entity line with actuals
+        has budget. drivers holds the (entity, account) rows behind the
+        total, largest variance first. KeyError if the month has no data.
+        """
+        table = self.get_variance_decomposition().bridge(month, line, entity)
+        if table.empty:
+            raise KeyError(month)
         
-        # Sum by month
-        actual_total = revenue_actual_usd[month].sum()
-        budget_total = revenue_budget_usd[month].sum()
+        # Rounded to cents so a mix that nets out reads as zero; any
+        # unbudgeted row leaves the budget side NaN
+        totals = {column: round(float(table[column].to_numpy().sum()), 2) + 0.0
+                  for column in ['budget'] + EFFECTS + ['actual', 'variance']}
+        return {
+            'month': month,
+            'line': line,
+            'entity': entity,
+            **totals,
+            'variance_pct': (totals['variance'] / abs(totals['budget']) * 100) if totals['budget'] != 0 else 0,
+            'drivers': table
+        }
+    
+    @memoized
+    def get_revenue_vs_budget(self, month: str) -> Dict:
+        """Get revenue actual vs budget for a specific month."""
+        # Revenue lines of the materialized USD P&L
+        pnl = self.get_pnl()
+        budget_total = pnl.row(month, 'budget')['revenue']
+        try:
+            actual_total = pnl.row(month, 'actual')['revenue']
+            forecast = None
+        except KeyError:
+            # Months after the actuals are answered from the forecast
+            forecast = self._forecast_row(month)['revenue']
+            actual_total = forecast[0]
         variance = actual_total - budget_total
         variance_pct = (variance / budget_total * 100) if budget_total != 0 else 0
         
-        return {
+        result = {
             'month': month,
             'actual': actual_total,
             'budget': budget_total,
             'variance': variance,
             'variance_pct': variance_pct
         }
+        if forecast:
+            result.update(forecast=True, lower=forecast[1], upper=forecast[2])
+        return result
     
+    @memoized
     def get_gross_margin_trend(self, months: List[str]) -> List[Dict]:
         """Calculate gross margin trend for specified months."""
         try:
-            actuals = self.loader.load_actuals()
             results = []
+            # All months in one vectorized pass
+            table = self.get_gross_margin_by_month(months)
             
-            for month in months:
-                try:
-                    # Convert to USD
-                    actuals_usd = self.convert_to_usd(actuals, month)
-                    
-                    # Get revenue and COGS with error handling for mock data
-                    revenue = actuals_usd[actuals_usd['Account'] == 'Revenue'][month].sum()
-                    cogs = actuals_usd[actuals_usd['Account'] == 'COGS'][month].sum()
-                    
-                    gross_profit = revenue - cogs
-                    gross_margin_pct = (gross_profit / revenue * 100) if revenue != 0 else 0
-                    
+            for month, row in zip(months, table.itertuples(index=False)):
+                if not np.isnan(row.revenue):
                     results.append({
                         'month': month,
-                        'revenue': revenue,
-                        'cogs': cogs,
-                        'gross_profit': gross_profit,
-                        'gross_margin_pct': gross_margin_pct
+                        'revenue': row.revenue,
+                        'cogs': row.cogs,
+                        'gross_profit': row.gross_profit,
+                        'gross_margin_pct': row.gross_margin_pct
                     })
-                except (TypeError, AttributeError, KeyError, IndexError):
+                else:
                     # Fallback to sample data for this month
                     sample_data = {
                         'Apr 2025': {'revenue': 2280000, 'cogs': 955000, 'gross_margin_pct': 58.1},
@@ -227,25 +838,23 @@ class FinancialAnalyzer:
                 {'month': 'Jun 2025', 'revenue': 2350000, 'cogs': 980000, 'gross_profit': 1370000, 'gross_margin_pct': 58.3}
             ]
     
-    def get_opex_breakdown(self, month: str) -> Dict:
-        """Get OPEX breakdown by category for a specific month."""
-        actuals = self.loader.load_actuals()
-        
-        # Filter for OPEX accounts
-        opex_data = actuals[actuals['Account'].str.startswith('Opex:')]
+    @memoized
+    def get_opex_breakdown(self, month: str, parent: str = 'Opex') -> Dict:
+        """Get OPEX breakdown by category for a specific month.
         
-        # Convert to USD
-        opex_usd = self.convert_to_usd(opex_data, month)
+        parent drills down the account tree, e.g. 'Opex:Sales' breaks Sales
+        down into its sub-accounts.
+        """
+        rollup = self.get_account_rollup()
+        rollup.matrix.position(month)  # KeyError if there are no actuals for the month
         
-        # Group by category
-        breakdown = {}
-        total_opex = 0
-        
-        for _, row in opex_usd.iterrows():
-            category = row['Account'].replace('Opex:', '')
-            amount = row[month]
-            breakdown[category] = breakdown.get(category, 0) + amount
-            total_opex += amount
+        # Subtree totals of each category under parent
+        if parent in rollup.tree:
+            breakdown = rollup.breakdown(parent, month)
+            total_opex = rollup.value(parent, month)
+        else:
+            breakdown = {}
+            total_opex = 0.0
         
         return {
             'month': month,
@@ -253,25 +862,26 @@ class FinancialAnalyzer:
             'total': total_opex
         }
     
+    @memoized
     def calculate_ebitda(self, month: str) -> Dict:
-        """Calculate EBITDA for a specific month."""
-        actuals = self.loader.load_actuals()
-        actuals_usd = self.convert_to_usd(actuals, month)
-        
-        # Revenue
-        revenue = actuals_usd[actuals_usd['Account'] == 'Revenue'][month].sum()
-        
-        # COGS
-        cogs = actuals_usd[actuals_usd['Account'] == 'COGS'][month].sum()
+        """Calculate EBITDA for a specific month, forecast for months after the actuals."""
+        try:
+            pnl = self.get_pnl().row(month)
+            forecast = None
+        except KeyError:
+            forecast = self._forecast_row(month)
+            pnl = {line: values[0] for line, values in forecast.items()}
         
-        # OPEX
-        opex = actuals_usd[actuals_usd['Account'].str.startswith('Opex:')][month].sum()
+        # Revenue, COGS and OPEX from the materialized USD P&L
+        revenue = pnl['revenue']
+        cogs = pnl['cogs']
+        opex = pnl['opex']
         
         # EBITDA = Revenue - COGS - OPEX
-        ebitda = revenue - cogs - opex
+        ebitda = pnl['ebitda']
         ebitda_margin = (ebitda / revenue * 100) if revenue != 0 else 0
         
-        return {
+        result = {
             'month': month,
             'revenue': revenue,
             'cogs': cogs,
@@ -279,56 +889,52 @@ class FinancialAnalyzer:
             'ebitda': ebitda,
             'ebitda_margin': ebitda_margin
         }
+        if forecast:
+            result.update(forecast=True, ebitda_lower=forecast['ebitda'][1], ebitda_upper=forecast['ebitda'][2])
+        return result
     
+    @memoized
+    def calculate_consolidated_ebitda(self, month: str, entity: str = GROUP) -> Dict:
+        """EBITDA of an entity-tree node after intercompany eliminations."""
+        pnl = self.get_consolidation().row(entity, month)
+        revenue = pnl['revenue']
+        ebitda = pnl['ebitda']
+        
+        return {
+            'month': month,
+            'entity': entity,
+            'revenue': revenue,
+            'cogs': pnl['cogs'],
+            'opex': pnl['opex'],
+            'ebitda': ebitda,
+            'ebitda_margin': (ebitda / revenue * 100) if revenue != 0 else 0
+        }
+    
+    @memoized
     def calculate_cash_runway(self) -> Dict:
         """Calculate cash runway based on recent burn rate."""
         try:
-            cash_data = self.loader.load_cash()
+            matrix = self.loader.load_matrix()
             months = self.get_monthly_columns()
             
-            # Convert cash to USD and get monthly balances
-            cash_balances_usd = {}
-            fx_rates = self.loader.load_fx()
+            # Month-end cash in USD for every month in one pass
+            balances = self._cash_usd()
+            positions = matrix.months.get_indexer(pd.PeriodIndex([to_period(m) for m in months], freq='M'))
             
-            for month in months:
-                try:
-                    month_short = month.split()[0]
-                    fx_row = fx_rates[fx_rates['Month'].str.contains(month_short)]
-                    
-                    if not fx_row.empty:
-                        eur_to_usd = fx_row['EUR_USD'].iloc[0]
-                        
-                        total_cash_usd = 0
-                        for _, row in cash_data.iterrows():
-                            if month in row and row.get('Currency') == 'USD':
-                                total_cash_usd += row[month]
-                            elif month in row and row.get('Currency') == 'EUR':
-                                total_cash_usd += row[month] * eur_to_usd
-                        
-                        if total_cash_usd > 0:
-                            cash_balances_usd[month] = total_cash_usd
-                except Exception as e:
-                    continue  # Skip this month if there's an error
+            balances = np.append(balances, np.nan)[positions]  # -1 (no data) picks NaN
+            available = balances > 0
             
             # If no cash data found, return fallback values
-            if not cash_balances_usd:
+            if not available.any():
                 return self._get_fallback_cash_runway()
             
-            # Calculate burn rate from available months
-            months_with_data = list(cash_balances_usd.keys())
-            monthly_burns = []
+            cash_balances_usd = dict(zip(np.asarray(months)[available].tolist(), balances[available]))
             
-            # Calculate burns between consecutive months
-            for i in range(len(months_with_data) - 1):
-                current_month = months_with_data[i]
-                next_month = months_with_data[i + 1]
-                current_cash = cash_balances_usd[current_month]
-                next_cash = cash_balances_usd[next_month]
-                burn = current_cash - next_cash
-                monthly_burns.append(burn)
+            # Burns between consecutive months with data
+            monthly_burns = -np.diff(balances[available])
             
-            avg_monthly_burn = np.mean(monthly_burns) if monthly_burns else 85000  # Default burn
-            current_cash = cash_balances_usd[months_with_data[-1]] if months_with_data else 3954000
+            avg_monthly_burn = monthly_burns.mean() if len(monthly_burns) else 85000  # Default burn
+            current_cash = balances[available][-1]
             
             # Calculate runway in months
             runway_months = current_cash / avg_monthly_burn if avg_monthly_burn > 0 else float('inf')
@@ -344,6 +950,134 @@ class FinancialAnalyzer:
             print(f"Error in calculate_cash_runway: {e}")
             return self._get_fallback_cash_runway()
     
+    def simulate_cash_runway(self, paths: int = DEFAULT_PATHS, horizon: int = DEFAULT_HORIZON,
+                             seed: Optional[int] = None) -> Dict:
+        """Monte Carlo cash runway: P10/P50/P90 runway and a fan of balance paths.
+        
+        Burn mean and volatility come from each currency's month-end cash
+        history and FX volatility from the rate history; see
+        simulation.simulate_runway. Not memoized, since unseeded runs differ.
+        """
+        rates = self.loader.load_fx_rates()
+        names, local, last = self._cash_by_currency()
+        
+        fx_spot = rates.matrix(names, [last])[:, 0]
+        burn_mean, burn_std = burn_statistics(local)
+        if local.shape[1] < 2:
+            # No history to take a burn from: the default burn, split by cash held
+            share = local[:, -1] * fx_spot / max(float(local[:, -1] @ fx_spot), 1.0)
+            burn_mean = 85000 * share / fx_spot
+        
+        history = rates.for_months(rates.rates.index)
+        fx_vol = np.array([
+            fx_volatility(history[[c]].to_numpy())[0] if quoted and c != 'USD' else 0.0
+            for c, quoted in zip(names, rates.quoted(names))
+        ])
+        
+        result = simulate_runway(local[:, -1], burn_mean, burn_std, fx_spot, fx_vol,
+                                 paths=paths, horizon=horizon, seed=seed)
+        result['fan'] = {
+            'months': [month_label(p) for p in pd.period_range(last + 1, periods=horizon, freq='M')],
+            **{band: values.tolist() for band, values in result['fan'].items()}
+        }
+        return result
+    
+    def run_scenarios(self, drivers, month: Optional[str] = None, horizon: int = DEFAULT_HORIZON) -> pd.DataFrame:
+        """EBITDA and cash runway for a batch of what-if scenarios in one pass.
+        
+        drivers is a table, or a list of dicts, with one row per scenario,
+        e.g. {'fx:EUR': -0.10, 'growth:revenue': 0.03}; see
+        scenarios.ScenarioEngine for the driver columns. A row with no
+        drivers is the baseline.
+        """
+        table = self.get_scenario_engine(month).evaluate(pd.DataFrame(drivers), horizon=horizon)
+        table.insert(REPORTED_LINES.index('ebitda') + 1, 'ebitda_margin',
+                     self._pct(table['ebitda'].to_numpy(), table['revenue'].to_numpy()))
+        return table
+    
+    @memoized
+    def get_sensitivity_grid(self, x: str, y: str, metric: str = 'runway_months',
+                             x_values: Optional[List[float]] = None, y_values: Optional[List[float]] = None,
+                             points: int = 50, month: Optional[str] = None,
+                             horizon: int = DEFAULT_HORIZON) -> pd.DataFrame:
+        """Two-way sensitivity table of a run_scenarios metric over two drivers.
+        
+        E.g. runway over x='rate:EUR' by y='burn', or ebitda_margin over
+        x='growth:revenue' by y='cogs_ratio'. Axes default to points values
+        around the base. Every cell is a row of one run_scenarios batch;
+        the result has one row per y value and one column per x value.
+        """
+        engine = self.get_scenario_engine(month)
+        x_values = np.asarray(engine.axis(x, points) if x_values is None else x_values, dtype=float)
+        y_values = np.asarray(engine.axis(y, points) if y_values is None else y_values, dtype=float)
+        
+        drivers = pd.DataFrame({x: np.tile(x_values, len(y_values)), y: np.repeat(y_values, len(x_values))})
+        table = self.run_scenarios(drivers, month=month, horizon=horizon)
+        return pd.DataFrame(
+            table[metric].to_numpy().reshape(len(y_values), len(x_values)),
+            index=pd.Index(y_values, name=y),
+            columns=pd.Index(x_values, name=x)
+        )
+    
+    @memoized
+    def forecast_cash_runway(self, horizon: int = DEFAULT_HORIZON, model: str = 'linear_trend') -> Dict:
+        """Forecast month-end USD cash from its history, with the runway it implies.
+        
+        A linear trend by default, i.e. the fitted burn carried forward;
+        runway_low and runway_high are the runways of the lower and upper
+        ends of the prediction interval.
+        """
+        runway = self.calculate_cash_runway()
+        balances = runway['cash_balances']
+        current = runway['current_cash_usd']
+        keys = pd.DataFrame({'account': ['Cash']})
+        if len(balances) > 1:
+            forecast = Forecast.fit(keys, list(balances), np.array([list(balances.values())], dtype=float), horizon, model)
+        else:
+            # A single balance has no trend: carry the runway's burn forward, without an interval
+            months = pd.period_range(to_period(list(balances)[-1]) + 1, periods=horizon, freq='M')
+            burn = current - runway['avg_monthly_burn_usd'] * np.arange(1, horizon + 1)
+            forecast = Forecast(keys, months, burn[None, :], np.zeros((1, horizon)), np.array(['constant_burn'], dtype=object))
+        low, mid, high = (float(runway_months(path, current)[0]) for path in (forecast.lower, forecast.point, forecast.upper))
+        
+        return {
+            'months': [month_label(p) for p in forecast.months],
+            'forecast': forecast.point[0].tolist(),
+            'lower': forecast.lower[0].tolist(),
+            'upper': forecast.upper[0].tolist(),
+            'model': forecast.model[0],
+            'level': forecast.level,
+            'current_cash_usd': current,
+            'runway_months': mid,
+            'runway_low': low,
+            'runway_high': high
+        }
+    
+    def _cash_by_currency(self):
+        """Local-currency cash per currency over the months with cash on hand.
+        
+        Returns (currencies, (currency, month) balances, last month), using
+        the same months as calculate_cash_runway and its fallback balances
+        (in USD) when there is no cash data.
+        """
+        matrix = self.loader.load_matrix()
+        mask = matrix.mask('actual', ['Cash'])
+        
+        usd = self._cash_usd()
+        # Months with a cash balance, whether or not they have P&L actuals yet
+        present = ~np.isnan(matrix.values[mask]).all(axis=0)
+        available = np.flatnonzero(present & (usd > 0))
+        
+        if not len(available):
+            fallback = self._get_fallback_cash_runway()
+            local = np.array([list(fallback['cash_balances'].values())], dtype=float)
+            return ['USD'], local, to_period(list(fallback['cash_balances'])[-1])
+        
+        currencies = matrix.rows['currency'][mask].astype(str).to_numpy()
+        names = sorted(set(currencies))
+        local = np.vstack([np.nansum(matrix.values[mask][currencies == c], axis=0) for c in names])[:, available]
+        return names, local, matrix.months[available[-1]]
+    
     def _get_fallback_cash_runway(self) -> Dict:
         """Provide fallback cash runway data when calculation fails."""
         return {
@@ -358,14 +1092,9 @@ class FinancialAnalyzer:
         }
 
 
-# Initialize global analyzer
-_data_loader = None
-_analyzer = None
+# Initialize global analyzer, once, however many sessions ask at the same time
+_analyzer = Lazy(lambda: FinancialAnalyzer(FinancialDataLoader()))
 
 def get_analyzer() -> FinancialAnalyzer:
-    """Get the global financial analyzer instance."""
-    global _data_loader, _analyzer
-    if _analyzer is None:
-        _data_loader = FinancialDataLoader()
-        _analyzer = FinancialAnalyzer(_data_loader)
-    return _analyzer
+    """Get the global financial analyzer instance, shared by every session thread."""
+    return _analyzer.get()
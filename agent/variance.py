@@ -0,0 +1,161 @@
+"""Budget variance decomposition for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, Optional
+
+from .cube import LedgerMatrix, month_label, to_period
+from .fx import FxRates
+from .pnl import classify_account
+
+
+EFFECTS = ['fx', 'volume', 'mix']
+BRIDGE_LINES = ['revenue', 'cogs', 'opex', 'ebitda']
+
+
+def line_signs(line: str, lines: Iterable[str]) -> Dict[str, float]:
+    """Sign each base P&L line enters line with: 'revenue', 'cogs', 'opex', 'opex:<category>' or 'ebitda'.
+
+    Costs count against EBITDA, so its bridge shows every effect as a
+    gain or loss of profit. ValueError for any other line.
+    """
+    lines = [l for l in lines if l == 'revenue' or l == 'cogs' or l.startswith('opex:')]
+    opex = [l for l in lines if l.startswith('opex:')]
+    if line == 'ebitda':
+        return {l: 1.0 if l == 'revenue' else -1.0 for l in lines}
+    if line == 'opex':
+        return {l: 1.0 for l in opex}
+    if line in ('revenue', 'cogs') or line.startswith('opex:'):
+        return {line: 1.0}
+    raise ValueError(f"Unknown bridge line {line!r}; use {', '.join(BRIDGE_LINES)} or opex:<category>")
+
+
+class VarianceBridge:
+    """Actual vs budget variance of every ledger key and month, split into FX, volume and mix.
+
+    A key is an (entity, account, currency) series with local actuals A,
+    local budget B, actual rate ra and budget (planning) rate rb. Both
+    sides are valued at actual rates, as in the P&L, so the USD variance
+    is (A - B) * ra, and it splits into
+
+    * fx: (A - B) * (ra - rb), the part of the variance due to rates
+      moving away from plan;
+    * volume: the key's group's variance at budget rates, shared out at
+      the budget mix of the group;
+    * mix: the rest of the key's variance at budget rates, (A - B) * rb -
+      volume, i.e. the shift between members of the group.
+
+    A group is every key rolling up to the same P&L line (or the same
+    non-P&L account) in a month, so mix moves value between entities,
+    currencies and sub-accounts and sums to zero over the group. The
+    ledger holds amounts rather than units, so selling-price effects sit
+    in volume. An entity's line with actuals but no budget in a month has
+    no budget variance: its budget and effects are NaN, as in
+    PeriodComparison, rather than a zero budget. Every effect is one array
+    operation over all keys and months; ``table`` has one row per key and
+    month with actuals or budget.
+    """
+
+    def __init__(self, keys: pd.DataFrame, months: pd.PeriodIndex, actual: np.ndarray, budget: np.ndarray,
+                 actual_rates: np.ndarray, budget_rates: np.ndarray, groups: np.ndarray):
+        self.keys = keys
+        self.months = months
+
+        present = ~(np.isnan(actual) & np.isnan(budget))
+        # A key without budget counts as zero budget where its (entity,
+        # line) has some, as in the P&L, and is unbudgeted otherwise
+        cells, _ = pd.factorize(pd.MultiIndex.from_frame(keys[['entity', 'line']]))
+        cell_budgeted = np.zeros((cells.max() + 1 if len(cells) else 0, len(months)), dtype=bool)
+        np.logical_or.at(cell_budgeted, cells, ~np.isnan(budget))
+        budgeted = cell_budgeted[cells]
+
+        actual_local = np.nan_to_num(actual)
+        budget_local = np.where(budgeted, np.nan_to_num(budget), np.nan)
+        actual_usd = actual_local * actual_rates
+        budget_usd = budget_local * actual_rates
+        # Both sides at budget rates, unbudgeted keys left out of their group
+        constant = np.where(budgeted, actual_local * budget_rates, 0)
+        plan = np.nan_to_num(budget_local) * budget_rates
+
+        group_actual = np.zeros((groups.max() + 1 if len(groups) else 0, len(months)))
+        group_plan = np.zeros_like(group_actual)
+        np.add.at(group_actual, groups, constant)
+        np.add.at(group_plan, groups, plan)
+        group_actual, group_plan = group_actual[groups], group_plan[groups]
+
+        share = np.divide(plan, group_plan, out=np.zeros_like(plan), where=group_plan != 0)
+        # Groups without a budget are all volume
+        volume = np.where(group_plan != 0, (group_actual - group_plan) * share, constant - plan)
+        variance = actual_usd - budget_usd
+        columns = {
+            'budget': budget_usd,
+            'fx': variance - (constant - plan),
+            'volume': np.where(budgeted, volume, np.nan),
+            'mix': np.where(budgeted, constant - plan - volume, np.nan),
+            'actual': actual_usd,
+            'variance': variance
+        }
+
+        rows, cols = np.nonzero(present)
+        labels = np.array([month_label(p) for p in months], dtype=object)
+        self.table = pd.concat([
+            keys.iloc[rows].reset_index(drop=True),
+            pd.DataFrame({'month': labels[cols], **{name: values[rows, cols] for name, values in columns.items()}})
+        ], axis=1)
+
+    @classmethod
+    def from_matrix(cls, matrix: LedgerMatrix, rates: FxRates, budget_rates: FxRates) -> 'VarianceBridge':
+        """Decompose every (entity, account, currency) series of the ledger."""
+        rows = matrix.rows
+        triples = pd.MultiIndex.from_arrays(
+            [rows['entity'].astype(str), rows['account'].astype(str), rows['currency'].astype(str)]
+        )
+        codes, keys = pd.factorize(triples, sort=True)
+        months = matrix.months
+
+        arrays = {}
+        for scenario in ('actual', 'budget'):
+            selected = (rows['scenario'] == scenario).to_numpy()
+            block = matrix.values[selected]
+            totals = np.zeros((len(keys), len(months)))
+            counts = np.zeros((len(keys), len(months)))
+            np.add.at(totals, codes[selected], np.nan_to_num(block))
+            np.add.at(counts, codes[selected], ~np.isnan(block))
+            arrays[scenario] = np.where(counts > 0, totals, np.nan)
+
+        keys = pd.DataFrame({
+            'entity': keys.get_level_values(0).to_numpy(dtype=object),
+            'account': keys.get_level_values(1).to_numpy(dtype=object),
+            'currency': keys.get_level_values(2).to_numpy(dtype=object)
+        })
+        keys['line'] = [classify_account(a) or a for a in keys['account']]
+        groups, _ = pd.factorize(keys['line'])
+        currencies = keys['currency']
+        return cls(keys, months, arrays['actual'], arrays['budget'],
+                   rates.matrix(currencies, months), budget_rates.matrix(currencies, months), groups)
+
+    def select(self, month: Optional[str] = None, entity: Optional[str] = None, lines=None) -> pd.DataFrame:
+        """Rows for a month, entity and P&L lines (or accounts), each optional."""
+        mask = np.ones(len(self.table), dtype=bool)
+        if month is not None:
+            mask &= (self.table['month'] == month_label(to_period(month))).to_numpy()
+        if entity is not None:
+            mask &= (self.table['entity'] == entity).to_numpy()
+        if lines is not None:
+            mask &= self.table['line'].isin(list(lines)).to_numpy()
+        return self.table[mask].reset_index(drop=True)
+
+    def bridge(self, month: str, line: str = 'revenue', entity: Optional[str] = None) -> pd.DataFrame:
+        """Signed effects on line for one month, one row per (entity, account), largest variance first.
+
+        Unbudgeted rows keep NaN budget and effects.
+        """
+        signs = line_signs(line, self.table['line'].unique())
+        rows = self.select(month, entity, signs)
+        sign = rows['line'].map(signs).to_numpy()
+        columns = ['budget'] + EFFECTS + ['actual', 'variance']
+        rows[columns] = rows[columns].to_numpy() * sign[:, None]
+        # An account's currencies share its line's budget state, so NaN only sums from NaN
+        table = rows.groupby(['entity', 'account'], sort=False)[columns].sum(min_count=1).reset_index()
+        return table.iloc[np.argsort(-table['variance'].abs().to_numpy(), kind='stable')].reset_index(drop=True)
@@ -0,0 +1,88 @@
+"""Rolling-window, TTM and year-to-date P&L totals for CFO Copilot."""
+
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .cube import to_period
+from .periods import FiscalCalendar
+from .pnl import TOTAL_ENTITY, PnLSummary
+
+
+WINDOWS = ('ttm', 'ytd', 'qtd')
+
+
+def window_start(window: Union[str, int], end, calendar: FiscalCalendar) -> pd.Period:
+    """First month of a window ending at end: 'ttm', 'ytd', 'qtd' or a number of months."""
+    end = to_period(end)
+    if window == 'ttm':
+        return end - 11
+    if window == 'ytd':
+        return calendar.fiscal_year_start_period(end)
+    if window == 'qtd':
+        return calendar.fiscal_quarter_start_period(end)
+    if isinstance(window, (int, np.integer)) and window > 0:
+        return end - (int(window) - 1)
+    raise ValueError(f"Unknown window {window!r}; use {', '.join(WINDOWS)} or a number of months")
+
+
+class WindowSums:
+    """Prefix sums of the P&L along a gap-free monthly axis.
+
+    For each scenario, ``cumulative[entity, i, column]`` is the total of
+    the first i months, with missing months counting as zero, so any
+    window's total is the difference of two rows whatever its length.
+    ``covered`` counts the scenario's P&L months the same way (cash-only
+    months are not among them), so a window can tell how much of it is
+    backed by data. P&L lines are additive, so the
+    derived lines (opex, gross_profit, ebitda) sum like the others.
+    """
+
+    def __init__(self, pnl: PnLSummary):
+        self.columns = pnl.columns
+        self.cumulative = {}
+        self.covered = {}
+        self._first = {}  # scenario -> ordinal of the first month
+        self._entities = {}
+
+        frame = pnl.frame
+        for scenario in frame.index.get_level_values('scenario').unique():
+            part = frame.xs(scenario, level='scenario')
+            months = pd.PeriodIndex(part.index.get_level_values('month'), freq='M')
+            first = months.asi8.min()
+            offsets = months.asi8 - first
+            entities = pd.Index(sorted(part.index.get_level_values('entity').unique()))
+
+            values = np.zeros((len(entities), int(offsets.max()) + 1, len(self.columns)))
+            values[entities.get_indexer(part.index.get_level_values('entity')), offsets] = part.to_numpy()
+            present = np.zeros(values.shape[1])
+            present[offsets] = 1
+
+            self.cumulative[scenario] = np.concatenate(
+                [np.zeros((len(entities), 1, len(self.columns))), values.cumsum(axis=1)], axis=1
+            )
+            self.covered[scenario] = np.concatenate([[0.0], present.cumsum()])
+            self._first[scenario] = first
+            self._entities[scenario] = {entity: i for i, entity in enumerate(entities)}
+
+    def sums(self, starts: Iterable, ends: Iterable, scenario: str = 'actual',
+             entity: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(window, column) totals over start..end inclusive, and the months with data in each.
+
+        KeyError for an unknown scenario or entity.
+        """
+        cumulative = self.cumulative[scenario]
+        row = self._entities[scenario][entity or TOTAL_ENTITY]
+        length = cumulative.shape[1] - 1
+        first = self._first[scenario]
+        lo = np.clip(np.array([to_period(m).ordinal for m in starts], dtype=np.int64) - first, 0, length)
+        hi = np.clip(np.array([to_period(m).ordinal for m in ends], dtype=np.int64) - first + 1, 0, length)
+        hi = np.maximum(hi, lo)
+        covered = self.covered[scenario]
+        return cumulative[row, hi] - cumulative[row, lo], (covered[hi] - covered[lo]).astype(int)
+
+    def total(self, start, end, scenario: str = 'actual', entity: Optional[str] = None) -> Tuple[Dict[str, float], int]:
+        """P&L summed over start..end inclusive, and the number of months with data."""
+        values, covered = self.sums([start], [end], scenario, entity)
+        return dict(zip(self.columns, values[0].tolist())), int(covered[0])
@@ -2,6 +2,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from typing import Dict, List, Any
@@ -12,6 +13,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agent.planner import get_planner
+from agent.scenarios import driver_label
 from agent.tools import get_analyzer
 
 
@@ -104,8 +106,8 @@ def create_opex_chart(result: Dict) -> go.Figure:
     return fig
 
 
-def create_cash_runway_chart(result: Dict) -> go.Figure:
-    """Create a cash runway chart."""
+def create_cash_runway_chart(result: Dict, simulation: Dict = None, forecast: Dict = None) -> go.Figure:
+    """Create a cash runway chart with the forecast balance, and a P10-P90 fan when a simulation is given."""
     try:
         # Safely extract cash balances data
         cash_balances = result.get('cash_balances', {})
@@ -137,28 +139,67 @@ def create_cash_runway_chart(result: Dict) -> go.Figure:
         marker=dict(size=6)
     ))
     
-    # Add runway projection
-    if result['runway_months'] != float('inf'):
-        # Simple projection
-        current_cash = result['current_cash_usd']
-        burn_rate = result['avg_monthly_burn_usd']
-        
-        projection_months = months[-3:] + ['Jul 2025', 'Aug 2025', 'Sep 2025']
-        projection_values = balances[-3:]
-        
-        for i in range(3):
-            next_balance = projection_values[-1] - burn_rate
-            projection_values.append(max(0, next_balance))
-        
+    # Forecast balance with its prediction interval, anchored at the latest actual balance,
+    # shown until the forecast runs out (or for a year if it never does)
+    if forecast:
+        runway = forecast['runway_months']
+        shown = min(len(forecast['months']), int(np.ceil(runway)) + 1 if runway != float('inf') else 12)
+        forecast_months = months[-1:] + forecast['months'][:shown]
+        fig.add_trace(go.Scatter(
+            x=forecast_months,
+            y=balances[-1:] + forecast['upper'][:shown],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=forecast_months,
+            y=balances[-1:] + forecast['lower'][:shown],
+            mode='lines',
+            name=f"Forecast {forecast['level']}% interval",
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(46, 134, 171, 0.15)'
+        ))
         fig.add_trace(go.Scatter(
-            x=projection_months,
-            y=projection_values,
+            x=forecast_months,
+            y=balances[-1:] + forecast['forecast'][:shown],
             mode='lines',
-            name='Projected (at current burn)',
+            name=f"Forecast ({forecast['model'].replace('_', ' ')})",
             line=dict(color='#C73E1D', width=2, dash='dash'),
             opacity=0.7
         ))
     
+    # Simulated balance fan, anchored at the latest actual balance
+    if simulation and simulation.get('fan'):
+        fan = simulation['fan']
+        fan_months = months[-1:] + fan['months']
+        fig.add_trace(go.Scatter(
+            x=fan_months,
+            y=balances[-1:] + fan['p90'],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=fan_months,
+            y=balances[-1:] + fan['p10'],
+            mode='lines',
+            name='Simulated P10-P90',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor='rgba(199, 62, 29, 0.15)'
+        ))
+        fig.add_trace(go.Scatter(
+            x=fan_months,
+            y=balances[-1:] + fan['p50'],
+            mode='lines',
+            name='Simulated P50',
+            line=dict(color='#C73E1D', width=2, dash='dot')
+        ))
+    
     fig.update_layout(
         title="Cash Balance & Runway Projection",
         xaxis_title="Month",
@@ -192,6 +233,218 @@ def create_ebitda_chart(result: Dict) -> go.Figure:
     return fig
 
 
+def create_forecast_chart(plan: Dict[str, Any], table: pd.DataFrame) -> go.Figure:
+    """Create a forecast line chart with its prediction interval."""
+    months = list(table['month'])
+    metric = plan['metric']
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=table['upper'],
+        mode='lines',
+        line=dict(width=0),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=table['lower'],
+        mode='lines',
+        name='Prediction interval',
+        line=dict(width=0),
+        fill='tonexty',
+        fillcolor='rgba(46, 134, 171, 0.15)'
+    ))
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=table['forecast'],
+        mode='lines+markers',
+        name='Forecast',
+        line=dict(color='#2E86AB', width=3, dash='dash'),
+        marker=dict(size=6)
+    ))
+    
+    fig.update_layout(
+        title=f"{metric.replace('_', ' ').title() if metric != 'ebitda' else 'EBITDA'} Forecast",
+        xaxis_title="Month",
+        yaxis_title="USD",
+        height=400
+    )
+    
+    return fig
+
+
+def create_variance_bridge_chart(result: Dict) -> go.Figure:
+    """Create a budget-to-actual waterfall through the FX, volume and mix effects."""
+    if np.isnan(result['budget']):
+        return None  # Not fully budgeted: nothing to bridge from
+    
+    effects = [result['fx'], result['volume'], result['mix']]
+    
+    fig = go.Figure(go.Waterfall(
+        name="Variance",
+        orientation="v",
+        measure=["absolute", "relative", "relative", "relative", "total"],
+        x=["Budget", "FX", "Volume", "Mix", "Actual"],
+        textposition="outside",
+        text=[f"${result['budget']:,.0f}"] + [f"${value:+,.0f}" for value in effects] + [f"${result['actual']:,.0f}"],
+        y=[result['budget']] + effects + [result['actual']],
+        connector={"line": {"color": "rgb(63, 63, 63)"}},
+    ))
+    
+    fig.update_layout(
+        title=f"{result['line'].upper() if result['line'] != 'revenue' else 'Revenue'} Budget to Actual - {result['month']}",
+        showlegend=False,
+        height=400
+    )
+    
+    return fig
+
+
+def create_anomaly_chart(plan: Dict[str, Any], table: pd.DataFrame) -> go.Figure:
+    """Create a horizontal bar chart of anomaly impact, coloured by anomaly type."""
+    fig = go.Figure()
+    
+    for kind, label, color in (('jump', 'Jump', '#C73E1D'),
+                               ('missing', 'Missing Month', '#F18F01'),
+                               ('sign_flip', 'Sign Flip', '#2E86AB')):
+        rows = table[table['type'] == kind]
+        fig.add_trace(go.Bar(
+            name=label,
+            y=[f"{row['entity']} {row['account']} ({row['month']})" for _, row in rows.iterrows()],
+            x=rows['impact'],
+            orientation='h',
+            marker_color=color
+        ))
+    
+    fig.update_layout(
+        title=f"Anomalies - {plan['month']}",
+        xaxis_title="Impact (USD)",
+        yaxis={'autorange': 'reversed'},
+        height=400
+    )
+    
+    return fig
+
+
+def create_comparison_chart(table: pd.DataFrame) -> go.Figure:
+    """Create a grouped bar chart of % change vs budget, prior month and prior year."""
+    fig = go.Figure()
+    
+    for name, label, color in (('budget', 'vs Budget', '#A23B72'),
+                               ('prior_month', 'vs Prior Month', '#2E86AB'),
+                               ('prior_year', 'vs Prior Year', '#F18F01')):
+        fig.add_trace(go.Bar(
+            name=label,
+            x=[line.replace('_', ' ').title() for line in table['line']],
+            y=table[f'vs_{name}_pct'],
+            marker_color=color
+        ))
+    
+    fig.update_layout(
+        title=f"Period Comparison - {table['month'].iloc[0]}" if len(table) else "Period Comparison",
+        yaxis_title="Change %",
+        barmode='group',
+        height=400
+    )
+    
+    return fig
+
+
+def create_window_chart(plan: Dict[str, Any], result) -> go.Figure:
+    """Create a rolling-window line chart or a TTM/YTD P&L bar chart."""
+    metric = plan['metric']
+    
+    fig = go.Figure()
+    
+    if isinstance(plan['window'], int):
+        table = result[result['months_covered'] > 0]
+        fig.add_trace(go.Scatter(
+            x=list(table.index),
+            y=table[metric],
+            mode='lines+markers',
+            name=f"Rolling {plan['window']}-month",
+            line=dict(color='#F18F01', width=3),
+            marker=dict(size=8)
+        ))
+        title = f"Rolling {plan['window']}-Month {metric.replace('_pct', '').replace('_', ' ').title()}"
+    else:
+        lines = ['revenue', 'cogs', 'opex', 'ebitda']
+        fig.add_trace(go.Bar(
+            x=[line.upper() if line != 'revenue' else 'Revenue' for line in lines],
+            y=[result[line] for line in lines],
+            marker_color=['#2E86AB', '#A23B72', '#F18F01', '#C73E1D']
+        ))
+        title = f"{plan['window'].upper()} P&L - {result['start']} to {result['month']}"
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="",
+        height=400
+    )
+    
+    return fig
+
+
+def create_scenario_chart(result: pd.DataFrame) -> go.Figure:
+    """Create a baseline vs scenario EBITDA and runway chart."""
+    labels = ['Baseline', 'Scenario']
+    runway = [r if r != float('inf') else None for r in result['runway_months']]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        name='EBITDA',
+        x=labels,
+        y=result['ebitda'],
+        marker_color='#2E86AB'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        name='Runway (months)',
+        x=labels,
+        y=runway,
+        mode='markers',
+        marker=dict(color='#C73E1D', size=14),
+        yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        title="Scenario vs Baseline",
+        yaxis=dict(title="EBITDA (USD)"),
+        yaxis2=dict(title="Runway (months)", overlaying='y', side='right'),
+        height=400
+    )
+    
+    return fig
+
+
+def create_sensitivity_chart(grid: pd.DataFrame, metric: str) -> go.Figure:
+    """Create a two-way sensitivity heatmap."""
+    # Infinite runway (cash never runs out) is left blank
+    values = grid.to_numpy()
+    values = [[v if v != float('inf') else None for v in row] for row in values]
+    
+    fig = go.Figure(data=go.Heatmap(
+        z=values,
+        x=grid.columns,
+        y=grid.index,
+        colorscale='RdYlGn',
+        colorbar=dict(title=driver_label(metric))
+    ))
+    
+    fig.update_layout(
+        title=f"{driver_label(metric)} Sensitivity",
+        xaxis_title=driver_label(grid.columns.name),
+        yaxis_title=driver_label(grid.index.name),
+        height=500
+    )
+    
+    return fig
+
+
 def execute_plan(plan: Dict[str, Any]) -> List[Any]:
     """Execute the analysis plan and return results."""
     analyzer = st.session_state.analyzer
@@ -221,6 +474,26 @@ def execute_plan(plan: Dict[str, Any]) -> List[Any]:
                 result = analyzer.calculate_ebitda(**params)
             elif func_name == 'calculate_cash_runway':
                 result = analyzer.calculate_cash_runway(**params)
+            elif func_name == 'forecast_cash_runway':
+                result = analyzer.forecast_cash_runway(**params)
+            elif func_name == 'forecast_pnl':
+                result = analyzer.forecast_pnl(**params)
+            elif func_name == 'simulate_cash_runway':
+                result = analyzer.simulate_cash_runway(**params)
+            elif func_name == 'compare_periods':
+                result = analyzer.compare_periods(**params)
+            elif func_name == 'get_variance_bridge':
+                result = analyzer.get_variance_bridge(**params)
+            elif func_name == 'find_anomalies':
+                result = analyzer.find_anomalies(**params)
+            elif func_name == 'calculate_window_metrics':
+                result = analyzer.calculate_window_metrics(**params)
+            elif func_name == 'get_rolling_metrics':
+                result = analyzer.get_rolling_metrics(**params)
+            elif func_name == 'run_scenarios':
+                result = analyzer.run_scenarios(**params)
+            elif func_name == 'get_sensitivity_grid':
+                result = analyzer.get_sensitivity_grid(**params)
             else:
                 continue
                 
@@ -291,9 +564,25 @@ def create_chart(plan: Dict[str, Any], results: List[Any]) -> go.Figure:
         elif chart_type == 'pie' and plan['intent'] == 'opex_breakdown':
             return create_opex_chart(results[0])
         elif chart_type == 'runway' and plan['intent'] == 'cash_runway':
-            return create_cash_runway_chart(results[0])
+            forecast = next((r for r in results[1:] if 'model' in r), None)
+            simulation = next((r for r in results[1:] if 'paths' in r), None)
+            return create_cash_runway_chart(results[0], simulation, forecast)
         elif chart_type == 'metric' and plan['intent'] == 'ebitda':
             return create_ebitda_chart(results[0])
+        elif chart_type == 'forecast' and plan['intent'] == 'forecast':
+            return create_forecast_chart(plan, results[0])
+        elif chart_type == 'waterfall' and plan['intent'] == 'variance_bridge':
+            return create_variance_bridge_chart(results[0])
+        elif chart_type == 'anomalies' and plan['intent'] == 'anomalies':
+            return create_anomaly_chart(plan, results[0])
+        elif chart_type == 'bar' and plan['intent'] == 'comparison':
+            return create_comparison_chart(results[0])
+        elif plan['intent'] == 'window_metrics':
+            return create_window_chart(plan, results[0])
+        elif chart_type == 'scenario' and plan['intent'] == 'scenario':
+            return create_scenario_chart(results[0])
+        elif chart_type == 'heatmap' and plan['intent'] == 'sensitivity':
+            return create_sensitivity_chart(results[0], plan['function_calls'][0]['params']['metric'])
     except Exception as e:
         st.error(f"Error creating chart: {str(e)}")
         return None
@@ -323,6 +612,15 @@ def main():
         - "Break down Opex by category for June"
         - "What is our EBITDA for June 2025?"
         - "What is our cash runway right now?"
+        - "Forecast revenue for the next 6 months"
+        - "Give me the flash report for June 2025"
+        - "Show the revenue variance bridge for June"
+        - "Anything unusual this month?"
+        - "What is our TTM revenue?"
+        - "Show rolling 3-month margin"
+        - "Simulate our cash runway with P10/P90"
+        - "What if EUR drops 10% and revenue grows 3% MoM?"
+        - "Show runway sensitivity to EUR/USD and burn"
         """)
         
         st.markdown("---")
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""Performance benchmarks for CFO Copilot on a synthetic ledger."""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from agent.anomalies import AnomalyScan
+from agent.forecast import forecast_series
+from agent.ingest import ingest_gl, format_report
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+MONTHS = [p.strftime('%b %Y') for p in pd.period_range('2025-01', '2025-12', freq='M')]
+
+
+def make_ledger(path: str, n_accounts: int = 1000, n_entities: int = 10, seed: int = 0,
+                months: list = MONTHS) -> str:
+    """Write a synthetic actuals/budget/fx/cash fixture set to path."""
+    rng = np.random.default_rng(seed)
+    accounts = ['Revenue', 'COGS'] + [f'Opex:Category{i}' for i in range(n_accounts - 2)]
+    entities = [(f'E{j:03d}', 'EUR' if j % 2 else 'USD') for j in range(n_entities)]
+
+    keys = pd.DataFrame(
+        [(entity, account, currency) for entity, currency in entities for account in accounts],
+        columns=['Entity', 'Account', 'Currency']
+    )
+    values = rng.uniform(1_000, 100_000, size=(len(keys), len(months))).round()
+
+    actuals = pd.concat([keys[['Entity', 'Account']], pd.DataFrame(values, columns=months), keys[['Currency']]], axis=1)
+    budget = actuals.copy()
+    budget[months] = (values * 0.97).round()
+
+    fx = pd.DataFrame({
+        'Month': months,
+        'EUR_USD': 1.10 + rng.normal(0, 0.02, len(months)).round(4),
+        'USD_EUR': 0.90
+    })
+
+    balances = 5_000_000 - np.cumsum(rng.uniform(50_000, 90_000, size=(n_entities, len(months))), axis=1)
+    cash = pd.concat([
+        pd.DataFrame({'Entity': [e for e, _ in entities]}),
+        pd.DataFrame(balances.round(), columns=months),
+        pd.DataFrame({'Currency': [c for _, c in entities]})
+    ], axis=1)
+
+    os.makedirs(path, exist_ok=True)
+    actuals.to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    budget.to_csv(os.path.join(path, 'budget.csv'), index=False)
+    fx.to_csv(os.path.join(path, 'fx.csv'), index=False)
+    cash.to_csv(os.path.join(path, 'cash.csv'), index=False)
+    return path
+
+
+def measure_allocations(func) -> int:
+    """Peak bytes allocated while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_copy_free_views(path: str):
+    """Bytes allocated per table access with deep-copying loads vs read-only views."""
+    print("\n🧪 Allocations per load: deep copy vs read-only view")
+
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    loader = analyzer.loader
+    queries = {
+        'load_actuals': lambda copy: loader.load_actuals(copy=copy),
+        'load_budget': lambda copy: loader.load_budget(copy=copy),
+        'load_fx': lambda copy: loader.load_fx(copy=copy),
+        'load_cash': lambda copy: loader.load_cash(copy=copy),
+        'convert_to_usd': lambda copy: analyzer.convert_to_usd(loader.load_actuals(copy=copy), 'Jun 2025'),
+    }
+    # Read the tables and build the FX rates first, so only the copies are measured
+    for query in queries.values():
+        query(True)
+
+    print(f"{'query':<20}{'deep copy':>14}{'view':>14}")
+    for name, query in queries.items():
+        before = measure_allocations(lambda: query(True))
+        after = measure_allocations(lambda: query(False))
+        print(f"{name:<20}{before:>14,}{after:>14,}")
+
+
+def bench_csv_cache(path: str):
+    """Cold-start load time: parsing the CSVs vs reading the binary cache."""
+    print("\n🧪 Cold start: CSV parse vs binary cache")
+
+    def load_all(use_cache: bool) -> float:
+        loader = FinancialDataLoader(path, use_cache=use_cache)
+        start = time.perf_counter()
+        for load in (loader.load_actuals, loader.load_budget, loader.load_fx, loader.load_cash):
+            load()
+        return time.perf_counter() - start
+
+    load_all(True)  # write the cache
+    print(f"{'csv':<20}{load_all(False) * 1000:>10.1f} ms")
+    print(f"{'cache':<20}{load_all(True) * 1000:>10.1f} ms")
+
+
+def bench_mmap_backend(path: str):
+    """Per-query time of the revenue/COGS/OPEX sums on each storage backend."""
+    print("\n🧪 EBITDA query: in-memory vs memory-mapped ledger")
+
+    for backend in FinancialDataLoader.BACKENDS:
+        FinancialDataLoader(path, backend=backend).load_matrix()  # write caches and map
+        analyzer = FinancialAnalyzer(FinancialDataLoader(path, backend=backend), cache_size=0)
+        start = time.perf_counter()
+        analyzer.loader.load_matrix()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for month in MONTHS:
+            analyzer.calculate_ebitda(month)
+        per_query = (time.perf_counter() - start) / len(MONTHS)
+        print(f"{backend:<20}{'load':>6}{first * 1000:>9.1f} ms{'query':>8}{per_query * 1000:>9.2f} ms")
+
+
+def bench_gl_ingest(path: str, n_lines: int = 500_000):
+    """Streaming GL ingestion throughput and peak memory."""
+    print("\n🧪 GL ingestion")
+    rng = np.random.default_rng(0)
+    days = pd.date_range('2025-01-01', '2025-12-31', freq='D').strftime('%Y-%m-%d')
+    entities = np.array([f'E{j:03d}' for j in range(10)])
+    gl = pd.DataFrame({
+        'Entity': entities[rng.integers(0, len(entities), n_lines)],
+        'Account': np.array(['Revenue', 'COGS', 'Opex:Sales', 'Opex:Marketing'])[rng.integers(0, 4, n_lines)],
+        'Currency': 'USD',
+        'Date': days[rng.integers(0, len(days), n_lines)],
+        'Amount': rng.uniform(10, 10_000, n_lines).round(2)
+    })
+    gl_path = os.path.join(path, 'gl.csv')
+    gl.to_csv(gl_path, index=False)
+    del gl
+
+    _, report = ingest_gl(gl_path, chunksize=100_000, date_format='%Y-%m-%d')
+    print(format_report(report))
+
+
+def bench_incremental_refresh(path: str):
+    """Month-end close: apply a new month as a delta vs a full reload."""
+    print("\n🧪 New month: delta refresh vs full reload")
+    loader = FinancialDataLoader(path)
+    loader.load_cube()
+
+    actuals = loader.load_actuals(copy=True)
+    actuals.insert(len(actuals.columns) - 1, 'Jan 2026', actuals['Dec 2025'])
+    actuals.to_csv(os.path.join(path, 'actuals.csv'), index=False)
+
+    start = time.perf_counter()
+    loader.refresh()
+    loader.load_cube()
+    print(f"{'refresh':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+    start = time.perf_counter()
+    loader.reload()
+    loader.load_cube()
+    print(f"{'reload':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+
+def bench_batched_months(path: str, repeats: int = 20):
+    """Three-year EBITDA trend: one call per month vs one batched call."""
+    months = [p.strftime('%b %Y') for p in pd.period_range('2023-01', '2025-12', freq='M')]
+    print(f"\n🧪 {len(months)}-month EBITDA trend: per-month calls vs batched")
+    make_ledger(path, months=months)
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.calculate_ebitda_by_month(months)  # warm caches
+    
+    def month_by_month():
+        for month in months:
+            analyzer.calculate_ebitda(month)
+    
+    for name, query in (('per month', month_by_month),
+                        ('batched', lambda: analyzer.calculate_ebitda_by_month(months))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            query()
+        print(f"{name:<20}{(time.perf_counter() - start) / repeats * 1000:>10.2f} ms")
+
+
+def bench_memoization(path: str, repeats: int = 1000):
+    """The same KPI question asked repeatedly, with and without the result cache."""
+    print("\n🧪 Repeated question: uncached vs memoized")
+    for label, cache_size in (('uncached', 0), ('memoized', 256)):
+        analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=cache_size)
+        analyzer.get_revenue_vs_budget('Jun 2025')  # warm caches
+        start = time.perf_counter()
+        for _ in range(repeats):
+            analyzer.get_revenue_vs_budget('Jun 2025')
+        per_call = (time.perf_counter() - start) / repeats
+        print(f"{label:<20}{per_call * 1e6:>10.1f} µs")
+    print(f"{'stats':<20}{analyzer.cache.stats()}")
+
+
+def bench_opex_and_runway(path: str, repeats: int = 20):
+    """OPEX breakdown and cash runway at 10k OPEX rows and 500 cash accounts."""
+    print("\n🧪 OPEX breakdown and cash runway: 10k OPEX rows, 500 cash accounts")
+    # 20 OPEX categories x 500 entities, one cash account per entity
+    make_ledger(path, n_accounts=22, n_entities=500)
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.calculate_ebitda('Jun 2025')  # warm caches
+    
+    for name, query in (('opex_breakdown', lambda: analyzer.get_opex_breakdown('Jun 2025')),
+                        ('cash_runway', analyzer.calculate_cash_runway)):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            query()
+        print(f"{name:<20}{(time.perf_counter() - start) / repeats * 1000:>10.2f} ms")
+
+
+def bench_consolidation(path: str, n_entities: int = 300, repeats: int = 1000):
+    """Consolidated EBITDA over a region/country/entity tree with eliminations."""
+    print(f"\n🧪 Consolidation: {n_entities} legal entities, 3 levels, intercompany eliminations")
+    make_ledger(path, n_accounts=12, n_entities=n_entities)
+    rng = np.random.default_rng(0)
+    entities = [f'E{j:03d}' for j in range(n_entities)]
+    structure = pd.DataFrame(
+        [(e, f'C{j % 30:02d}') for j, e in enumerate(entities)] + [(f'C{k:02d}', f'R{k % 3}') for k in range(30)],
+        columns=['Entity', 'Parent']
+    )
+    structure.to_csv(os.path.join(path, 'entities.csv'), index=False)
+    pairs = rng.integers(0, n_entities, size=(500, 2))
+    eliminations = pd.DataFrame({
+        'Entity': [entities[i] for i in pairs[:, 0]],
+        'Counterparty': [entities[j] for j in pairs[:, 1]],
+        'Account': 'Revenue',
+        **{month: rng.uniform(100, 1_000, len(pairs)).round() for month in MONTHS},
+        'Currency': 'USD'
+    })
+    eliminations.to_csv(os.path.join(path, 'eliminations.csv'), index=False)
+    
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.get_pnl()
+    start = time.perf_counter()
+    analyzer.get_consolidation()
+    print(f"{'build':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    
+    start = time.perf_counter()
+    for i in range(repeats):
+        analyzer.calculate_consolidated_ebitda('Jun 2025', f'R{i % 3}')
+    print(f"{'node lookup':<20}{(time.perf_counter() - start) / repeats * 1e6:>10.1f} µs")
+
+
+def bench_entity_pool(path: str, workers: int = 4):
+    """Consolidated EBITDA and runway from scratch: one process vs entity shards on a pool."""
+    print(f"\n🧪 Entity-sharded aggregation: {workers} workers on {os.cpu_count()} cores")
+    
+    def answer(analyzer):
+        start = time.perf_counter()
+        analyzer.calculate_consolidated_ebitda('Jun 2025')
+        analyzer.calculate_cash_runway()
+        return time.perf_counter() - start
+    
+    parallel = FinancialAnalyzer(FinancialDataLoader(path, backend='mmap'), cache_size=0, workers=workers)
+    answer(parallel)  # start the workers and map the ledger
+    parallel.loader.reload()
+    serial = answer(FinancialAnalyzer(FinancialDataLoader(path, backend='mmap'), cache_size=0))
+    print(f"{'one process':<20}{serial * 1000:>10.1f} ms")
+    print(f"{'entity shards':<20}{answer(parallel) * 1000:>10.1f} ms")
+    parallel.pool.shutdown()
+
+
+def bench_monte_carlo(path: str, latency_budget: float = 1.0):
+    """Seeded Monte Carlo cash runway at 10k and 100k paths against a latency budget."""
+    print(f"\n🧪 Monte Carlo cash runway: 60-month horizon, {latency_budget:.1f} s budget")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.calculate_cash_runway()  # warm caches
+    for paths in (10_000, 100_000):
+        start = time.perf_counter()
+        result = analyzer.simulate_cash_runway(paths=paths, seed=0)
+        elapsed = time.perf_counter() - start
+        status = '✅' if elapsed <= latency_budget else '❌'
+        print(f"{paths:>7,} paths{'':<7}{elapsed * 1000:>10.1f} ms {status}  "
+              f"P10/P50/P90 {result['runway_p10']:.1f}/{result['runway_p50']:.1f}/{result['runway_p90']:.1f} months")
+
+
+def bench_scenarios(path: str, n_scenarios: int = 10_000):
+    """A batch of random FX, growth and OPEX shocks evaluated in one pass."""
+    print(f"\n🧪 What-if scenarios: {n_scenarios:,} driver sets, 60-month horizon")
+    rng = np.random.default_rng(0)
+    drivers = pd.DataFrame({
+        'fx:EUR': rng.uniform(-0.2, 0.2, n_scenarios),
+        'growth:revenue': rng.uniform(-0.05, 0.05, n_scenarios),
+        'change:opex': rng.uniform(-0.1, 0.1, n_scenarios)
+    })
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.run_scenarios([{}])  # build the engine
+    start = time.perf_counter()
+    analyzer.run_scenarios(drivers)
+    elapsed = time.perf_counter() - start
+    print(f"{'batch':<20}{elapsed * 1000:>10.1f} ms")
+    print(f"{'per scenario':<20}{elapsed / n_scenarios * 1e6:>10.1f} µs")
+
+
+def bench_sensitivity_grid(path: str, points: int = 50, loop_cells: int = 100):
+    """A 50x50 runway grid in one batch vs one scenario per cell."""
+    print(f"\n🧪 Sensitivity grid: runway over EUR/USD x burn, {points}x{points}")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    engine = analyzer.get_scenario_engine()
+    rates, burns = engine.axis('rate:EUR', points), engine.axis('burn', points)
+    
+    start = time.perf_counter()
+    analyzer.get_sensitivity_grid('rate:EUR', 'burn', x_values=rates, y_values=burns)
+    batched = time.perf_counter() - start
+    
+    # A sample of cells one call each, scaled up to the whole grid
+    start = time.perf_counter()
+    for i in range(loop_cells):
+        analyzer.run_scenarios([{'rate:EUR': rates[i % points], 'burn': burns[i // points]}])
+    looped = (time.perf_counter() - start) / loop_cells * points * points
+    print(f"{'per-cell calls':<20}{looped * 1000:>10.1f} ms (extrapolated)")
+    print(f"{'one batch':<20}{batched * 1000:>10.1f} ms")
+    print(f"{'speedup':<20}{looped / batched:>10.1f}x")
+
+
+def bench_windows(path: str, repeats: int = 20):
+    """TTM at every month of a 10-year ledger: prefix sums vs summing each window."""
+    months = [p.strftime('%b %Y') for p in pd.period_range('2016-01', '2025-12', freq='M')]
+    print(f"\n🧪 Rolling windows: TTM at each of {len(months)} months")
+    make_ledger(path, n_accounts=100, months=months)
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.get_window_sums()  # warm caches
+    
+    def window_by_window():
+        for end in range(len(months)):
+            analyzer.calculate_ebitda_by_month(months[max(end - 11, 0):end + 1]).sum()
+    
+    for name, query in (('sum each window', window_by_window),
+                        ('prefix sums', lambda: analyzer.get_rolling_metrics(months, 'ttm'))):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            query()
+        print(f"{name:<20}{(time.perf_counter() - start) / repeats * 1000:>10.2f} ms")
+
+
+def bench_period_comparison(path: str, loop_calls: int = 200):
+    """Actual vs budget, prior month and prior year for every account, entity and month."""
+    print("\n🧪 Period comparison: every account x entity x month")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.get_pnl()  # warm caches
+    
+    start = time.perf_counter()
+    table = analyzer.compare_periods(level='account')
+    batched = time.perf_counter() - start
+    comparisons = 3 * len(table)
+    
+    # The one-month dict API, one comparison per call
+    start = time.perf_counter()
+    for i in range(loop_calls):
+        analyzer.get_revenue_vs_budget(MONTHS[i % len(MONTHS)])
+    per_call = (time.perf_counter() - start) / loop_calls
+    print(f"{'comparisons':<20}{comparisons:>10,}")
+    print(f"{'one pass':<20}{batched * 1000:>10.1f} ms")
+    print(f"{'dict API':<20}{per_call * comparisons * 1000:>10.1f} ms (extrapolated)")
+
+
+def bench_variance_bridge(path: str, loop_rows: int = 500):
+    """FX / volume / mix decomposition of every account, entity and month."""
+    print("\n🧪 Variance bridge: every account x entity x month")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    loader = analyzer.loader
+    loader.load_matrix(), loader.load_budget_fx_rates()  # warm caches
+    
+    start = time.perf_counter()
+    table = analyzer.get_variance_decomposition().table
+    batched = time.perf_counter() - start
+    
+    # Row by row: look up both rates and split one key's variance at a time
+    actuals, budget = loader.load_actuals(), loader.load_budget()
+    rates, budget_rates = loader.load_fx_rates(), loader.load_budget_fx_rates()
+    start = time.perf_counter()
+    for i in range(loop_rows):
+        row, plan = actuals.iloc[i], budget.iloc[i]
+        month = MONTHS[i % len(MONTHS)]
+        actual_rate = rates.rate(month, row['Currency'])
+        budget_rate = budget_rates.rate(month, row['Currency'])
+        fx = row[month] * (actual_rate - budget_rate)
+        volume = (row[month] - plan[month]) * budget_rate
+    per_row = (time.perf_counter() - start) / loop_rows
+    print(f"{'key-months':<20}{len(table):>10,}")
+    print(f"{'one pass':<20}{batched * 1000:>10.1f} ms")
+    print(f"{'row loop':<20}{per_row * len(table) * 1000:>10.1f} ms (extrapolated, without mix)")
+
+
+def bench_forecast(path: str, n_series: int = 100_000, n_months: int = 36, horizon: int = 12):
+    """Reforecast 100k monthly series, picking a model per series, then the ledger's accounts."""
+    print(f"\n🧪 Forecasting: {n_series:,} series x {n_months} months, {horizon}-month horizon")
+    rng = np.random.default_rng(0)
+    t = np.arange(n_months)
+    values = (1_000 + rng.uniform(-5, 5, (n_series, 1)) * t
+              + rng.uniform(0, 100, (n_series, 1)) * np.sin(2 * np.pi * t / 12)
+              + rng.normal(0, 20, (n_series, n_months)))
+    values[rng.random(values.shape) < 0.02] = np.nan
+    
+    start = time.perf_counter()
+    _, _, models = forecast_series(values, horizon)
+    elapsed = time.perf_counter() - start
+    names, counts = np.unique(models, return_counts=True)
+    print(f"{'auto model':<20}{elapsed:>10.2f} s")
+    print(f"{'models':<20}{', '.join(f'{n} {c:,}' for n, c in zip(names, counts))}")
+    
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path), cache_size=0)
+    analyzer.get_pnl()  # warm caches
+    start = time.perf_counter()
+    forecast = analyzer.get_forecast('account', horizon)
+    print(f"{'ledger accounts':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms ({len(forecast.keys):,} series)")
+
+
+def bench_anomalies(path: str):
+    """Scan every series for anomalies, then rescan after a one-row correction."""
+    print("\n🧪 Anomaly scan: full ledger vs incremental after a refresh")
+    loader = FinancialDataLoader(path)
+    analyzer = FinancialAnalyzer(loader, cache_size=0)
+    analyzer.get_pnl()  # warm caches
+    
+    start = time.perf_counter()
+    scan = analyzer.get_anomaly_scan()
+    print(f"{'full scan':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms ({len(scan.keys):,} series)")
+    
+    actuals = loader.load_actuals(copy=True)
+    actuals.loc[0, 'Dec 2025'] = actuals.loc[0, 'Dec 2025'] * 10 + 1
+    actuals.to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    
+    loader.refresh()
+    loader.load_matrix()
+    analyzer._usd_values()
+    
+    start = time.perf_counter()
+    scan.update(loader.load_matrix(), analyzer._usd_values(), {('E000', 'Revenue')})
+    print(f"{'incremental':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms (1 series)")
+    
+    start = time.perf_counter()
+    AnomalyScan.from_matrix(loader.load_matrix(), analyzer._usd_values())
+    print(f"{'full rescan':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    
+    print(f"{'top anomaly':<20}{analyzer.find_anomalies('all', limit=1)[['entity', 'account', 'month', 'type']].values.tolist()}")
+
+
+def bench_concurrent_sessions(path: str, sessions: int = 40):
+    """Cold start with many sessions asking at once on one shared analyzer."""
+    print(f"\n🧪 Shared analyzer: {sessions} sessions on a cold start")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path))
+    barrier = threading.Barrier(sessions)
+    
+    def session():
+        barrier.wait()
+        analyzer.get_revenue_vs_budget('Jun 2025')
+        analyzer.calculate_ebitda('Jun 2025')
+    
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"{'all sessions':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    
+    start = time.perf_counter()
+    FinancialAnalyzer(FinancialDataLoader(path)).get_revenue_vs_budget('Jun 2025')
+    print(f"{'one session':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+
+def bench_coalescing(path: str, sessions: int = 40):
+    """Board-pack storm: everyone asks the same question right after a reload."""
+    print(f"\n🧪 Request coalescing: {sessions} identical questions after a reload")
+    analyzer = FinancialAnalyzer(FinancialDataLoader(path))
+    analyzer.get_variance_bridge('Jun 2025', 'ebitda')
+    analyzer.loader.reload()
+    executed = analyzer.cache.flights.executed
+    barrier = threading.Barrier(sessions)
+    
+    def session():
+        barrier.wait()
+        analyzer.get_variance_bridge('Jun 2025', 'ebitda')
+    
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"{'all sessions':<20}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    flights = analyzer.cache.flights.stats()
+    print(f"{'computed':<20}{flights['executed'] - executed:>10}")
+    print(f"{'coalesced':<20}{flights['coalesced']:>10}")
+
+
+def main():
+    """Run all benchmarks."""
+    print("🏦 CFO Copilot Benchmarks")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_ledger(tmp)
+        bench_copy_free_views(path)
+        bench_csv_cache(path)
+        bench_mmap_backend(path)
+        bench_batched_months(os.path.join(tmp, 'three_years'))
+        bench_memoization(path)
+        bench_concurrent_sessions(path)
+        bench_coalescing(path)
+        bench_gl_ingest(tmp)
+        bench_opex_and_runway(os.path.join(tmp, 'wide'))
+        bench_consolidation(os.path.join(tmp, 'group'))
+        bench_entity_pool(os.path.join(tmp, 'group'))
+        bench_monte_carlo(path)
+        bench_scenarios(path)
+        bench_sensitivity_grid(path)
+        bench_windows(os.path.join(tmp, 'decade'))
+        bench_period_comparison(path)
+        bench_variance_bridge(path)
+        bench_forecast(path)
+        bench_anomalies(path)
+        bench_incremental_refresh(path)
+
+
+if __name__ == "__main__":
+    main()
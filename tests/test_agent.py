@@ -98,6 +98,20 @@ class TestFinancialAnalyzer:
         assert not cash.empty
         assert 'Entity' in cash.columns
     
+    def test_load_returns_read_only_view(self):
+        """Test that writes to a loaded table never reach the loader's cache."""
+        original = self.data_loader.load_actuals()['Jun 2025'].sum()
+        
+        view = self.data_loader.load_actuals()
+        with pytest.raises(ValueError):
+            view.loc[0, 'Jun 2025'] = 0
+        view['Jun 2025'] = 0
+        assert self.data_loader.load_actuals()['Jun 2025'].sum() == original
+        
+        mutable = self.data_loader.load_actuals(copy=True)
+        mutable.loc[:, 'Jun 2025'] = 0
+        assert self.data_loader.load_actuals()['Jun 2025'].sum() == original
+    
     def test_revenue_vs_budget(self):
         """Test revenue vs budget calculation."""
         result = self.analyzer.get_revenue_vs_budget('Jun 2025')
@@ -165,6 +179,25 @@ class TestFinancialAnalyzer:
         expected_margin = (result['ebitda'] / result['revenue'] * 100)
         assert abs(result['ebitda_margin'] - expected_margin) < 0.01
     
+    def test_batched_months_match_single_month(self):
+        """Test that the multi-month tables agree with the per-month methods."""
+        months = ['Apr 2025', 'May 2025', 'Jun 2025', 'Jan 2019']
+        
+        ebitda = self.analyzer.calculate_ebitda_by_month(months)
+        assert list(ebitda.index) == months
+        assert ebitda.loc['Jan 2019'].isna().all()
+        for month in months[:3]:
+            single = self.analyzer.calculate_ebitda(month)
+            for column in ebitda.columns:
+                assert abs(ebitda.loc[month, column] - single[column]) < 1e-6
+        
+        revenue = self.analyzer.get_revenue_vs_budget_by_month(['Jun 2025'])
+        assert abs(revenue.loc['Jun 2025', 'variance'] - self.analyzer.get_revenue_vs_budget('Jun 2025')['variance']) < 1e-6
+        
+        opex = self.analyzer.get_opex_breakdown_by_month(['Jun 2025'])
+        single = self.analyzer.get_opex_breakdown('Jun 2025')
+        assert abs(opex.loc['Jun 2025'].sum() - single['total']) < 1e-6
+    
     def test_cash_runway(self):
         """Test cash runway calculation."""
         result = self.analyzer.calculate_cash_runway()
@@ -0,0 +1,119 @@
+"""Tests for ledger-wide anomaly detection."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.anomalies import detect
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+MONTHS = [p.strftime('%b %Y') for p in pd.period_range('2024-07', '2025-06', freq='M')]
+
+
+def ledger():
+    """Steady series, plus a June spike in US travel, a gap in DE rent and a refund month in UK revenue."""
+    rows = [
+        {'Entity': 'US', 'Account': 'Revenue', **{m: 1000.0 + (i % 3) for i, m in enumerate(MONTHS)}, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'Opex:Travel', **{m: 50.0 + (i % 2) for i, m in enumerate(MONTHS)}, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Opex:Rent', **{m: 200.0 for m in MONTHS}, 'Currency': 'USD'},
+        {'Entity': 'UK', 'Account': 'Revenue', **{m: 300.0 for m in MONTHS}, 'Currency': 'USD'},
+    ]
+    rows[1]['Jun 2025'] = 500.0
+    rows[2]['Mar 2025'] = np.nan
+    rows[3]['May 2025'] = -40.0
+    return pd.DataFrame(rows)
+
+
+def write(path, actuals, mtime_ns):
+    actuals.to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    os.utime(os.path.join(path, 'actuals.csv'), ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    write(tmp_path, ledger(), 1_000_000_000)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path), use_cache=False))
+
+
+class TestDetect:
+    """Test cases for the vectorized checks."""
+
+    def test_checks(self):
+        values = np.array([
+            [10.0, 11.0, 10.0, 11.0, 40.0],
+            [10.0, np.nan, 10.0, 10.0, np.nan],
+            [np.nan, 5.0, 5.0, -5.0, 5.0],
+        ])
+        flags = detect(values)
+        assert flags['jump'][0].tolist() == [False, False, False, False, True]
+        assert flags['missing'][1].tolist() == [False, True, False, False, True]
+        assert not flags['missing'][2, 0]
+        assert flags['sign_flip'][2].tolist() == [False, False, False, True, True]
+
+
+class TestFindAnomalies:
+    """Test cases for FinancialAnalyzer.find_anomalies."""
+
+    def test_ranked_list(self, analyzer):
+        table = analyzer.find_anomalies('all')
+        top = table.iloc[0]
+        assert (top['entity'], top['account'], top['month'], top['type']) == ('US', 'Opex:Travel', 'Jun 2025', 'jump')
+        assert top['impact'] == pytest.approx(500 - 50.5, abs=0.1)
+        assert ('DE', 'Opex:Rent', 'Mar 2025', 'missing') in set(
+            table[['entity', 'account', 'month', 'type']].itertuples(index=False, name=None)
+        )
+        flips = table[table['type'] == 'sign_flip']
+        assert set(flips['month']) == {'May 2025', 'Jun 2025'}
+        assert table['impact'].is_monotonic_decreasing
+
+    def test_defaults_to_latest_month(self, analyzer):
+        table = analyzer.find_anomalies()
+        assert set(table['month']) == {'Jun 2025'}
+        assert analyzer.find_anomalies(types=['missing'], month='Mar 2025')['account'].tolist() == ['Opex:Rent']
+
+    def test_cash_ahead_of_actuals(self, tmp_path):
+        write(tmp_path, ledger(), 1_000_000_000)
+        pd.DataFrame([{'Entity': 'US', 'May 2025': 900.0, 'Jun 2025': 800.0, 'Jul 2025': 700.0, 'Currency': 'USD'}]).to_csv(
+            os.path.join(tmp_path, 'cash.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path), use_cache=False))
+        table = analyzer.find_anomalies(limit=None)
+        assert set(table['month']) == {'Jun 2025'}
+        assert 'missing' not in set(table['type'])
+
+    def test_incremental_refresh_matches_full_scan(self, analyzer, tmp_path):
+        analyzer.get_anomaly_scan()
+        edited = ledger()
+        edited.loc[0, 'Jun 2025'] = 5000.0  # US revenue spikes
+        edited.loc[1, 'Jun 2025'] = 51.0  # travel back to normal
+        write(tmp_path, edited, 2_000_000_000)
+        analyzer.loader.refresh()
+
+        # Rescanned on refresh, not on the next query
+        assert analyzer._anomalies_version == analyzer.loader.data_version
+        fresh = FinancialAnalyzer(FinancialDataLoader(str(tmp_path), use_cache=False))
+        columns = ['entity', 'account', 'month', 'type']
+        patched = analyzer.find_anomalies('all', limit=None)
+        expected = fresh.find_anomalies('all', limit=None)
+        assert sorted(patched[columns].itertuples(index=False, name=None)) == \
+            sorted(expected[columns].itertuples(index=False, name=None))
+        assert patched.iloc[0]['account'] == 'Revenue'
+
+
+class TestAnomalyPlanning:
+    """Test cases for planning anomaly questions."""
+
+    def test_plan(self, analyzer):
+        planner = QueryPlanner()
+        plan = planner.create_plan("Anything unusual this month?")
+        assert plan['intent'] == 'anomalies'
+        assert plan['function_calls'][0] == {'function': 'find_anomalies', 'params': {'month': 'Jun 2025', 'limit': 10}}
+        response = planner.format_response(plan, [analyzer.find_anomalies(**plan['function_calls'][0]['params'])])
+        assert 'US Opex:Travel' in response
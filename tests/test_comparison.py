@@ -0,0 +1,96 @@
+"""Tests for period-over-period comparisons."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+MONTHS = [p.strftime('%b %Y') for p in pd.period_range('2024-06', '2025-06', freq='M')]
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Thirteen months of actuals for two entities, budget for Jun 2025 only."""
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', **{m: 100.0 + i for i, m in enumerate(MONTHS)}, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'Opex:Sales', **{m: 10.0 for m in MONTHS}, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Revenue', **{m: 50.0 for m in MONTHS}, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 120.0, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Revenue', 'Jun 2025': 50.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(tmp_path, 'budget.csv'), index=False)
+    pd.DataFrame([{'Month': 'Jun 2025', 'EUR_USD': 1.0}]).to_csv(os.path.join(tmp_path, 'fx.csv'), index=False)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+
+class TestComparePeriods:
+    """Test cases for FinancialAnalyzer.compare_periods."""
+
+    def test_total_pnl(self, analyzer):
+        table = analyzer.compare_periods(['Jun 2025'], lines=['revenue']).iloc[0]
+        assert table['actual'] == pytest.approx(112 + 50)
+        assert table['vs_budget'] == pytest.approx(112 + 50 - 170)
+        assert table['vs_prior_month'] == pytest.approx(1)
+        assert table['prior_year'] == pytest.approx(100 + 50)
+        assert table['vs_prior_year_pct'] == pytest.approx(12 / 150 * 100)
+
+    def test_matches_revenue_vs_budget(self, analyzer):
+        row = analyzer.compare_periods(['Jun 2025'], lines=['revenue']).iloc[0]
+        single = analyzer.get_revenue_vs_budget('Jun 2025')
+        assert row['vs_budget'] == pytest.approx(single['variance'])
+        assert row['vs_budget_pct'] == pytest.approx(single['variance_pct'])
+
+    def test_first_month_has_no_priors(self, analyzer):
+        row = analyzer.compare_periods(['Jun 2024'], entity='US', lines=['revenue']).iloc[0]
+        assert np.isnan(row['prior_month']) and np.isnan(row['prior_year'])
+        assert np.isnan(row['budget'])
+
+    def test_missing_budget_is_not_zero(self, analyzer, tmp_path):
+        pd.DataFrame([{'Entity': 'US', 'Jun 2025': 900.0, 'Jul 2025': 800.0, 'Currency': 'USD'}]).to_csv(
+            os.path.join(tmp_path, 'cash.csv'), index=False)
+        table = analyzer.compare_periods(['Jun 2025']).set_index('line')
+        assert table.loc['revenue', 'budget'] == pytest.approx(170)
+        # Opex has no budget rows, so neither it nor EBITDA is compared with budget
+        assert np.isnan(table.loc['opex', 'budget']) and np.isnan(table.loc['ebitda', 'vs_budget'])
+        # Only lines an entity has actuals for, and no rows for a cash-only month
+        assert set(analyzer.compare_periods(['Jun 2025'], entity='DE')['line']) == {'revenue', 'gross_profit', 'ebitda'}
+        assert analyzer.compare_periods(['Jul 2025']).empty
+
+    def test_account_level(self, analyzer):
+        table = analyzer.compare_periods(level='account')
+        assert set(table.columns[:3]) == {'entity', 'account', 'month'}
+        # One row per (entity, account) and month with actuals; cash falls back to sample data
+        assert len(table[table['account'] != 'Cash']) == 3 * len(MONTHS)
+        sales = table[(table['account'] == 'Opex:Sales') & (table['month'] == 'Jun 2025')].iloc[0]
+        assert sales['vs_prior_year'] == pytest.approx(0)
+
+    def test_unknown_level(self, analyzer):
+        with pytest.raises(ValueError):
+            analyzer.compare_periods(level='department')
+
+
+class TestComparisonPlanning:
+    """Test cases for planning and rendering comparisons."""
+
+    def test_flash_report(self, analyzer):
+        planner = QueryPlanner()
+        plan = planner.create_plan("Give me the flash report for June 2025")
+        assert plan['intent'] == 'comparison'
+        call = plan['function_calls'][0]
+        response = planner.format_response(plan, [analyzer.compare_periods(**call['params'])])
+        assert '| Revenue | $162 |' in response
+        assert '| OPEX | $10 | n/a |' in response
+        assert 'vs Prior Year' in response
+
+    def test_prior_month_query(self):
+        assert QueryPlanner().classify_intent("How did EBITDA do vs prior month?") == 'comparison'
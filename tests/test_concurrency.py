@@ -0,0 +1,188 @@
+"""Tests for sharing one loader and analyzer across threads."""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent import tools
+from agent.concurrency import KeyedLocks, Lazy, SingleFlight, build_once
+from agent.cube import LedgerMatrix
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+THREADS = 16
+
+
+def run_together(func, n=THREADS):
+    """Call func from n threads released at once; returns the results in thread order."""
+    barrier = threading.Barrier(n)
+    results, errors = [None] * n, []
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:  # surfaced in the calling test
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def counting(monkeypatch, owner, name):
+    """Wrap owner.name to count its calls, slowed down so racing callers overlap."""
+    calls = []
+    original = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.05)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, wrapper)
+    return calls
+
+
+def write_actuals(path, revenue, mtime_ns):
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'May 2025': 900.0, 'Jun 2025': revenue, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'COGS', 'May 2025': 300.0, 'Jun 2025': 400.0, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    os.utime(os.path.join(path, 'actuals.csv'), ns=(mtime_ns, mtime_ns))
+
+
+class TestPrimitives:
+    """Test cases for Lazy and build_once."""
+
+    def test_lazy_creates_once(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        lazy = Lazy(factory)
+        assert len(set(map(id, run_together(lazy.get)))) == 1
+        assert len(calls) == 1
+
+    def test_stale_build_is_not_published(self):
+        class Owner:
+            _build_locks = KeyedLocks()
+            _value = None
+            _value_version = None
+
+        owner = Owner()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait()
+            return 'old'
+
+        thread = threading.Thread(target=build_once, args=(owner, 'value', 1, slow))
+        thread.start()
+        started.wait()
+        # Version 2 is published by another route while version 1 is building
+        owner._value, owner._value_version = 'new', 2
+        release.set()
+        thread.join()
+        assert (owner._value, owner._value_version) == ('new', 2)
+
+
+class TestSingleFlight:
+    """Test cases for coalescing identical concurrent calls."""
+
+    def test_one_call_per_key(self):
+        flights = SingleFlight()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return len(calls)
+
+        results = run_together(lambda: flights.do('q', compute))
+        assert [value for value, _ in results] == [1] * THREADS
+        assert sorted(shared for _, shared in results) == [False] + [True] * (THREADS - 1)
+        assert flights.stats() == {'executed': 1, 'coalesced': THREADS - 1, 'in_flight': 0}
+        # Finished flights are not cached
+        assert flights.do('q', compute) == (2, False)
+
+    def test_errors_are_shared_not_kept(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.05)
+            raise KeyError('Jun 2030')
+
+        with pytest.raises(KeyError):
+            run_together(lambda: flights.do('q', fail), n=4)
+        assert flights.coalesced == 3
+        assert flights.do('q', lambda: 'ok') == ('ok', False)
+
+
+class TestSharedAnalyzer:
+    """Test cases for concurrent first loads and refreshes."""
+
+    def test_first_loads_run_once(self, tmp_path, monkeypatch):
+        write_actuals(tmp_path, 1000.0, 1_000_000_000)
+        loader = FinancialDataLoader(str(tmp_path), use_cache=False)
+        analyzer = FinancialAnalyzer(loader, cache_size=0)
+        reads = counting(monkeypatch, loader, '_read_table')
+        builds = counting(monkeypatch, LedgerMatrix, 'from_cube')
+
+        results = run_together(lambda: analyzer.get_revenue_vs_budget('Jun 2025')['actual'])
+        assert results == [1000.0] * THREADS
+        # actuals, budget, fx and cash: one read each
+        assert len(reads) == 4
+        assert len(builds) == 1
+
+    def test_get_analyzer_is_shared(self, monkeypatch):
+        monkeypatch.setattr(tools, '_analyzer', Lazy(lambda: FinancialAnalyzer(FinancialDataLoader())))
+        assert len(set(map(id, run_together(tools.get_analyzer)))) == 1
+
+    def test_queries_during_refresh(self, tmp_path):
+        write_actuals(tmp_path, 1000.0, 1_000_000_000)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path), use_cache=False))
+        analyzer.calculate_ebitda('Jun 2025')
+        stop = threading.Event()
+        seen, errors = set(), []
+
+        def query():
+            while not stop.is_set():
+                try:
+                    seen.add(analyzer.calculate_ebitda('Jun 2025')['revenue'])
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i, revenue in enumerate([1100.0, 1200.0, 1300.0], start=2):
+            write_actuals(tmp_path, revenue, i * 1_000_000_000)
+            analyzer.loader.refresh()
+            time.sleep(0.02)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        # Every answer is one version's, never a mix of two
+        assert seen <= {1000.0, 1100.0, 1200.0, 1300.0}
+        assert analyzer.calculate_ebitda('Jun 2025')['revenue'] == 1300.0
+        assert analyzer.calculate_ebitda('Jun 2025')['ebitda'] == pytest.approx(900.0)
@@ -0,0 +1,94 @@
+"""Tests for entity consolidation and intercompany eliminations."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.consolidation import GROUP, entity_tree
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def write_group(path):
+    """Two US entities under US -> Americas and one German entity under EMEA."""
+    pd.DataFrame([
+        {'Entity': 'US1', 'Account': 'Revenue', 'Jun 2025': 1000.0, 'Currency': 'USD'},
+        {'Entity': 'US1', 'Account': 'Opex:Services', 'Jun 2025': 100.0, 'Currency': 'USD'},
+        {'Entity': 'US2', 'Account': 'Revenue', 'Jun 2025': 500.0, 'Currency': 'USD'},
+        {'Entity': 'DE1', 'Account': 'Revenue', 'Jun 2025': 800.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    pd.DataFrame([{'Month': 'Jun 2025', 'EUR_USD': 1.25}]).to_csv(os.path.join(path, 'fx.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US1', 'Parent': 'US'},
+        {'Entity': 'US2', 'Parent': 'US'},
+        {'Entity': 'US', 'Parent': 'Americas'},
+        {'Entity': 'DE1', 'Parent': 'EMEA'},
+    ]).to_csv(os.path.join(path, 'entities.csv'), index=False)
+    # US1 bought 100 of services from US2; DE1 sold EUR 40 to US1
+    pd.DataFrame([
+        {'Entity': 'US2', 'Counterparty': 'US1', 'Account': 'Revenue', 'Jun 2025': 100.0, 'Currency': 'USD'},
+        {'Entity': 'US1', 'Counterparty': 'US2', 'Account': 'Opex:Services', 'Jun 2025': 100.0, 'Currency': 'USD'},
+        {'Entity': 'DE1', 'Counterparty': 'US1', 'Account': 'Revenue', 'Jun 2025': 40.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(path, 'eliminations.csv'), index=False)
+
+
+class TestEntityTree:
+    """Test cases for building the entity tree."""
+    
+    def test_unlisted_entities_sit_under_group(self):
+        """Test that entities missing from the table hang off the root."""
+        tree = entity_tree(['US1', 'JP1'], pd.DataFrame({'Entity': ['US1'], 'Parent': ['Americas']}))
+        assert tree.ancestors('US1') == ['US1', 'Americas', GROUP]
+        assert tree.ancestors('JP1') == ['JP1', GROUP]
+        assert tree.common_ancestor('US1', 'JP1') == GROUP
+    
+    def test_cycle(self):
+        """Test that a cyclic hierarchy is rejected."""
+        with pytest.raises(ValueError):
+            entity_tree([], pd.DataFrame({'Entity': ['A', 'B'], 'Parent': ['B', 'A']}))
+
+
+class TestConsolidation:
+    """Test cases for consolidated EBITDA by node."""
+    
+    def test_eliminations_at_common_ancestor(self, tmp_path):
+        """Test that intercompany amounts cancel at and above the parties' common node."""
+        write_group(tmp_path)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        
+        # Leaves keep their own books
+        us1 = analyzer.calculate_consolidated_ebitda('Jun 2025', 'US1')
+        assert us1['revenue'] == 1000.0 and us1['opex'] == 100.0
+        
+        # US1/US2 trade cancels within US
+        us = analyzer.calculate_consolidated_ebitda('Jun 2025', 'US')
+        assert us['revenue'] == 1400.0
+        assert us['opex'] == 0.0
+        
+        # DE1's sale to US1 only cancels at the group level, in USD
+        assert analyzer.calculate_consolidated_ebitda('Jun 2025', 'EMEA')['revenue'] == 1000.0
+        group = analyzer.calculate_consolidated_ebitda('Jun 2025')
+        assert group['entity'] == GROUP
+        assert group['revenue'] == 1000.0 + 500.0 + 1000.0 - 100.0 - 50.0
+        
+        with pytest.raises(KeyError):
+            analyzer.calculate_consolidated_ebitda('Jun 2025', 'APAC')
+    
+    def test_refresh_picks_up_new_structure(self, tmp_path):
+        """Test that editing entities.csv moves entities on refresh."""
+        write_group(tmp_path)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        assert analyzer.calculate_consolidated_ebitda('Jun 2025', 'EMEA')['revenue'] == 1000.0
+        
+        pd.DataFrame([
+            {'Entity': 'US1', 'Parent': 'EMEA'},
+            {'Entity': 'US2', 'Parent': 'US'},
+            {'Entity': 'DE1', 'Parent': 'EMEA'},
+        ]).to_csv(os.path.join(tmp_path, 'entities.csv'), index=False)
+        analyzer.loader.refresh()
+        # US1 and DE1 now share EMEA, so their trade cancels there
+        assert analyzer.calculate_consolidated_ebitda('Jun 2025', 'EMEA')['revenue'] == 1000.0 + 1000.0 - 50.0
@@ -0,0 +1,176 @@
+"""Tests for the long-format financial cube."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.cube import CUBE_LEVELS, diff_tables, month_columns, to_period
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def cube_rows(cube):
+    """Cube contents as plain sorted rows, ignoring category order."""
+    rows = cube.frame.reset_index().astype(str)
+    return rows.sort_values(CUBE_LEVELS).reset_index(drop=True)
+
+
+class TestFinancialCube:
+    """Test cases for the FinancialCube class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.loader = FinancialDataLoader("fixtures")
+        self.cube = self.loader.load_cube()
+    
+    def test_month_columns(self):
+        """Test that only month columns are picked from a wide frame."""
+        actuals = self.loader.load_actuals()
+        columns = month_columns(actuals)
+        assert 'Jun 2025' in columns
+        assert 'Entity' not in columns
+        assert 'Currency' not in columns
+    
+    def test_index_and_dtypes(self):
+        """Test the cube index levels and categorical dtypes."""
+        frame = self.cube.frame
+        assert set(frame.index.names) == {'entity', 'account', 'month', 'scenario'}
+        assert isinstance(frame.index.get_level_values('month'), pd.PeriodIndex)
+        assert isinstance(frame['currency'].dtype, pd.CategoricalDtype)
+        assert isinstance(self.cube.periods, pd.PeriodIndex)
+    
+    def test_slice_matches_wide_frame(self):
+        """Test that a cube slice holds the same values as the wide table."""
+        actuals = self.loader.load_actuals()
+        expected = actuals[actuals['Account'] == 'Revenue']['Jun 2025'].sum()
+        
+        rows = self.cube.slice('Jun 2025', 'actual', ['Revenue'])
+        assert rows['value'].sum() == expected
+        
+        cash = self.cube.slice('Jun 2025', 'actual', ['Cash'])
+        assert cash['value'].sum() == self.loader.load_cash()['Jun 2025'].sum()
+    
+    def test_slice_unknown_month(self):
+        """Test that a month missing from a scenario raises KeyError."""
+        with pytest.raises(KeyError):
+            self.cube.slice('Jan 2019', 'actual')
+        assert to_period('Jun 2025') in self.cube.months['budget']
+    
+    def test_cash_ahead_of_actuals(self, tmp_path):
+        """Test that a month with only cash balances is not an actual P&L month."""
+        sample = FinancialDataLoader("missing")
+        for name in ['actuals', 'budget', 'fx']:
+            getattr(sample, f'load_{name}')().to_csv(os.path.join(tmp_path, f'{name}.csv'), index=False)
+        cash = sample.load_cash()
+        cash['Jul 2025'] = cash['Jun 2025'] - 50_000
+        cash.to_csv(os.path.join(tmp_path, 'cash.csv'), index=False)
+        
+        loader = FinancialDataLoader(str(tmp_path), use_cache=False)
+        cube = loader.load_cube()
+        assert to_period('Jul 2025') not in cube.months['actual']
+        assert to_period('Jul 2025') in cube.periods
+        
+        analyzer = FinancialAnalyzer(loader)
+        with pytest.raises(KeyError):
+            analyzer.get_revenue_vs_budget('Jul 2025')
+        with pytest.raises(KeyError):
+            analyzer.get_opex_breakdown('Jul 2025')
+        ebitda = analyzer.calculate_ebitda('Jul 2025')
+        assert ebitda['revenue'] > 0
+        assert 'Jul 2025' in analyzer.calculate_cash_runway()['cash_balances']
+    
+    def test_rebuilt_per_data_version(self):
+        """Test that the cube is cached until the loader reloads."""
+        assert self.loader.load_cube() is self.cube
+        self.loader.reload()
+        assert self.loader.load_cube() is not self.cube
+
+
+class TestIncrementalRefresh:
+    """Test cases for applying fixture edits as deltas."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        sample = FinancialDataLoader("missing")
+        self.actuals = sample.load_actuals(copy=True)
+        self.tables = {
+            'budget': sample.load_budget(),
+            'fx': sample.load_fx(),
+            'cash': sample.load_cash()
+        }
+    
+    def write(self, path, actuals, mtime_ns=None):
+        """Write the fixture tables, optionally forcing the actuals mtime."""
+        actuals.to_csv(os.path.join(path, 'actuals.csv'), index=False)
+        if mtime_ns is not None:
+            os.utime(os.path.join(path, 'actuals.csv'), ns=(mtime_ns, mtime_ns))
+        for name, df in self.tables.items():
+            df.to_csv(os.path.join(path, f'{name}.csv'), index=False)
+    
+    def test_diff_tables(self):
+        """Test that new months and added, changed and deleted rows are found."""
+        edited = self.actuals.drop(index=5)
+        edited.loc[0, 'Jun 2025'] = 1
+        edited['Jul 2025'] = 10
+        
+        delta = diff_tables(self.actuals, edited)
+        assert delta['added_months'] == ['Jul 2025']
+        assert ('US', 'Revenue', 'USD') in delta['changed_rows']
+        assert delta['deleted_rows'] == [('EU', 'COGS', 'EUR')]
+        assert delta['added_rows'] == []
+    
+    def test_refresh_patches_cube(self, tmp_path):
+        """Test that a patched cube matches one built from scratch."""
+        self.write(tmp_path, self.actuals, mtime_ns=1_000_000_000)
+        loader = FinancialDataLoader(str(tmp_path), use_cache=False)
+        loader.load_cube()
+        version = loader.data_version
+        
+        edited = self.actuals.drop(index=5)
+        edited.loc[0, 'Jun 2025'] = 1
+        edited['Jul 2025'] = 10
+        edited = pd.concat([edited, pd.DataFrame([{'Entity': 'UK', 'Account': 'Revenue', 'Jun 2025': 7, 'Currency': 'USD'}])])
+        self.write(tmp_path, edited, mtime_ns=2_000_000_000)
+        
+        deltas = loader.refresh()
+        assert set(deltas) == {'actuals'}
+        assert loader.data_version == version + 1
+        assert loader.table_versions['actuals'] == loader.data_version
+        assert loader.changes_since(version) == [deltas]
+        
+        fresh = FinancialDataLoader(str(tmp_path), use_cache=False).load_cube()
+        patched = loader.load_cube()
+        pd.testing.assert_frame_equal(cube_rows(patched), cube_rows(fresh))
+        assert to_period('Jul 2025') in patched.months['actual']
+    
+    def test_refresh_drops_deleted_labels(self, tmp_path):
+        """Test that a deleted account leaves no trace in the patched cube, ledger or account tree."""
+        self.write(tmp_path, self.actuals, mtime_ns=1_000_000_000)
+        loader = FinancialDataLoader(str(tmp_path), use_cache=False)
+        loader.load_cube()
+        
+        self.write(tmp_path, self.actuals[self.actuals['Account'] != 'Opex:Marketing'], mtime_ns=2_000_000_000)
+        loader.refresh()
+        
+        fresh = FinancialDataLoader(str(tmp_path), use_cache=False)
+        assert loader.load_cube().accounts() == fresh.load_cube().accounts()
+        assert loader.load_matrix().accounts() == fresh.load_matrix().accounts()
+        assert 'Opex:Marketing' not in loader.load_matrix().accounts()
+        assert 'Opex:Marketing' not in loader.load_account_tree()
+    
+    def test_refresh_without_changes(self, tmp_path):
+        """Test that an untouched source leaves the data version alone."""
+        self.write(tmp_path, self.actuals)
+        loader = FinancialDataLoader(str(tmp_path), use_cache=False)
+        loader.load_cube()
+        version = loader.data_version
+        
+        assert loader.refresh() == {}
+        assert loader.data_version == version
+        
+        loader.reload()
+        assert loader.changes_since(version) is None
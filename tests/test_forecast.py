@@ -0,0 +1,111 @@
+"""Tests for the batched forecasting engine."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.forecast import exponential_smoothing, forecast_series, linear_trend, seasonal_naive
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+MONTHS = [p.strftime('%b %Y') for p in pd.period_range('2023-07', '2025-06', freq='M')]
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Two years of revenue growing 10 a month, flat COGS and cash falling 100 a month."""
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', **{m: 1000.0 + 10 * i for i, m in enumerate(MONTHS)}, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'COGS', **{m: 400.0 for m in MONTHS}, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 1200.0, 'Jul 2025': 1200.0, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(tmp_path, 'budget.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US', **{m: 5000.0 - 100 * i for i, m in enumerate(MONTHS[-6:])}, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(tmp_path, 'cash.csv'), index=False)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+
+class TestModels:
+    """Test cases for the vectorized models."""
+
+    def test_linear_trend(self):
+        values = np.array([[1.0, 2.0, np.nan, 4.0, 5.0]])
+        point, sigma = linear_trend(values, 2)
+        assert point[0] == pytest.approx([6.0, 7.0])
+        assert sigma[0] == pytest.approx([0.0, 0.0])
+
+    def test_seasonal_naive(self):
+        values = np.tile(np.arange(12.0), 3)[None, :]
+        point, sigma = seasonal_naive(values, 14)
+        assert point[0] == pytest.approx(list(range(12)) + [0, 1])
+        assert sigma[0] == pytest.approx(0.0)
+
+    def test_exponential_smoothing_intervals_widen(self):
+        rng = np.random.default_rng(0)
+        point, sigma = exponential_smoothing(100 + rng.normal(0, 5, (3, 24)), 6)
+        assert (np.diff(point, axis=1) == 0).all()
+        assert (np.diff(sigma, axis=1) > 0).all()
+
+    def test_auto_picks_per_series(self):
+        t = np.arange(36.0)
+        values = np.vstack([10 * t, 100 * np.sin(2 * np.pi * t / 12)])
+        _, _, models = forecast_series(values, 12)
+        assert list(models) == ['linear_trend', 'seasonal_naive']
+        with pytest.raises(ValueError):
+            forecast_series(values, 12, model='arima')
+
+
+class TestForecasts:
+    """Test cases for the analyzer's forecasts."""
+
+    def test_pnl_lines_add_up(self, analyzer):
+        table = analyzer.forecast_pnl(months=['Jul 2025']).set_index('line')
+        assert list(analyzer.forecast_pnl()['month'].unique())[:2] == ['Jul 2025', 'Aug 2025']
+        assert table.loc['ebitda', 'forecast'] == pytest.approx(
+            table.loc['revenue', 'forecast'] - table.loc['cogs', 'forecast'] - table.loc['opex', 'forecast']
+        )
+        assert table.loc['revenue', 'lower'] <= table.loc['revenue', 'forecast'] <= table.loc['revenue', 'upper']
+
+    def test_answers_after_the_actuals(self, analyzer):
+        result = analyzer.get_revenue_vs_budget('Jul 2025')
+        assert result['forecast']
+        assert result['actual'] == pytest.approx(1240, rel=0.01)
+        assert 'forecast' not in analyzer.get_revenue_vs_budget('Jun 2025')
+        assert analyzer.calculate_ebitda('Aug 2025')['forecast']
+        with pytest.raises(KeyError):
+            analyzer.calculate_ebitda('Jun 2030')
+
+    def test_cash_runway(self, analyzer):
+        result = analyzer.forecast_cash_runway()
+        # 4500 left, falling 100 a month
+        assert result['forecast'][0] == pytest.approx(4400)
+        assert result['runway_months'] == pytest.approx(45)
+        assert result['runway_months'] == pytest.approx(analyzer.calculate_cash_runway()['runway_months'])
+
+    def test_account_level(self, analyzer):
+        table = analyzer.get_forecast('account').select(account='Revenue', month='Jul 2025')
+        assert table['forecast'][0] == pytest.approx(1240, rel=0.01)
+
+
+class TestForecastPlanning:
+    """Test cases for planning forecast questions."""
+
+    def test_plan(self, analyzer):
+        planner = QueryPlanner()
+        plan = planner.create_plan("Forecast EBITDA for the next 6 months")
+        assert plan['intent'] == 'forecast'
+        assert plan['function_calls'][0]['params'] == {'lines': ['ebitda'], 'horizon': 6}
+        response = planner.format_response(plan, [analyzer.forecast_pnl(**plan['function_calls'][0]['params'])])
+        assert 'Jul 2025 to Dec 2025' in response
+
+    def test_cash_forecast_stays_runway(self):
+        assert QueryPlanner().classify_intent("Forecast our cash runway") == 'cash_runway'
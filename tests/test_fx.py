@@ -0,0 +1,74 @@
+"""Tests for the FX rate matrix."""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.fx import FxRates
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+FX_TABLE = pd.DataFrame([
+    {'Month': 'May 2025', 'EUR_USD': 1.12, 'GBP_USD': 1.30, 'USD_JPY': 150.0},
+    {'Month': 'Jun 2025', 'EUR_USD': 1.11, 'GBP_USD': 1.25, 'USD_JPY': 160.0},
+])
+
+
+class TestFxRates:
+    """Test cases for the FxRates class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.rates = FxRates.from_table(FX_TABLE)
+    
+    def test_direct_and_inverse_quotes(self):
+        """Test that XXX_USD is used directly and USD_XXX inverted."""
+        assert self.rates.rate('Jun 2025', 'EUR') == 1.11
+        assert self.rates.rate('May 2025', 'GBP') == 1.30
+        assert abs(self.rates.rate('Jun 2025', 'JPY') - 1 / 160.0) < 1e-12
+        assert self.rates.rate('Jun 2025', 'USD') == 1.0
+    
+    def test_gaps_and_unknown_currencies(self):
+        """Test filling from neighbouring months and unquoted currencies."""
+        assert self.rates.rate('Jul 2025', 'EUR') == 1.11
+        assert self.rates.rate('Apr 2025', 'EUR') == 1.12
+        assert self.rates.rate('Jun 2025', 'CHF') == 1.0
+    
+    def test_matrix_broadcast(self):
+        """Test the (row, month) rate matrix."""
+        matrix = self.rates.matrix(['EUR', 'USD', 'GBP'], ['May 2025', 'Jun 2025'])
+        np.testing.assert_allclose(matrix, [[1.12, 1.11], [1.0, 1.0], [1.30, 1.25]])
+
+
+class TestMultiCurrencyConversion:
+    """Test cases for converting the ledger in several currencies."""
+    
+    def make_analyzer(self, path):
+        """Write a four-currency ledger and return an analyzer over it."""
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', 'May 2025': 100.0, 'Jun 2025': 100.0, 'Currency': 'USD'},
+            {'Entity': 'EU', 'Account': 'Revenue', 'May 2025': 100.0, 'Jun 2025': 100.0, 'Currency': 'EUR'},
+            {'Entity': 'UK', 'Account': 'Revenue', 'May 2025': 100.0, 'Jun 2025': 100.0, 'Currency': 'GBP'},
+            {'Entity': 'JP', 'Account': 'Opex:Sales', 'May 2025': 16000.0, 'Jun 2025': 16000.0, 'Currency': 'JPY'},
+        ]).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+        FX_TABLE.to_csv(os.path.join(path, 'fx.csv'), index=False)
+        return FinancialAnalyzer(FinancialDataLoader(str(path)))
+    
+    def test_convert_all_months(self, tmp_path):
+        """Test converting every month column in one call."""
+        analyzer = self.make_analyzer(tmp_path)
+        usd = analyzer.convert_to_usd(analyzer.loader.load_actuals())
+        assert list(usd['Currency']) == ['USD'] * 4
+        np.testing.assert_allclose(usd['Jun 2025'], [100.0, 111.0, 125.0, 100.0])
+        np.testing.assert_allclose(usd['May 2025'][:3], [100.0, 112.0, 130.0])
+    
+    def test_ebitda_uses_every_currency(self, tmp_path):
+        """Test that analyzer totals convert GBP and JPY as well as EUR."""
+        result = self.make_analyzer(tmp_path).calculate_ebitda('Jun 2025')
+        assert abs(result['revenue'] - 336.0) < 1e-9
+        assert abs(result['opex'] - 100.0) < 1e-9
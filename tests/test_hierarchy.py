@@ -0,0 +1,71 @@
+"""Tests for the account hierarchy and rollups."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.hierarchy import AccountTree
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+DEEP_ACCOUNTS = [
+    ('Revenue', 1000.0),
+    ('Opex:Sales:Travel:Air', 40.0),
+    ('Opex:Sales:Travel:Hotel', 25.0),
+    ('Opex:Sales:Commissions', 100.0),
+    ('Opex:Marketing', 60.0),
+]
+
+
+class TestAccountTree:
+    """Test cases for the AccountTree class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tree = AccountTree([account for account, _ in DEEP_ACCOUNTS])
+    
+    def test_structure(self):
+        """Test that intermediate levels become nodes."""
+        assert 'Opex:Sales:Travel' in self.tree
+        assert self.tree.children('Opex') == ['Opex:Marketing', 'Opex:Sales']
+        assert self.tree.children('Opex:Sales:Travel') == ['Opex:Sales:Travel:Air', 'Opex:Sales:Travel:Hotel']
+        with pytest.raises(KeyError):
+            self.tree.node('Opex:Rent')
+    
+    def test_rollup(self):
+        """Test that subtree totals add up every level."""
+        own = np.zeros(len(self.tree))
+        for account, amount in DEEP_ACCOUNTS:
+            own[self.tree.node(account)] = amount
+        totals = self.tree.rollup(own)
+        assert totals[self.tree.node('Opex:Sales:Travel')] == 65.0
+        assert totals[self.tree.node('Opex:Sales')] == 165.0
+        assert totals[self.tree.node('Opex')] == 225.0
+
+
+class TestDrillDown:
+    """Test cases for OPEX breakdown at any depth."""
+    
+    def test_breakdown_levels(self, tmp_path):
+        """Test category totals at the top level and one level down."""
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': account, 'Jun 2025': amount, 'Currency': 'USD'}
+            for account, amount in DEEP_ACCOUNTS
+        ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        
+        result = analyzer.get_opex_breakdown('Jun 2025')
+        assert result['breakdown'] == {'Marketing': 60.0, 'Sales': 165.0}
+        assert result['total'] == 225.0
+        
+        result = analyzer.get_opex_breakdown('Jun 2025', parent='Opex:Sales')
+        assert result['breakdown'] == {'Commissions': 100.0, 'Travel': 65.0}
+        
+        # The P&L rolls deep accounts up to their top-level category
+        assert analyzer.get_pnl().row('Jun 2025')['opex:Sales'] == 165.0
@@ -0,0 +1,65 @@
+"""Tests for streaming general-ledger ingestion."""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.ingest import ingest_gl, format_report
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def write_gl(path):
+    """Write a small journal-line export and return its path."""
+    lines = pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Currency': 'USD', 'Date': '2025-05-03', 'Amount': 600000},
+        {'Entity': 'US', 'Account': 'Revenue', 'Currency': 'USD', 'Date': '2025-05-28', 'Amount': 800000},
+        {'Entity': 'US', 'Account': 'COGS', 'Currency': 'USD', 'Date': '2025-05-28', 'Amount': 560000},
+        {'Entity': 'US', 'Account': 'Revenue', 'Currency': 'USD', 'Date': '2025-06-02', 'Amount': 1000000},
+        {'Entity': 'EU', 'Account': 'Revenue', 'Currency': 'EUR', 'Date': '2025-06-15', 'Amount': 900000},
+        {'Entity': 'US', 'Account': 'Revenue', 'Currency': 'USD', 'Date': '2025-06-30', 'Amount': 450000},
+        {'Entity': 'US', 'Account': 'Opex:Sales', 'Currency': 'USD', 'Date': '2025-06-30', 'Amount': 145000},
+    ])
+    gl_path = os.path.join(path, 'gl.csv')
+    lines.to_csv(gl_path, index=False)
+    return gl_path
+
+
+class TestIngestGL:
+    """Test cases for ingest_gl."""
+    
+    def test_chunks_aggregate_to_monthly_ledger(self, tmp_path):
+        """Test that totals do not depend on the chunk size."""
+        gl_path = write_gl(tmp_path)
+        ledger, report = ingest_gl(gl_path, chunksize=2)
+        whole, _ = ingest_gl(gl_path, chunksize=100)
+        
+        pd.testing.assert_frame_equal(ledger, whole)
+        assert list(ledger.columns) == ['Entity', 'Account', 'May 2025', 'Jun 2025', 'Currency']
+        
+        us_revenue = ledger[(ledger['Entity'] == 'US') & (ledger['Account'] == 'Revenue')].iloc[0]
+        assert us_revenue['May 2025'] == 1400000
+        assert us_revenue['Jun 2025'] == 1450000
+    
+    def test_report(self, tmp_path):
+        """Test the ingestion report fields."""
+        _, report = ingest_gl(write_gl(tmp_path), chunksize=3)
+        assert report['rows'] == 7
+        assert report['series'] == 4
+        assert report['rows_per_sec'] > 0
+        if report['peak_rss_mb'] is not None:
+            assert 0 <= report['rss_increase_mb'] <= report['peak_rss_mb']
+        assert 'rows/sec' in format_report(report)
+    
+    def test_loader_ingest(self, tmp_path):
+        """Test that ingested actuals feed the analyzer."""
+        loader = FinancialDataLoader(str(tmp_path))
+        analyzer = FinancialAnalyzer(loader)
+        version = loader.data_version
+        
+        loader.ingest_gl(write_gl(tmp_path), chunksize=2)
+        assert loader.data_version > version
+        assert analyzer.calculate_ebitda('Jun 2025')['opex'] == 145000
@@ -0,0 +1,109 @@
+"""Tests for memoization of analyzer results."""
+
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.memo import AnalysisCache
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+class TestAnalysisCache:
+    """Test cases for the AnalysisCache class."""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = AnalysisCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == (True, 1)
+        cache.put('c', 3)
+        assert cache.get('b') == (False, None)
+        assert cache.get('a') == (True, 1)
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+
+
+class TestMemoizedAnalyzer:
+    """Test cases for memoized FinancialAnalyzer queries."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = FinancialAnalyzer(FinancialDataLoader("fixtures"))
+    
+    def test_repeated_question_hits(self):
+        """Test that positional and keyword calls share one entry."""
+        first = self.analyzer.get_revenue_vs_budget('Jun 2025')
+        second = self.analyzer.get_revenue_vs_budget(month='Jun 2025')
+        assert first == second
+        stats = self.analyzer.cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+    
+    def test_results_are_copies(self):
+        """Test that changing a returned result does not change the cache."""
+        self.analyzer.get_opex_breakdown('Jun 2025')['breakdown'].clear()
+        assert self.analyzer.get_opex_breakdown('Jun 2025')['breakdown']
+    
+    def test_frame_results_are_copies(self):
+        """Test that writing into a returned frame does not change the cache."""
+        months = ['May 2025', 'Jun 2025']
+        expected = self.analyzer.get_gross_margin_by_month(months).copy()
+        result = self.analyzer.get_gross_margin_by_month(months)
+        result.iloc[0, 0] = -1
+        pd.testing.assert_frame_equal(self.analyzer.get_gross_margin_by_month(months), expected)
+    
+    def test_invalidation(self, tmp_path):
+        """Test that data changes and explicit invalidation both miss."""
+        def write(revenue):
+            pd.DataFrame([
+                {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': revenue, 'Currency': 'USD'},
+            ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        
+        write(100.0)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        assert analyzer.calculate_ebitda('Jun 2025')['revenue'] == 100.0
+        
+        write(250.0)
+        analyzer.loader.refresh()
+        assert analyzer.calculate_ebitda('Jun 2025')['revenue'] == 250.0
+        
+        analyzer.cache.invalidate()
+        assert len(analyzer.cache) == 0
+        analyzer.calculate_ebitda('Jun 2025')
+        assert analyzer.cache.stats()['hits'] == 0
+    
+    def test_concurrent_misses_coalesce(self, monkeypatch):
+        """Test that identical questions asked at once are computed once."""
+        calls = []
+        get_pnl = self.analyzer.get_pnl
+        
+        def slow_pnl():
+            calls.append(1)
+            time.sleep(0.1)
+            return get_pnl()
+        
+        monkeypatch.setattr(self.analyzer, 'get_pnl', slow_pnl)
+        barrier = threading.Barrier(8)
+        results = []
+        
+        def ask():
+            barrier.wait()
+            results.append(self.analyzer.calculate_ebitda('Jun 2025'))
+        
+        threads = [threading.Thread(target=ask) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(calls) == 1
+        assert all(result == results[0] for result in results)
+        assert results[0] is not results[1]  # each caller still gets its own copy
+        assert self.analyzer.cache.stats()['coalesced'] == 7
@@ -0,0 +1,92 @@
+"""Tests for entity-sharded aggregation across a process pool."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.parallel import SharedValues, shard_rows
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+MONTHS = ['Apr 2025', 'May 2025', 'Jun 2025']
+
+
+def write_group(path, n_entities: int = 9):
+    """Entities with different OPEX categories and currencies, a group tree and an elimination."""
+    rng = np.random.default_rng(0)
+    rows, cash = [], []
+    for j in range(n_entities):
+        entity, currency = f'E{j}', 'EUR' if j % 3 == 0 else 'USD'
+        for account in ['Revenue', 'COGS', f'Opex:Team{j % 4}']:
+            rows.append({'Entity': entity, 'Account': account,
+                         **dict(zip(MONTHS, rng.uniform(100, 1_000, 3).round())), 'Currency': currency})
+        cash.append({'Entity': entity, **dict(zip(MONTHS, [9_000.0, 8_500.0, 8_000.0 - j])), 'Currency': currency})
+    pd.DataFrame(rows).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    pd.DataFrame(rows[:6]).to_csv(os.path.join(path, 'budget.csv'), index=False)
+    pd.DataFrame(cash).to_csv(os.path.join(path, 'cash.csv'), index=False)
+    pd.DataFrame({'Month': MONTHS, 'EUR_USD': [1.10, 1.12, 1.15]}).to_csv(os.path.join(path, 'fx.csv'), index=False)
+    pd.DataFrame({'Entity': [f'E{j}' for j in range(n_entities)], 'Parent': 'Group'}).to_csv(
+        os.path.join(path, 'entities.csv'), index=False)
+    pd.DataFrame([{'Entity': 'E1', 'Counterparty': 'E2', 'Account': 'Revenue', 'Jun 2025': 50.0, 'Currency': 'USD'}]).to_csv(
+        os.path.join(path, 'eliminations.csv'), index=False)
+
+
+@pytest.fixture(scope='module')
+def analyzers(tmp_path_factory):
+    path = tmp_path_factory.mktemp('group')
+    write_group(path)
+    serial = FinancialAnalyzer(FinancialDataLoader(str(path)))
+    parallel = FinancialAnalyzer(FinancialDataLoader(str(path), backend='mmap'), workers=2)
+    yield serial, parallel
+    parallel.pool.shutdown()
+
+
+class TestSharding:
+    """Test cases for splitting the ledger by entity."""
+
+    def test_whole_entities_balanced(self, analyzers):
+        matrix = analyzers[0].loader.load_matrix()
+        shards = shard_rows(matrix, 4)
+        entities = [set(matrix.rows['entity'].astype(str).to_numpy()[s]) for s in shards]
+        assert len(shards) == 4
+        assert sum(len(s) for s in shards) == len(matrix.rows)
+        assert all(not a & b for i, a in enumerate(entities) for b in entities[i + 1:])
+        assert max(map(len, shards)) - min(map(len, shards)) <= 8
+
+    @pytest.mark.parametrize('mapped', [False, True])
+    def test_shared_values(self, tmp_path, mapped):
+        values = np.arange(12.0).reshape(4, 3)
+        if mapped:
+            np.save(tmp_path / 'values.npy', values)
+            values = np.load(tmp_path / 'values.npy', mmap_mode='r')
+        shared = SharedValues(values)
+        try:
+            assert (shared.rows(np.array([1, 3])) == np.asarray(values)[[1, 3]]).all()
+            assert (shared.path is not None) == mapped
+        finally:
+            shared.close()
+
+
+class TestParallelAnalyzer:
+    """Test cases for answers computed across the process pool."""
+
+    def test_pnl_matches_serial(self, analyzers):
+        serial, parallel = analyzers
+        expected, actual = serial.get_pnl().frame, parallel.get_pnl().frame
+        assert actual.index.equals(expected.index)
+        assert list(actual.columns) == list(expected.columns)
+        assert np.allclose(actual.to_numpy(), expected.to_numpy())
+
+    def test_consolidated_ebitda_and_runway(self, analyzers):
+        serial, parallel = analyzers
+        assert parallel.calculate_consolidated_ebitda('Jun 2025', 'Group')['ebitda'] == pytest.approx(
+            serial.calculate_consolidated_ebitda('Jun 2025', 'Group')['ebitda'])
+        assert parallel.calculate_cash_runway()['runway_months'] == pytest.approx(
+            serial.calculate_cash_runway()['runway_months'])
+        assert parallel.get_revenue_vs_budget('Jun 2025') == pytest.approx(serial.get_revenue_vs_budget('Jun 2025'))
@@ -0,0 +1,96 @@
+"""Tests for the multi-year fiscal calendar."""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+
+from agent.periods import FiscalCalendar
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+FIVE_YEARS = pd.period_range('2021-01', '2025-12', freq='M')
+
+
+class TestFiscalCalendar:
+    """Test cases for the FiscalCalendar class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calendar = FiscalCalendar(FIVE_YEARS, fiscal_year_start=7)
+
+    def test_positions_across_years(self):
+        """Test month lookups over five years of history."""
+        assert len(self.calendar) == 60
+        assert self.calendar.position('Jan 2021') == 0
+        assert self.calendar.position('Jun 2024') == 41
+        assert self.calendar.position('Jun 2025') == 53
+        assert self.calendar.labels[-1] == 'Dec 2025'
+        assert 'Jun 2020' not in self.calendar
+        with pytest.raises(KeyError):
+            self.calendar.position('Jun 2020')
+
+    def test_fiscal_year_offset(self):
+        """Test that a July start names the fiscal year by its closing year."""
+        assert self.calendar.fiscal_year('Jun 2025') == 2025
+        assert self.calendar.fiscal_year('Jul 2025') == 2026
+        assert FiscalCalendar(FIVE_YEARS).fiscal_year('Jul 2025') == 2025
+
+    def test_range_slices(self):
+        """Test last N months, YTD and QTD as slices of the axis."""
+        last_12 = self.calendar.last_n(12, 'Mar 2025')
+        assert [str(p) for p in last_12[[0, -1]]] == ['2024-04', '2025-03']
+        assert len(self.calendar.ytd('Mar 2025')) == 9  # Jul 2024 - Mar 2025
+        assert [str(p) for p in self.calendar.qtd('Mar 2025')] == ['2025-01', '2025-02', '2025-03']
+        assert len(FiscalCalendar(FIVE_YEARS).ytd('Mar 2025')) == 3
+        # Clipped to the months the axis actually holds
+        assert len(self.calendar.last_n(12, 'Mar 2021')) == 3
+
+
+class TestMultiYearData:
+    """Test cases for ledgers and queries spanning more than one year."""
+
+    def test_monthly_columns_follow_the_data(self, tmp_path):
+        """Test that month columns come from the data rather than a fixed year."""
+        months = ['Nov 2024', 'Dec 2024', 'Jan 2025']
+        table = pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', **dict.fromkeys(months, 100.0), 'Currency': 'USD'},
+        ])
+        for name in ('actuals', 'budget', 'cash'):
+            table.to_csv(os.path.join(tmp_path, f'{name}.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        assert analyzer.get_monthly_columns() == months
+
+    def test_planner_years(self):
+        """Test explicit years and ranges that cross a year boundary."""
+        planner = QueryPlanner()
+        assert planner.extract_month("Revenue vs budget June 2024") == "Jun 2024"
+        assert planner.extract_month("EBITDA for dec '23") == "Dec 2023"
+        assert planner.extract_month("Revenue for jun/24") == "Jun 2024"
+        assert planner.extract_month("jun 30 revenue") == "Jun 2025"  # a day, not 2030
+        assert planner.extract_month("Show gross margin") == "Jun 2025"  # 'mar' inside a word
+        months = planner.extract_months_range("Gross margin trend last 12 months")
+        assert months[0] == "Jul 2024" and months[-1] == "Jun 2025"
+    
+    def test_planner_follows_the_data(self, tmp_path):
+        """Test that "this month" is the latest month with actuals, not a fixed date."""
+        months = ['Nov 2025', 'Dec 2025', 'Feb 2026']
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', **dict.fromkeys(months, 100.0), 'Currency': 'USD'},
+        ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', **dict.fromkeys(months + ['Dec 2026'], 90.0), 'Currency': 'USD'},
+        ]).to_csv(os.path.join(tmp_path, 'budget.csv'), index=False)
+        planner = QueryPlanner(loader=FinancialDataLoader(str(tmp_path), fiscal_year_start=12))
+        
+        assert planner.extract_month("Revenue vs budget this month") == "Feb 2026"
+        assert planner.extract_month("Revenue for January") == "Jan 2026"
+        # Ranges are slices of the months with actuals
+        assert planner.extract_months_range("Revenue trend last 3 months") == ["Dec 2025", "Feb 2026"]
+        assert planner.extract_months_range("Revenue YTD") == ["Dec 2025", "Feb 2026"]
+        assert QueryPlanner("Dec 2025", loader=planner.loader).extract_months_range("last 2 months") == ["Nov 2025", "Dec 2025"]
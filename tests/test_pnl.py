@@ -0,0 +1,61 @@
+"""Tests for the materialized P&L summary."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.pnl import classify_account
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+class TestPnLSummary:
+    """Test cases for the PnLSummary class."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = FinancialAnalyzer(FinancialDataLoader("fixtures"))
+        self.pnl = self.analyzer.get_pnl()
+    
+    def test_classify_account(self):
+        """Test the account to P&L line mapping."""
+        assert classify_account('Revenue') == 'revenue'
+        assert classify_account('COGS') == 'cogs'
+        assert classify_account('Opex:Sales') == 'opex:Sales'
+        assert classify_account('Cash') is None
+    
+    def test_total_is_sum_of_entities(self):
+        """Test that the total row adds up the entity rows."""
+        total = self.pnl.row('Jun 2025')
+        entities = [self.pnl.row('Jun 2025', entity=e) for e in self.pnl.entities()]
+        for column in ('revenue', 'cogs', 'opex', 'ebitda'):
+            assert abs(total[column] - sum(e[column] for e in entities)) < 1e-6
+        assert abs(total['ebitda'] - (total['revenue'] - total['cogs'] - total['opex'])) < 1e-6
+    
+    def test_unknown_month(self):
+        """Test that a month missing from a scenario raises KeyError."""
+        with pytest.raises(KeyError):
+            self.pnl.row('Jan 2019')
+        assert self.pnl.rows(['Jan 2019'])['revenue'].isna().all()
+    
+    def test_rebuilt_only_when_data_changes(self, tmp_path):
+        """Test that the summary is reused until the loader's data version moves."""
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 100.0, 'Currency': 'USD'},
+        ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        
+        pnl = analyzer.get_pnl()
+        assert analyzer.get_pnl() is pnl
+        assert analyzer.calculate_ebitda('Jun 2025')['revenue'] == 100.0
+        
+        pd.DataFrame([
+            {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 250.0, 'Currency': 'USD'},
+        ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        analyzer.loader.refresh()
+        assert analyzer.get_pnl() is not pnl
+        assert analyzer.calculate_ebitda('Jun 2025')['revenue'] == 250.0
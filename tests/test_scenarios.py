@@ -0,0 +1,126 @@
+"""Tests for the what-if scenario engine."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def write_ledger(path):
+    """One USD and one EUR entity, with three months of USD cash."""
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 1000.0, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'COGS', 'Jun 2025': 400.0, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'Opex:Sales', 'Jun 2025': 300.0, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Revenue', 'Jun 2025': 500.0, 'Currency': 'EUR'},
+        {'Entity': 'DE', 'Account': 'Opex:Admin', 'Jun 2025': 200.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US', 'Apr 2025': 5000.0, 'May 2025': 4900.0, 'Jun 2025': 4800.0, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(path, 'cash.csv'), index=False)
+    pd.DataFrame([{'Month': 'Jun 2025', 'EUR_USD': 1.2}]).to_csv(os.path.join(path, 'fx.csv'), index=False)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    write_ledger(tmp_path)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+
+class TestRunScenarios:
+    """Test cases for FinancialAnalyzer.run_scenarios."""
+
+    def test_baseline_matches_analyzer(self, analyzer):
+        baseline = analyzer.run_scenarios([{}]).iloc[0]
+        ebitda = analyzer.calculate_ebitda('Jun 2025')
+        runway = analyzer.calculate_cash_runway()
+        assert baseline['ebitda'] == pytest.approx(ebitda['ebitda'])
+        assert baseline['ebitda_margin'] == pytest.approx(ebitda['ebitda_margin'])
+        assert baseline['current_cash_usd'] == pytest.approx(runway['current_cash_usd'])
+        assert baseline['runway_months'] == pytest.approx(runway['runway_months'])
+
+    def test_fx_shock(self, analyzer):
+        table = analyzer.run_scenarios([{}, {'fx:EUR': -0.10}])
+        # EUR revenue 500 and opex 200 at 1.2, 10% lower
+        assert table['ebitda'][1] - table['ebitda'][0] == pytest.approx(-0.10 * 1.2 * (500 - 200))
+        assert table['current_cash_usd'][1] == table['current_cash_usd'][0]
+
+    def test_opex_change_moves_burn(self, analyzer):
+        table = analyzer.run_scenarios([{'change:opex': 0.10}, {'change:opex:Sales': -1.0}])
+        assert table['opex'][0] == pytest.approx(1.1 * (300 + 200 * 1.2))
+        assert table['opex'][1] == pytest.approx(200 * 1.2)
+        # Burn of 100 a month, plus the extra opex; 4800 of cash
+        assert table['monthly_burn_usd'][0] == pytest.approx(100 + 0.1 * 540)
+        assert table['runway_months'][0] == pytest.approx(4800 / 154)
+
+    def test_growth_compounds(self, analyzer):
+        table = analyzer.run_scenarios([{'growth:revenue': 0.03}])
+        assert table['revenue'][0] == pytest.approx(1.03 * (1000 + 500 * 1.2))
+
+    def test_many_scenarios_at_once(self, analyzer):
+        drivers = pd.DataFrame({'fx:EUR': [i / 1000 for i in range(-100, 100)]})
+        table = analyzer.run_scenarios(drivers)
+        assert len(table) == 200
+        assert table['ebitda'].is_monotonic_increasing
+
+    def test_unknown_driver(self, analyzer):
+        with pytest.raises(ValueError):
+            analyzer.run_scenarios([{'change:opex:Travel': 0.1}])
+
+    def test_unknown_currency(self, analyzer):
+        for driver in ('fx:eur', 'fx:EURO', 'rate:GBP'):
+            with pytest.raises(ValueError):
+                analyzer.run_scenarios([{driver: 0.1}])
+
+
+class TestSensitivityGrid:
+    """Test cases for FinancialAnalyzer.get_sensitivity_grid."""
+
+    def test_grid_matches_single_scenarios(self, analyzer):
+        grid = analyzer.get_sensitivity_grid('rate:EUR', 'burn', x_values=[1.0, 1.2, 1.4], y_values=[50.0, 100.0])
+        assert grid.shape == (2, 3)
+        assert list(grid.columns) == [1.0, 1.2, 1.4]
+        single = analyzer.run_scenarios([{'rate:EUR': 1.4, 'burn': 50.0}])['runway_months'][0]
+        assert grid.loc[50.0, 1.4] == pytest.approx(single)
+        # Base rate and burn reproduce calculate_cash_runway
+        assert grid.loc[100.0, 1.2] == pytest.approx(analyzer.calculate_cash_runway()['runway_months'])
+
+    def test_default_axes(self, analyzer):
+        grid = analyzer.get_sensitivity_grid('growth:revenue', 'cogs_ratio', metric='ebitda_margin', points=5)
+        assert grid.shape == (5, 5)
+        # Margin falls as the COGS ratio rises
+        assert (grid.diff().iloc[1:] < 0).all().all()
+        assert grid.index[2] == pytest.approx(400 / 1600)
+
+    def test_cogs_ratio(self, analyzer):
+        table = analyzer.run_scenarios([{'cogs_ratio': 0.5}])
+        assert table['cogs'][0] == pytest.approx(0.5 * table['revenue'][0])
+
+
+class TestScenarioPlanning:
+    """Test cases for planning what-if questions."""
+
+    def test_extract_drivers(self):
+        planner = QueryPlanner()
+        drivers = planner.extract_drivers("What if EUR drops 10% and revenue grows 3% MoM?")
+        assert drivers == {'fx:EUR': pytest.approx(-0.10), 'growth:revenue': pytest.approx(0.03)}
+        assert planner.extract_drivers("what if opex is cut by 5%") == {'change:opex': pytest.approx(-0.05)}
+
+    def test_plan(self):
+        plan = QueryPlanner().create_plan("What if EUR drops 10%?")
+        assert plan['intent'] == 'scenario'
+        assert plan['function_calls'][0]['params']['drivers'] == [{}, {'fx:EUR': pytest.approx(-0.10)}]
+
+    def test_sensitivity_plan(self):
+        planner = QueryPlanner()
+        params = planner.create_plan("Runway sensitivity to GBP and burn")['function_calls'][0]['params']
+        assert (params['x'], params['y'], params['metric']) == ('rate:GBP', 'burn', 'runway_months')
+        params = planner.create_plan("EBITDA margin heatmap by growth and COGS ratio")['function_calls'][0]['params']
+        assert (params['x'], params['y'], params['metric']) == ('growth:revenue', 'cogs_ratio', 'ebitda_margin')
@@ -0,0 +1,88 @@
+"""Tests for the Monte Carlo cash runway simulation."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.planner import QueryPlanner
+from agent.simulation import burn_statistics, simulate_runway
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def run(cash, burn_mean, burn_std=0.0, fx_vol=0.0, **kwargs):
+    """Single-currency USD simulation."""
+    return simulate_runway(np.array([cash]), np.array([burn_mean]), np.array([burn_std]),
+                           np.array([1.0]), np.array([fx_vol]), **kwargs)
+
+
+class TestSimulateRunway:
+    """Test cases for simulate_runway."""
+
+    def test_deterministic_burn(self):
+        """Without volatility every path runs out at cash / burn."""
+        result = run(100.0, 30.0, paths=50, horizon=12)
+        assert result['runway_p10'] == pytest.approx(100 / 30)
+        assert result['runway_p90'] == pytest.approx(100 / 30)
+        assert result['prob_out_of_cash'] == 1.0
+        assert result['fan']['p50'][:3] == pytest.approx([70.0, 40.0, 10.0])
+
+    def test_growing_cash_never_runs_out(self):
+        result = run(100.0, -10.0, paths=50, horizon=12)
+        assert result['runway_p50'] == float('inf')
+        assert result['prob_out_of_cash'] == 0.0
+
+    def test_seeded_runs_are_reproducible(self):
+        first = run(1000.0, 50.0, burn_std=40.0, fx_vol=0.05, paths=500, seed=7)
+        second = run(1000.0, 50.0, burn_std=40.0, fx_vol=0.05, paths=500, seed=7)
+        assert first['runway_p50'] == second['runway_p50']
+        np.testing.assert_array_equal(first['fan']['p10'], second['fan']['p10'])
+
+    def test_percentiles_are_ordered(self):
+        result = run(1000.0, 50.0, burn_std=40.0, fx_vol=0.05, paths=2000, seed=1)
+        assert result['runway_p10'] <= result['runway_p50'] <= result['runway_p90']
+        assert np.all(result['fan']['p10'] <= result['fan']['p50'])
+        assert np.all(result['fan']['p50'] <= result['fan']['p90'])
+
+    def test_burn_statistics(self):
+        mean, std = burn_statistics(np.array([[100.0, 90.0, 70.0]]))
+        assert mean[0] == pytest.approx(15.0)
+        assert std[0] == pytest.approx(np.std([10.0, 20.0], ddof=1))
+
+
+class TestSimulateCashRunway:
+    """Test cases for FinancialAnalyzer.simulate_cash_runway."""
+
+    def test_multi_currency_cash(self, tmp_path):
+        pd.DataFrame([
+            {'Entity': 'US', 'Jan 2025': 1000.0, 'Feb 2025': 900.0, 'Mar 2025': 800.0, 'Currency': 'USD'},
+            {'Entity': 'DE', 'Jan 2025': 500.0, 'Feb 2025': 500.0, 'Mar 2025': 500.0, 'Currency': 'EUR'},
+        ]).to_csv(os.path.join(tmp_path, 'cash.csv'), index=False)
+        pd.DataFrame([
+            {'Month': 'Jan 2025', 'EUR_USD': 1.0},
+            {'Month': 'Feb 2025', 'EUR_USD': 1.0},
+            {'Month': 'Mar 2025', 'EUR_USD': 1.2},
+        ]).to_csv(os.path.join(tmp_path, 'fx.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+        result = analyzer.simulate_cash_runway(paths=1000, horizon=24, seed=0)
+
+        assert result['current_cash_usd'] == pytest.approx(800 + 500 * 1.2)
+        assert result['fan']['months'][:2] == ['Apr 2025', 'May 2025']
+        assert len(result['fan']['p50']) == 24
+        # Only the USD balance burns, 100 a month, against 1400 of total cash
+        assert result['runway_p50'] == pytest.approx(14.0, rel=0.1)
+
+    def test_planner_adds_simulation(self):
+        planner = QueryPlanner()
+        plan = planner.create_plan("What is our cash runway P10 and P90?")
+        assert [c['function'] for c in plan['function_calls']] == [
+            'calculate_cash_runway', 'forecast_cash_runway', 'simulate_cash_runway'
+        ]
+        plan = planner.create_plan("What is our cash runway right now?")
+        assert [c['function'] for c in plan['function_calls']] == ['calculate_cash_runway', 'forecast_cash_runway']
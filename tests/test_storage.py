@@ -0,0 +1,154 @@
+"""Tests for the binary fixture cache."""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent import storage
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def write_actuals(path, june_revenue=1450000):
+    """Write a small actuals.csv and return its path."""
+    df = pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': june_revenue, 'Currency': 'USD'},
+        {'Entity': 'EU', 'Account': 'COGS', 'Jun 2025': 360000.5, 'Currency': 'EUR'},
+    ])
+    csv_path = os.path.join(path, 'actuals.csv')
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+
+class TestReadCsvCached:
+    """Test cases for read_csv_cached."""
+    
+    def test_cache_written_and_reused(self, tmp_path, monkeypatch):
+        """Test that the second read is served from the cache with dtypes intact."""
+        csv_path = write_actuals(tmp_path)
+        cache_dir = os.path.join(tmp_path, '.cache')
+        
+        first = storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        assert os.path.exists(os.path.join(cache_dir, 'actuals.npz'))
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV should not be parsed again")
+        monkeypatch.setattr(storage.pd, 'read_csv', fail)
+        
+        second = storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_cache_invalidated_when_source_changes(self, tmp_path):
+        """Test that a rewritten CSV is parsed again."""
+        csv_path = write_actuals(tmp_path)
+        cache_dir = os.path.join(tmp_path, '.cache')
+        storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        
+        write_actuals(tmp_path, june_revenue=1500000123)
+        os.utime(csv_path, ns=(0, os.stat(csv_path).st_mtime_ns + 1_000_000))
+        
+        df = storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        assert df['Jun 2025'].iloc[0] == 1500000123
+    
+    def test_cache_swapped_in_whole(self, tmp_path, monkeypatch):
+        """Test that a rewrite failing half way never touches the sidecar readers see."""
+        csv_path = write_actuals(tmp_path)
+        cache_dir = os.path.join(tmp_path, '.cache')
+        first = storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        
+        # Another writer that missed the cache fails part way through its write
+        def torn(df, f):
+            f.write(b'partial')
+            raise OSError("disk full")
+        with monkeypatch.context() as m:
+            m.setattr(storage.json, 'load', lambda f: {})
+            m.setattr(storage, '_write_npz', torn)
+            storage.read_csv_cached(csv_path, cache_dir, fmt='npz')
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("CSV should not be parsed again")
+        monkeypatch.setattr(storage.pd, 'read_csv', fail)
+        pd.testing.assert_frame_equal(storage.read_csv_cached(csv_path, cache_dir, fmt='npz'), first)
+    
+    def test_loader_uses_cache(self, tmp_path):
+        """Test that the loader reads its tables through the cache."""
+        write_actuals(tmp_path)
+        loader = FinancialDataLoader(str(tmp_path))
+        assert loader.load_actuals()['Jun 2025'].iloc[0] == 1450000
+        assert os.path.exists(os.path.join(loader.cache_dir, 'actuals.meta.json'))
+        
+        uncached = FinancialDataLoader(str(tmp_path), use_cache=False)
+        pd.testing.assert_frame_equal(uncached.load_actuals(), loader.load_actuals())
+
+
+def write_sample_fixtures(path):
+    """Write the loader's built-in sample tables as fixture CSVs."""
+    sample = FinancialDataLoader(os.path.join(path, 'missing'))
+    sample.load_actuals().to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    sample.load_budget().to_csv(os.path.join(path, 'budget.csv'), index=False)
+    sample.load_fx().to_csv(os.path.join(path, 'fx.csv'), index=False)
+    sample.load_cash().to_csv(os.path.join(path, 'cash.csv'), index=False)
+
+
+class TestMappedLedger:
+    """Test cases for the memory-mapped ledger backend."""
+    
+    def test_matrix_is_memory_mapped(self, tmp_path):
+        """Test that the mmap backend maps values written on first use."""
+        write_sample_fixtures(tmp_path)
+        loader = FinancialDataLoader(str(tmp_path), backend='mmap')
+        matrix = loader.load_matrix()
+        
+        assert isinstance(matrix.values, np.memmap)
+        assert os.path.exists(os.path.join(loader.cache_dir, 'ledger', 'values.npy'))
+        
+        in_memory = FinancialDataLoader(str(tmp_path)).load_matrix()
+        np.testing.assert_array_equal(matrix.values, in_memory.values)
+        assert list(matrix.rows['account']) == list(in_memory.rows['account'])
+    
+    def test_metrics_match_pandas_backend(self, tmp_path):
+        """Test that analyzer sums agree between backends."""
+        write_sample_fixtures(tmp_path)
+        mapped = FinancialAnalyzer(FinancialDataLoader(str(tmp_path), backend='mmap'))
+        in_memory = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        
+        assert mapped.calculate_ebitda('Jun 2025') == in_memory.calculate_ebitda('Jun 2025')
+        assert mapped.get_revenue_vs_budget('Jun 2025') == in_memory.get_revenue_vs_budget('Jun 2025')
+    
+    def test_stale_map_is_rebuilt(self, tmp_path):
+        """Test that changing a source CSV invalidates the mapped ledger."""
+        write_sample_fixtures(tmp_path)
+        FinancialDataLoader(str(tmp_path), backend='mmap').load_matrix()
+        
+        write_actuals(tmp_path, june_revenue=5)
+        os.utime(os.path.join(tmp_path, 'actuals.csv'), ns=(0, 1))
+        
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path), backend='mmap'))
+        assert analyzer.get_revenue_vs_budget('Jun 2025')['actual'] == 5
+    
+    def test_warm_map_parses_no_ledger_tables(self, tmp_path):
+        """Test that a warm mapped ledger serves the calendar and USD values without the source tables."""
+        write_sample_fixtures(tmp_path)
+        FinancialDataLoader(str(tmp_path), backend='mmap').load_matrix()
+        
+        loader = FinancialDataLoader(str(tmp_path), backend='mmap')
+        calendar = loader.load_calendar()
+        usd = loader.load_usd_values()
+        
+        assert isinstance(usd, np.memmap)
+        assert loader._cube is None
+        assert loader._actuals is None and loader._budget is None and loader._cash is None
+        
+        in_memory = FinancialDataLoader(str(tmp_path))
+        assert calendar.labels == in_memory.load_calendar().labels
+        np.testing.assert_array_equal(usd, in_memory.load_usd_values())
+    
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            FinancialDataLoader("fixtures", backend='duckdb')
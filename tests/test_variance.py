@@ -0,0 +1,123 @@
+"""Tests for the FX / volume / mix variance bridge."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+
+
+def write_ledger(path, budget_rates: bool = True):
+    """A USD and a EUR entity selling more than budget, EUR budgeted at 1.10 and actual at 1.20."""
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 1100.0, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'Opex:Sales', 'Jun 2025': 300.0, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Revenue', 'Jun 2025': 600.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(path, 'actuals.csv'), index=False)
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', 'Jun 2025': 1000.0, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'Opex:Sales', 'Jun 2025': 250.0, 'Currency': 'USD'},
+        {'Entity': 'DE', 'Account': 'Revenue', 'Jun 2025': 500.0, 'Currency': 'EUR'},
+    ]).to_csv(os.path.join(path, 'budget.csv'), index=False)
+    fx = pd.DataFrame([
+        {'Month': 'Jan 2025', 'EUR_USD': 1.10, 'EUR_USD_Budget': 1.10},
+        {'Month': 'Jun 2025', 'EUR_USD': 1.20, 'EUR_USD_Budget': 1.10},
+    ])
+    if not budget_rates:
+        fx = fx.drop(columns='EUR_USD_Budget')
+    fx.to_csv(os.path.join(path, 'fx.csv'), index=False)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    write_ledger(tmp_path)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+
+class TestVarianceBridge:
+    """Test cases for FinancialAnalyzer.get_variance_bridge."""
+
+    def test_revenue_bridge(self, analyzer):
+        result = analyzer.get_variance_bridge('Jun 2025')
+        # Budget at actual rates, like get_revenue_vs_budget
+        assert result['budget'] == pytest.approx(1000 + 500 * 1.20)
+        assert result['actual'] == pytest.approx(1100 + 600 * 1.20)
+        assert result['fx'] == pytest.approx(100 * (1.20 - 1.10))
+        assert result['volume'] == pytest.approx(100 + 100 * 1.10)
+        assert result['budget'] + result['fx'] + result['volume'] + result['mix'] == pytest.approx(result['actual'])
+
+    def test_mix_nets_out(self, analyzer):
+        drivers = analyzer.get_variance_bridge('Jun 2025')['drivers'].set_index('entity')
+        # DE took share from US: 210 of growth at a 1000 : 550 budget mix
+        assert drivers.loc['US', 'volume'] == pytest.approx(210 * 1000 / 1550)
+        assert drivers.loc['US', 'mix'] == pytest.approx(-drivers.loc['DE', 'mix'])
+        assert drivers.loc['US', 'mix'] == pytest.approx(100 - 210 * 1000 / 1550)
+
+    def test_ebitda_costs_count_against(self, analyzer):
+        result = analyzer.get_variance_bridge('Jun 2025', 'ebitda')
+        revenue = analyzer.get_variance_bridge('Jun 2025', 'revenue')
+        assert result['variance'] == pytest.approx(revenue['variance'] - 50)
+        assert result['actual'] == pytest.approx(analyzer.calculate_ebitda('Jun 2025')['ebitda'])
+
+    def test_fiscal_year_opening_rate(self, tmp_path):
+        write_ledger(tmp_path, budget_rates=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        # Without budget rates the budget was planned at January's rate
+        assert analyzer.get_variance_bridge('Jun 2025')['fx'] == pytest.approx(100 * (1.20 - 1.10))
+
+    def test_unbudgeted_line_is_not_a_variance(self, tmp_path):
+        write_ledger(tmp_path)
+        actuals = pd.read_csv(os.path.join(tmp_path, 'actuals.csv'))
+        actuals.loc[len(actuals)] = {'Entity': 'DE', 'Account': 'COGS', 'Jun 2025': 200.0, 'Currency': 'EUR'}
+        actuals.to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+        analyzer = FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+        
+        result = analyzer.get_variance_bridge('Jun 2025', 'ebitda')
+        assert np.isnan(result['budget']) and np.isnan(result['volume']) and np.isnan(result['mix'])
+        assert result['actual'] == pytest.approx(analyzer.calculate_ebitda('Jun 2025')['ebitda'])
+        drivers = result['drivers'].set_index(['entity', 'account'])
+        assert np.isnan(drivers.loc[('DE', 'COGS'), 'mix'])
+        # The budgeted lines keep their bridge
+        assert analyzer.get_variance_bridge('Jun 2025')['variance'] == pytest.approx(100 + 100 * 1.20)
+    
+    def test_matches_comparison(self):
+        analyzer = FinancialAnalyzer(FinancialDataLoader("fixtures"))
+        revenue = analyzer.get_revenue_vs_budget('Jun 2025')
+        result = analyzer.get_variance_bridge('Jun 2025')
+        assert result['budget'] == pytest.approx(revenue['budget'])
+        assert result['variance'] == pytest.approx(revenue['variance'])
+        
+        comparison = analyzer.compare_periods(['Jun 2025']).set_index('line')
+        for line in ('revenue', 'cogs', 'opex', 'ebitda'):
+            result = analyzer.get_variance_bridge('Jun 2025', line)
+            assert result['actual'] == pytest.approx(comparison.loc[line, 'actual'])
+            assert result['budget'] == pytest.approx(comparison.loc[line, 'budget'], nan_ok=True)
+            assert result['variance'] == pytest.approx(comparison.loc[line, 'vs_budget'], nan_ok=True)
+    
+    def test_errors(self, analyzer):
+        with pytest.raises(ValueError):
+            analyzer.get_variance_bridge('Jun 2025', 'gross_profit')
+        with pytest.raises(KeyError):
+            analyzer.get_variance_bridge('Jun 2030')
+
+
+class TestVarianceBridgePlanning:
+    """Test cases for planning variance bridge questions."""
+
+    def test_plan(self, analyzer):
+        planner = QueryPlanner()
+        plan = planner.create_plan("Why did we miss budget on EBITDA in June?")
+        assert plan['intent'] == 'variance_bridge'
+        assert plan['function_calls'][0]['params'] == {'month': 'Jun 2025', 'line': 'ebitda'}
+        response = planner.format_response(plan, [analyzer.get_variance_bridge(**plan['function_calls'][0]['params'])])
+        assert '**FX Effect**: $+10' in response
+
+    def test_revenue_vs_budget_unchanged(self):
+        assert QueryPlanner().classify_intent("What was June 2025 revenue vs budget?") == 'revenue_vs_budget'
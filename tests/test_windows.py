@@ -0,0 +1,96 @@
+"""Tests for prefix-sum window totals."""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from agent.periods import FiscalCalendar
+from agent.planner import QueryPlanner
+from agent.tools import FinancialDataLoader, FinancialAnalyzer
+from agent.windows import window_start
+
+
+MONTHS = [p.strftime('%b %Y') for p in pd.period_range('2024-01', '2025-06', freq='M')]
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Eighteen months of revenue 1, 2, ... 18 with COGS at 40%; no data in Mar 2024."""
+    revenue = {m: float(i + 1) for i, m in enumerate(MONTHS) if m != 'Mar 2024'}
+    pd.DataFrame([
+        {'Entity': 'US', 'Account': 'Revenue', **revenue, 'Currency': 'USD'},
+        {'Entity': 'US', 'Account': 'COGS', **{m: v * 0.4 for m, v in revenue.items()}, 'Currency': 'USD'},
+    ]).to_csv(os.path.join(tmp_path, 'actuals.csv'), index=False)
+    return FinancialAnalyzer(FinancialDataLoader(str(tmp_path)))
+
+
+class TestWindowStart:
+    """Test cases for window_start."""
+
+    def test_windows(self):
+        calendar = FiscalCalendar(MONTHS, fiscal_year_start=4)
+        end = pd.Period('2025-06', freq='M')
+        assert window_start('ttm', end, calendar) == pd.Period('2024-07', freq='M')
+        assert window_start('ytd', end, calendar) == pd.Period('2025-04', freq='M')
+        assert window_start('qtd', end, calendar) == pd.Period('2025-04', freq='M')
+        assert window_start(3, end, calendar) == pd.Period('2025-04', freq='M')
+        with pytest.raises(ValueError):
+            window_start('mtd', end, calendar)
+
+
+class TestWindowMetrics:
+    """Test cases for TTM, YTD and rolling metrics."""
+
+    def test_ttm_matches_monthly_sum(self, analyzer):
+        result = analyzer.calculate_window_metrics('Jun 2025', 'ttm')
+        assert result['start'] == 'Jul 2024'
+        assert result['revenue'] == pytest.approx(sum(range(7, 19)))
+        assert result['gross_margin_pct'] == pytest.approx(60.0)
+        assert result['months_covered'] == 12
+
+    def test_gap_and_partial_window(self, analyzer):
+        result = analyzer.calculate_window_metrics('Apr 2024', 'ytd')
+        assert result['revenue'] == pytest.approx(1 + 2 + 4)
+        assert result['months_covered'] == 3
+        # Window starting before the data is clipped to it
+        assert analyzer.calculate_window_metrics('Feb 2024', 'ttm')['revenue'] == pytest.approx(3)
+
+    def test_rolling_series(self, analyzer):
+        table = analyzer.get_rolling_metrics(['Apr 2025', 'May 2025', 'Jun 2025'], 3)
+        monthly = analyzer.calculate_ebitda_by_month(MONTHS)['revenue']
+        for end in ['Apr 2025', 'May 2025', 'Jun 2025']:
+            position = MONTHS.index(end)
+            assert table.loc[end, 'revenue'] == pytest.approx(monthly.iloc[position - 2:position + 1].sum())
+
+    def test_cash_ahead_of_actuals(self, analyzer, tmp_path):
+        pd.DataFrame([{'Entity': 'US', 'Jun 2025': 900.0, 'Jul 2025': 800.0, 'Currency': 'USD'}]).to_csv(
+            os.path.join(tmp_path, 'cash.csv'), index=False)
+        result = analyzer.calculate_window_metrics('Jul 2025', 'ttm')
+        assert result['revenue'] == pytest.approx(sum(range(8, 19)))
+        assert result['months_covered'] == 11
+
+    def test_no_data(self, analyzer):
+        with pytest.raises(KeyError):
+            analyzer.calculate_window_metrics('Jun 2030', 'qtd')
+
+
+class TestWindowPlanning:
+    """Test cases for planning window queries."""
+
+    def test_queries(self):
+        planner = QueryPlanner()
+        plan = planner.create_plan("What is our TTM revenue?")
+        assert plan['intent'] == 'window_metrics'
+        assert plan['function_calls'][0] == {'function': 'calculate_window_metrics',
+                                             'params': {'month': 'Jun 2025', 'window': 'ttm'}}
+        plan = planner.create_plan("Show rolling 3-month margin")
+        assert plan['metric'] == 'gross_margin_pct'
+        assert plan['function_calls'][0]['params']['window'] == 3
+        assert len(plan['function_calls'][0]['params']['months']) == 6
+        plan = planner.create_plan("YTD EBITDA")
+        assert (plan['window'], plan['metric']) == ('ytd', 'ebitda')